@@ -0,0 +1,57 @@
+"""Benchmark batch market snapshots against a per pair loop
+
+The stand-in server delays every response by `--latency` seconds to stand
+for the network round trip, which dominates a snapshot of many pairs.
+
+    $ python -m benchmarks.bench_batch --pairs 24 --latency 0.05 --workers 1 4 8 16
+"""
+import argparse
+import time
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, public_routes
+
+
+def snapshot_loop(api: GatecoinAPI, pairs: list) -> None:
+    """Snapshot every pair one call at a time"""
+    for pair in pairs:
+        api.get_market_depth(pair)
+        api.get_order_book(pair)
+        api.get_recent_transactions(pair)
+
+
+def snapshot_batch(api: GatecoinAPI, pairs: list, workers: int) -> None:
+    """Snapshot every pair with the batch calls"""
+    api.get_market_depth_many(pairs, workers)
+    api.get_order_book_many(pairs, workers)
+    api.get_recent_transactions_many(pairs, workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pairs', type=int, default=24)
+    parser.add_argument('--levels', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    pairs = ['PAIR{0}'.format(index) for index in range(args.pairs)]
+    with StandInServer(public_routes(pairs, args.levels), args.latency) as server:
+        api = GatecoinAPI(base_url=server.base_url, max_connections_per_host=max(args.workers))
+
+        start = time.perf_counter()
+        snapshot_loop(api, pairs)
+        baseline = time.perf_counter() - start
+        print('{0:>10}: {1:8.3f} s'.format('loop', baseline))
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            snapshot_batch(api, pairs, workers)
+            elapsed = time.perf_counter() - start
+            print('{0:>10}: {1:8.3f} s  {2:5.1f}x'.format(
+                'batch/{0}'.format(workers), elapsed, baseline / elapsed))
+        api.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark compiled decoders against marshmallow schema loading
+
+    $ python -m benchmarks.bench_decoders --sizes 100 1000 10000
+"""
+import argparse
+import copy
+import time
+
+from gatecoin_api import decoders, schemas, testing
+
+CASES = (
+    ('trade_history', schemas.get_trade_history_response_schema,
+     testing.trade_history_payload),
+    ('recent_transactions', schemas.get_recent_transactions_response_schema,
+     testing.recent_transactions_payload),
+    ('order_book', schemas.get_order_book_response_schema,
+     testing.order_book_payload),
+)
+
+
+def throughput(schema, payload, strict: bool, min_time: float, raw_timestamps: bool = False) -> float:
+    """Return decoded payloads per second"""
+    runs = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        # The schema hooks rewrite timestamps in place, so load fresh copies
+        data = copy.deepcopy(payload) if strict else payload
+        start = time.perf_counter()
+        decoders.load(schema, data, strict, raw_timestamps)
+        elapsed += time.perf_counter() - start
+        runs += 1
+    return runs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--min-time', type=float, default=1.0)
+    parser.add_argument('--raw-timestamps', action='store_true',
+                        help='keep timestamps as epoch seconds')
+    args = parser.parse_args()
+
+    print('{0:<20} {1:>7} {2:>14} {3:>14} {4:>8}'.format(
+        'payload', 'items', 'strict items/s', 'fast items/s', 'speedup'))
+    for label, schema, generate in CASES:
+        for size in args.sizes:
+            payload = generate(size)
+            strict = throughput(schema, payload, True, args.min_time, args.raw_timestamps) * size
+            fast = throughput(schema, payload, False, args.min_time, args.raw_timestamps) * size
+            print('{0:<20} {1:>7} {2:>14,.0f} {3:>14,.0f} {4:>7.1f}x'.format(
+                label, size, strict, fast, fast / strict))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Measure the CPU overhead instrumentation adds to an API call
+
+Times a method doing nothing, bare, decorated with `instrumented` but
+disabled, then enabled and recording into an `Instrumentation`, and
+decoding a market depth response with and without instrumentation.
+
+    $ python -m benchmarks.bench_instrumentation --number 200000
+"""
+import argparse
+import timeit
+
+from gatecoin_api import GatecoinAPI, Instrumentation
+from gatecoin_api.instrumentation import instrumented
+from gatecoin_api.schemas import get_market_depth_response_schema
+from gatecoin_api.testing import market_depth_payload
+
+
+class Client:
+    """Stand-in API with an instrumentation attribute"""
+
+    def __init__(self, instrumentation: Instrumentation = None):
+        self.instrumentation = instrumentation
+
+    def bare(self):
+        return self
+
+    @instrumented
+    def call(self):
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    disabled, enabled = Client(), Client(Instrumentation())
+    payload = market_depth_payload(50)
+    plain_api = GatecoinAPI(pooled=False)
+    instrumented_api = GatecoinAPI(pooled=False, instrumentation=Instrumentation())
+    cases = (
+        ('bare method', disabled.bare, args.number),
+        ('disabled', disabled.call, args.number),
+        ('enabled', enabled.call, args.number),
+        ('decode', lambda: plain_api._load(get_market_depth_response_schema, payload),  # pylint: disable=protected-access
+         args.number // 100),
+        ('decode enabled', lambda: instrumented_api._load(get_market_depth_response_schema, payload),  # pylint: disable=protected-access
+         args.number // 100),
+    )
+    for label, function, number in cases:
+        best = min(timeit.repeat(function, number=number, repeat=args.repeat))
+        print('{0:>14}: {1:9.3f} us per call'.format(label, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark parsing response bodies with each installed JSON codec
+
+Compares `requests`' `Response.json()`, which detects the charset and
+decodes the body to text before parsing it, against each `JSONCodec`
+parsing the body bytes directly, on large order book and trade history
+payloads.
+
+    $ python -m benchmarks.bench_json --sizes 1000 10000 50000
+"""
+import argparse
+import json
+import time
+
+import requests
+
+from gatecoin_api import testing
+from gatecoin_api.json_codec import ORJSON, STDLIB
+
+CASES = (
+    ('order_book', testing.order_book_payload),
+    ('trade_history', testing.trade_history_payload),
+)
+
+
+def response_for(content: bytes) -> requests.Response:
+    """Response holding a body, as `requests` returns it"""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json'
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def throughput(function, content: bytes, min_time: float) -> float:
+    """Return megabytes parsed per second"""
+    runs = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        start = time.perf_counter()
+        function()
+        elapsed += time.perf_counter() - start
+        runs += 1
+    return runs * len(content) / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--min-time', type=float, default=1.0)
+    args = parser.parse_args()
+
+    codecs = [codec for codec in (STDLIB, ORJSON) if codec is not None]
+    print('{0:<14} {1:>7} {2:>9} {3:>20} {4}'.format(
+        'payload', 'items', 'size MB', 'Response.json()',
+        ' '.join('{0:>11}'.format(codec.name) for codec in codecs)))
+    for label, generate in CASES:
+        for size in args.sizes:
+            content = json.dumps(generate(size)).encode()
+            response = response_for(content)
+            baseline = throughput(response.json, content, args.min_time)
+            rates = [throughput(lambda loads=codec.loads: loads(content), content, args.min_time)
+                     for codec in codecs]
+            print('{0:<14} {1:>7} {2:>9.2f} {3:>10.1f} MB/s {4}'.format(
+                label, size, len(content) / 1e6, baseline,
+                ' '.join('{0:>5.1f} ({1:.1f}x)'.format(rate, rate / baseline) for rate in rates)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Measure the memory held by decoded trade history responses
+
+    $ python -m benchmarks.bench_memory --count 100000
+
+Compares the slotted result types with dictionary backed classes built
+from the same `__init__`, which is how the types were laid out before.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from gatecoin_api import decoders, schemas, testing, types
+
+
+def footprint(function) -> int:
+    """Bytes still allocated by the result of `function()`"""
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def decode(payload):
+    """Decode a trade history payload with the compiled decoders"""
+    return decoders.load(schemas.get_trade_history_response_schema, payload)[0]
+
+
+def dict_backed(payload):
+    """Decode the payload, then copy every trade into a dictionary backed class"""
+    legacy = type('TraderTransaction', (), {'__init__': types.TraderTransaction.__init__})
+    response = decode(payload)
+    slots = types.TraderTransaction.__slots__
+    trades = [legacy(**{name: getattr(trade, name) for name in slots})
+              for trade in response.trades]
+    response.trades = None
+    return response, trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    payload = testing.trade_history_payload(args.count)
+    slotted = footprint(lambda: decode(payload))
+    legacy = footprint(lambda: dict_backed(payload))
+
+    print('{0:<12} {1:>14} {2:>12}'.format('layout', 'bytes', 'bytes/trade'))
+    for label, size in (('dict', legacy), ('slots', slotted)):
+        print('{0:<12} {1:>14,} {2:>12.1f}'.format(label, size, size / args.count))
+    print('saved {0:.0%}'.format(1 - slotted / legacy))
+
+
+if __name__ == '__main__':
+    main()
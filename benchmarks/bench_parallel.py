@@ -0,0 +1,56 @@
+"""Find where decoding trade histories over a process pool breaks even
+
+Decodes trade history payloads of growing size on one core and with a
+`ParallelDecoder` whose threshold is zero, with the compiled decoders and
+with marshmallow (`--strict`). The pool is started before timing, as it is
+kept by the API between calls.
+
+    $ python -m benchmarks.bench_parallel --sizes 5000 20000 50000 200000
+"""
+import argparse
+import os
+import time
+
+from gatecoin_api import decoders, schemas, testing
+from gatecoin_api.parallel import ParallelDecoder
+
+SCHEMA = schemas.get_trade_history_response_schema
+
+
+def best_time(function, payload: dict, strict: bool, repeat: int) -> float:
+    """Shortest of `repeat` decodes in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(SCHEMA, payload, strict)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 20000, 50000, 200000])
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--strict', action='store_true', help='decode with marshmallow')
+    args = parser.parse_args()
+
+    decoder = ParallelDecoder(threshold=0, chunk_size=args.chunk_size, max_workers=args.workers)
+    decoder.load(SCHEMA, testing.trade_history_payload(args.chunk_size * 4))
+
+    print('{0} CPUs, {1} workers'.format(os.cpu_count(), decoder.max_workers))
+    print('{0:>7} {1:>13} {2:>13} {3:>8}'.format('trades', 'one core ms', 'pool ms', 'speedup'))
+    try:
+        for size in args.sizes:
+            payload = testing.trade_history_payload(size)
+            sequential = best_time(decoders.load, payload, args.strict, args.repeat)
+            parallel = best_time(decoder.load, payload, args.strict, args.repeat)
+            print('{0:>7} {1:>13.1f} {2:>13.1f} {3:>7.2f}x'.format(
+                size, sequential * 1e3, parallel * 1e3, sequential / parallel))
+    finally:
+        decoder.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Benchmark every stage of the request, sign and decode pipeline offline
+
+Each stage runs on the seeded payloads of `gatecoin_api.testing` at several
+sizes: `Request` construction, `message_signature`, JSON parsing, then the
+marshmallow `*_response_schema.load` and the compiled decoder of every
+response schema. Results can be saved and compared with a saved run of
+another revision, failing when a stage slowed down past the threshold.
+
+    $ python -m benchmarks.bench_pipeline --save before.json
+    $ python -m benchmarks.bench_pipeline --compare before.json --threshold 0.1
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from gatecoin_api import decoders, schemas, testing
+from gatecoin_api.constants import HTTPMethod
+from gatecoin_api.request import Request
+
+PRIVATE_KEY = 'pR1vAtE-kEy-0123456789abcdef'
+PUBLIC_KEY = 'PUBLIC-KEY-0123456789ABCDEF'
+
+
+def _names(prefix: str, count: int) -> list:
+    return ['{0}{1:03d}'.format(prefix, index) for index in range(count)]
+
+
+def _open_order_payload(count: int) -> dict:
+    return {'order': testing.open_orders_payload(1)['orders'][0], 'responseStatus': {'message': 'OK'}}
+
+
+def _balance_payload(count: int) -> dict:
+    payload = testing.balances_payload(['BTC'])
+    return {'balance': payload['balances'][0], 'responseStatus': payload['responseStatus']}
+
+
+# Response schemas with a generator of payloads of a given size, and whether
+# that size varies at all
+PAYLOADS = (
+    ('currency_pairs', schemas.get_currency_pairs_response_schema,
+     lambda count: testing.currency_pairs_payload(_names('X', count)), True),
+    ('market_depth', schemas.get_market_depth_response_schema, testing.market_depth_payload, True),
+    ('order_book', schemas.get_order_book_response_schema, testing.order_book_payload, True),
+    ('recent_transactions', schemas.get_recent_transactions_response_schema,
+     testing.recent_transactions_payload, True),
+    ('balances', schemas.get_balances_response_schema,
+     lambda count: testing.balances_payload(_names('C', count)), True),
+    ('balance', schemas.get_balance_response_schema, _balance_payload, False),
+    ('open_orders', schemas.get_open_orders_response_schema, testing.open_orders_payload, True),
+    ('open_order', schemas.get_open_order_response_schema, _open_order_payload, False),
+    ('create_order', schemas.create_order_response_schema,
+     lambda count: {'clOrderId': 'BK11000000000001', 'orderStatus': 'New',
+                    'responseStatus': {'message': 'OK'}}, False),
+    ('cancel_order', schemas.cancel_open_order_response_schema,
+     lambda count: {'responseStatus': {'message': 'OK'}}, False),
+    ('trade_history', schemas.get_trade_history_response_schema, testing.trade_history_payload, True),
+)
+
+
+def measure(function, prepare=None, min_time: float = 0.5, min_runs: int = 20) -> dict:
+    """Time single calls of `function(prepare())`, only the call being timed"""
+    latencies = []
+    total = 0.0
+    clock = time.perf_counter
+    while total < min_time or len(latencies) < min_runs:
+        argument = prepare() if prepare is not None else None
+        start = clock()
+        function(argument)
+        latency = clock() - start
+        latencies.append(latency)
+        total += latency
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        'runs': count,
+        'ops_per_sec': count / total,
+        'p50_us': latencies[count // 2] * 1e6,
+        'p90_us': latencies[int(count * 0.9)] * 1e6,
+        'p99_us': latencies[min(int(count * 0.99), count - 1)] * 1e6,
+        'mean_us': statistics.mean(latencies) * 1e6
+    }
+
+
+def stages(sizes: list):
+    """Yield `(name, function, prepare)` for every stage and payload size"""
+    yield ('request/get', lambda _: Request(
+        PRIVATE_KEY, PUBLIC_KEY, 'v1/Public/MarketDepth/BTCUSD'), None)
+    yield ('request/post', lambda _: Request(
+        PRIVATE_KEY, PUBLIC_KEY, 'v1/Trade/Orders', HTTPMethod.POST,
+        {'Code': 'BTCUSD', 'Way': 'Bid', 'Price': 6500.0, 'Amount': 0.1}), None)
+
+    request = Request(PRIVATE_KEY, PUBLIC_KEY, 'v1/Trade/Orders', HTTPMethod.POST)
+    yield ('sign', lambda _: request.message_signature('1535000000.123'), None)
+
+    for label, schema, generate, sized in PAYLOADS:
+        for size in (sizes if sized else [1]):
+            raw = json.dumps(generate(size)).encode()
+            suffix = '{0}/{1}'.format(label, size)
+
+            def parse(_, raw=raw):
+                return json.loads(raw)
+
+            def fresh(raw=raw):
+                return json.loads(raw)
+
+            yield ('json/' + suffix, parse, None)
+            yield ('load/' + suffix, lambda data, schema=schema: schema.load(data, partial=True), fresh)
+            yield ('decode/' + suffix, lambda data, schema=schema: decoders.load(schema, data), fresh)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print the change of every stage, returning the names of regressions"""
+    regressions = []
+    print()
+    print('{0:<36} {1:>14} {2:>14} {3:>8}'.format('stage', 'baseline op/s', 'current op/s', 'change'))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['ops_per_sec']
+        change = result['ops_per_sec'] / before - 1.0
+        flag = ''
+        if change < -threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('{0:<36} {1:>14,.0f} {2:>14,.0f} {3:>+7.1%}{4}'.format(
+            name, before, result['ops_per_sec'], change, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--min-time', type=float, default=0.5,
+                        help='seconds spent in each stage')
+    parser.add_argument('--filter', default='', help='only run stages containing this text')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare with results saved by --save')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='slowdown reported as a regression, 0.1 being 10%%')
+    args = parser.parse_args()
+
+    results = {}
+    print('{0:<36} {1:>12} {2:>10} {3:>10} {4:>10}'.format(
+        'stage', 'op/s', 'p50 us', 'p90 us', 'p99 us'))
+    for name, function, prepare in stages(args.sizes):
+        if args.filter not in name:
+            continue
+        function(prepare() if prepare is not None else None)  # warm up
+        result = results[name] = measure(function, prepare, args.min_time)
+        print('{0:<36} {1:>12,.0f} {2:>10.1f} {3:>10.1f} {4:>10.1f}'.format(
+            name, result['ops_per_sec'], result['p50_us'], result['p90_us'], result['p99_us']))
+
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump({'python': platform.python_version(), 'results': results},
+                      output, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline)['results'], args.threshold)
+        if regressions:
+            print('\n{0} stage(s) slower than the baseline by more than {1:.0%}'.format(
+                len(regressions), args.threshold))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
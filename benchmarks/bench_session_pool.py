@@ -0,0 +1,43 @@
+"""Benchmark sequential get_market_depth latency with and without pooling
+
+The stand-in server runs locally over plain HTTP, so the saving measured
+here is the TCP connect and per-connection setup only; against the real
+API the pooled client also skips the TLS handshake on every call.
+
+    $ python -m benchmarks.bench_session_pool --requests 500
+"""
+import argparse
+import statistics
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, public_routes, timed
+
+
+def run(api: GatecoinAPI, requests: int) -> list:
+    """Return per-call latencies of sequential market depth requests"""
+    api.get_market_depth('BTCUSD')  # warm up
+    return timed(lambda: api.get_market_depth('BTCUSD'), requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--levels', type=int, default=10)
+    args = parser.parse_args()
+
+    with StandInServer(public_routes(levels=args.levels)) as server:
+        for label, pooled in (('unpooled', False), ('pooled', True)):
+            connections = server.connections
+            api = GatecoinAPI(base_url=server.base_url, pooled=pooled)
+            latencies = run(api, args.requests)
+            api.close()
+            print('{0:>9}: mean {1:7.3f} ms  p50 {2:7.3f} ms  p99 {3:7.3f} ms  connections {4}'.format(
+                label,
+                statistics.mean(latencies) * 1000,
+                statistics.median(latencies) * 1000,
+                sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000,
+                server.connections - connections))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Measure the CPU cost of preparing an order request for sending
+
+Compares building a `Request`, serializing its parameters and signing its
+headers with a freshly keyed HMAC, as every call used to, then the same
+with the shared pre-keyed HMAC, with a reused `RequestTemplate` and the
+`order_body` builder. Nothing is sent, only the preparation is timed.
+
+    $ python -m benchmarks.bench_signing --number 100000
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import timeit
+
+from gatecoin_api.api import BaseGatecoinAPI
+from gatecoin_api.constants import HTTPMethod
+from gatecoin_api.request import Request, RequestTemplate, order_body
+
+PRIVATE_KEY = 'pR1vAtE-kEy-0123456789abcdef'
+PUBLIC_KEY = 'PUBLIC-KEY-0123456789ABCDEF'
+ORDER = ('BTCUSD', 'bid', 6500.5, 0.125, None, 'client-0001')
+TIMESTAMP = '1535000000.123'
+
+
+def legacy_signature(request: Request, timestamp: str) -> str:
+    """Signature computed with an HMAC keyed from scratch"""
+    message = (request.http_method + request.url + request.content_type + timestamp).lower()
+    digest = hmac.new(request.private_key.encode(), message.encode(), hashlib.sha256).digest()
+    return str(base64.b64encode(digest), 'UTF-8')
+
+
+def legacy() -> None:
+    """Prepare an order the way every call used to"""
+    params = BaseGatecoinAPI._create_order_params(*ORDER)  # pylint: disable=protected-access
+    request = Request(PRIVATE_KEY, PUBLIC_KEY, 'v1/Trade/Orders', HTTPMethod.POST, params)
+    request.message_signature = lambda timestamp: legacy_signature(request, timestamp)
+    request.signed_headers(TIMESTAMP)
+    json.dumps(request.params)
+
+
+def per_request() -> None:
+    """Prepare an order with a new request signed by the pre-keyed HMAC"""
+    params = BaseGatecoinAPI._create_order_params(*ORDER)  # pylint: disable=protected-access
+    request = Request(PRIVATE_KEY, PUBLIC_KEY, 'v1/Trade/Orders', HTTPMethod.POST, params)
+    request.signed_headers(TIMESTAMP)
+    json.dumps(request.params)
+
+
+TEMPLATE = RequestTemplate(PRIVATE_KEY, PUBLIC_KEY, 'v1/Trade/Orders', HTTPMethod.POST)
+
+
+def templated() -> None:
+    """Prepare an order with a reused template"""
+    TEMPLATE.signed_headers(TIMESTAMP)
+    order_body(*ORDER)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for label, function in (('legacy', legacy), ('per request', per_request), ('template', templated)):
+        best = min(timeit.repeat(function, number=args.number, repeat=args.repeat))
+        results[label] = best / args.number
+        print('{0:>12}: {1:7.2f} us per order'.format(label, results[label] * 1e6))
+    print('saved {0:.2f} us per order ({1:.0%})'.format(
+        (results['legacy'] - results['template']) * 1e6,
+        1 - results['template'] / results['legacy']))
+
+
+if __name__ == '__main__':
+    main()
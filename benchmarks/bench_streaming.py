@@ -0,0 +1,63 @@
+"""Compare peak memory and first item latency of streamed trade history
+
+    $ python -m benchmarks.bench_streaming --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, trade_history_payload
+
+
+def profile(consume) -> tuple:
+    """Peak traced bytes, first item latency and total time of `consume()`"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = consume()
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, first - start, total
+
+
+def buffered(api: GatecoinAPI) -> float:
+    """Walk the trades of a full response, returning when the first was available"""
+    trades = api.get_trade_history().trades
+    first = time.perf_counter()
+    for _ in trades:
+        pass
+    return first
+
+
+def streamed(api: GatecoinAPI) -> float:
+    """Walk the streamed trades, returning when the first was available"""
+    first = None
+    for _ in api.iter_trade_history():
+        if first is None:
+            first = time.perf_counter()
+    return first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print('{0:>8} {1:>10} {2:>12} {3:>12} {4:>10}'.format(
+        'trades', 'mode', 'peak MiB', 'first ms', 'total s'))
+    for size in args.sizes:
+        # Encoded up front, the stand-in runs in this process and is traced too
+        body = json.dumps(trade_history_payload(size)).encode()
+        with StandInServer({'v1/Trade/TradeHistory': body}) as server:
+            api = GatecoinAPI('private', 'public', base_url=server.base_url)
+            for label, consume in (('buffered', buffered), ('streamed', streamed)):
+                peak, first, total = profile(lambda: consume(api))
+                print('{0:>8} {1:>10} {2:>12.1f} {3:>12.1f} {4:>10.2f}'.format(
+                    size, label, peak / 2 ** 20, first * 1000, total))
+            api.close()
+
+
+if __name__ == '__main__':
+    main()
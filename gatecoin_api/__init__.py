@@ -1,5 +1,16 @@
 """Main package entry point"""
 
 from .api import GatecoinAPI
+from .fixed_point import FixedPoint
+from .instrumentation import Instrumentation
+from .order_store import OpenOrderStore
+from .order_book import OrderBookEngine
+from .parallel import ParallelDecoder
+from .poller import Poller
+from .cache import ResponseCache
+from .rate_limit import RateLimiter
+from .resilience import Resilience
+from .trade_store import TradeStore
+from .async_api import AsyncGatecoinAPI
 
 name = "gatecoin_api"
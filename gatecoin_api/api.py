@@ -1,7 +1,25 @@
 """API client module for Gatecoin REST API"""
-
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Container, Dict, Iterable, Iterator, List, Union
+
+from . import decoders, streaming
+from .balances import BalanceCache, unknown_currency_response
+from .cache import ResponseCache, cached
+from .columnar import load_columnar
 from .constants import HTTPMethod
-from .request import Request
+from .fixed_point import FixedPoint
+from .instrumentation import (Instrumentation, current_timing, instrumented,
+                              instrumented_stream)
+from .json_codec import JSONCodec, get_codec
+from .lazy import LazyList, load_lazy
+from .order_store import SIDES, OpenOrderStore
+from .parallel import ParallelDecoder
+from .rate_limit import SHED_RESPONSE, RateLimiter, priority_for
+from .request import (BODILESS_METHODS, EMPTY_BODY, Request, RequestTemplate,
+                      order_body)
+from .resilience import Resilience
 from .schemas import (cancel_all_open_orders_response_schema,
                       cancel_open_order_response_schema,
                       create_order_response_schema,
@@ -13,23 +31,46 @@ from .schemas import (cancel_all_open_orders_response_schema,
                       get_open_orders_response_schema,
                       get_order_book_response_schema,
                       get_recent_transactions_response_schema,
-                      get_trade_history_response_schema)
-from .types import (CancelAllOpenOrdersResponse, CancelOpenOrderResponse,
+                      get_trade_history_response_schema,
+                      response_status_schema, trader_transaction_schema,
+                      transaction_schema)
+from .session import SessionPool
+from .single_flight import SingleFlight, coalesced
+from .types import (AccountBalance, BatchResponse,
+                    CancelAllOpenOrdersResponse, CancelOpenOrderResponse,
                     CreateOrderResponse, GetBalanceResponse,
                     GetBalancesResponse, GetCurrencyPairsResponse,
                     GetMarketDepthResponse, GetOpenOrderResponse,
                     GetOpenOrdersResponse, GetOrderBookResponse,
-                    GetRecentTransactionsResponse, GetTradeHistoryResponse)
+                    GetRecentTransactionsResponse, GetTradeHistoryResponse,
+                    OpenOrder, OrderBatchResponse, ResponseStatus,
+                    ResponseStatusError, Transaction, TraderTransaction,
+                    succeeded)
+
+# Request templates kept by a client before they are dropped
+_MAX_TEMPLATES = 1024
 
 
-class GatecoinAPI:
-    """Gatecoin API class"""
+class BaseGatecoinAPI:
+    """Transport independent base of the Gatecoin API clients"""
     public_key = ''
     private_key = ''
+    instrumentation = None
+    parallel_decoder = None
+    lazy = False
 
-    def __init__(self, private_key: str = None, public_key: str = None):
-            self.private_key = private_key
-            self.public_key = public_key
+    def __init__(
+            self,
+            private_key: str = None,
+            public_key: str = None,
+            base_url: str = None,
+            strict: bool = False,
+            raw_timestamps: bool = False):
+        self.private_key = private_key
+        self.public_key = public_key
+        self.base_url = base_url
+        self.strict = strict
+        self.raw_timestamps = raw_timestamps
 
     def _handle_response(self, obj, err):
         if err is not None and bool(err) is True:
@@ -37,98 +78,94 @@ class GatecoinAPI:
 
         return obj
 
-    def set_credentials(self, private_key: str, public_key: str) -> None:
-        """Set public and private key credentials for API"""
-        self.private_key = private_key
-        self.public_key = public_key
-
-    # The following methods are in the public domain
-    # of the API and can be used without setting API
-    # credentials first
-    def get_currency_pairs(self) -> GetCurrencyPairsResponse:
-        """Get currency pairs"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Reference/CurrencyPairs').send()
-        obj, err = get_currency_pairs_response_schema.load(
-            response, partial=True)
-
-        return self._handle_response(obj, err)
-
-    def get_market_depth(self, currency_pair: str) -> GetMarketDepthResponse:
-        """Get currency pair market depth"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Public/MarketDepth/{0}'.format(currency_pair)).send()
-        obj, err = get_market_depth_response_schema.load(
-            response, partial=True)
+    def _load(self, schema, response):
+        """Deserialize a response with the given schema
+
+        Compiled decoders are used unless the API is in strict mode, in
+        which case every response goes through marshmallow validation. With
+        raw timestamps, times are kept as `EpochTime` seconds whose
+        datetime is only computed when read.
+        """
+        if self.instrumentation is not None:
+            return self._timed_decode(self._load_with, schema, response)
+        return self._load_with(schema, response)
+
+    def _load_with(self, schema, response):
+        parallel_decoder = self.parallel_decoder
+        if self.lazy and not self.strict:
+            obj, err = load_lazy(schema, response, self.raw_timestamps)
+        elif parallel_decoder is not None and parallel_decoder.handles(schema, response):
+            obj, err = parallel_decoder.load(schema, response, self.strict, self.raw_timestamps)
+        else:
+            obj, err = decoders.load(schema, response, self.strict, self.raw_timestamps)
 
         return self._handle_response(obj, err)
 
-    def get_order_book(self, currency_pair: str) -> GetOrderBookResponse:
-        """Get currency pair order book"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/{0}/OrderBook'.format(currency_pair)).send()
-        obj, err = get_order_book_response_schema.load(response, partial=True)
-
-        return self._handle_response(obj, err)
-
-    def get_recent_transactions(self, currency_pair: str) -> GetRecentTransactionsResponse:
-        """Get recent transactions for the currency pair"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Public/Transactions/{0}'.format(currency_pair)).send()
-        obj, err = get_recent_transactions_response_schema.load(
-            response, partial=True)
+    @staticmethod
+    def _timed_decode(load, *args):
+        """Decode with `load`, adding the time spent to the call's decode phase"""
+        timing = current_timing()
+        if timing is None:
+            return load(*args)
+        start = time.perf_counter()
+        try:
+            return load(*args)
+        finally:
+            timing.decode = (timing.decode or 0.0) + time.perf_counter() - start
+
+    def _load_book(self, schema, response, columnar: bool):
+        """Deserialize a book response, into `LimitColumns` sides if columnar"""
+        if not columnar:
+            return self._load(schema, response)
+        if self.instrumentation is not None:
+            return self._timed_decode(self._load_columnar, schema, response)
+        return self._load_columnar(schema, response)
+
+    def _load_columnar(self, schema, response):
+        obj, err = load_columnar(schema, response, self.strict)
 
         return self._handle_response(obj, err)
 
-    # The following methods are in the trading
-    # domain of the API and must be used only
-    # after credentials have been set otherwise
-    # the response will always be a failure
-    def get_balances(self) -> GetBalancesResponse:
-        """Get all balances"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Balance/Balances').send()
-        obj, err = get_balances_response_schema.load(response, partial=True)
-
-        return self._handle_response(obj, err)
-
-    def get_balance(self, currency_code: str) -> GetBalanceResponse:
-        """Get specific currency balance"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Balance/Balances').send()
+    def _load_items(self, schema, chunks: Iterable[bytes], key: str,
+                    skipped: Container = (), id_key: str = None) -> Iterator[object]:
+        """Decode the items of a streamed response list one at a time
+
+        Raw items whose `id_key` member is in `skipped` are passed over
+        without being decoded. Raises `ResponseStatusError` once the body is
+        consumed if the response carries an error status.
+        """
+        members = {}
+        for item in streaming.iter_items(chunks, key, members):
+            if skipped and isinstance(item, dict) and item.get(id_key) in skipped:
+                continue
+            yield self._load(schema, item)
+        status = members.get('responseStatus')
+        if isinstance(status, dict) and status.get('errorCode'):
+            response_status, _ = decoders.load(response_status_schema, status, self.strict, self.raw_timestamps)
+            raise ResponseStatusError(response_status)
+
+    @staticmethod
+    def _select_balance(response, currency_code: str):
+        """Pick the balance of one currency out of a balances response"""
         if 'balances' in response:
-            response['balance'] = next(balance for balance in response['balances'] if balance['currency'] == currency_code)
-
-        obj, err = get_balance_response_schema.load(response, partial=True)
-
-        return self._handle_response(obj, err)
-
-    def get_open_orders(self) -> GetOpenOrdersResponse:
-        """Get all open orders"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Trade/Orders').send()
-        obj, err = get_open_orders_response_schema.load(response, partial=True)
+            balance = next((balance for balance in response['balances']
+                            if balance.get('currency') == currency_code), None)
+            if balance is None:
+                return unknown_currency_response(currency_code)
+            response['balance'] = balance
 
-        return self._handle_response(obj, err)
-
-    def get_open_order(self, order_id: str) -> GetOpenOrderResponse:
-        """Get specific open order"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Trade/Orders/{0}'.format(order_id)).send()
-        obj, err = get_open_order_response_schema.load(response, partial=True)
+        return response
 
-        return self._handle_response(obj, err)
-
-    def create_order(
-            self,
+    @staticmethod
+    def _create_order_params(
             currency_pair: str,
             order_way: str,
             price: float,
             amount: float = None,
             spend_amount: float = None,
             external_order_id: str = None,
-            validation_code: str = None) -> CreateOrderResponse:
-        """Place new order"""
+            validation_code: str = None) -> dict:
+        """Build the request parameters of a new order"""
         params = {
             'Code': currency_pair,
             'Way': order_way,
@@ -144,39 +181,512 @@ class GatecoinAPI:
         if validation_code is not None:
             params['ValidationCode'] = validation_code
 
-        response = Request(self.private_key, self.public_key,
-                           'v1/Trade/Orders', HTTPMethod.POST, params).send()
-        obj, err = create_order_response_schema.load(response, partial=True)
+        return params
 
-        return self._handle_response(obj, err)
+    def set_credentials(self, private_key: str, public_key: str) -> None:
+        """Set public and private key credentials for API"""
+        self.private_key = private_key
+        self.public_key = public_key
+
+
+class GatecoinAPI(BaseGatecoinAPI):
+    """Gatecoin API class
+
+    With a `ResponseCache`, decoded responses of the public endpoints it
+    gives a time to live are reused until they expire. With a `RateLimiter`
+    every request first waits for a token in its priority class, and
+    requests shed by the limiter return a failed response with error code
+    429 without reaching the network. `timeout` bounds every request in
+    seconds, and a `Resilience` policy retries, hedges and circuit breaks
+    requests per endpoint. Balance lookups are served from the last
+    balances response for `balance_max_age` seconds. With `coalesce`,
+    identical GET calls made while one is in flight share its response.
+    Open orders placed, cancelled and listed through the API are kept in an
+    `OpenOrderStore`, which answers `get_open_order` for
+    `open_order_max_age` seconds after each `get_open_orders` call. With a
+    `ParallelDecoder`, the lists of responses above its threshold are
+    decoded over a process pool. In `lazy` mode, only the envelope of
+    responses is decoded up front, their lists decoding each item on first
+    access.
+    `json_codec` names the `JSONCodec` encoding bodies and decoding
+    responses: the standard library by default, 'orjson', or 'auto' for
+    the fastest one installed. With a `FixedPoint`, prices and quantities
+    are decoded to scaled integers, and `create_order` takes integer
+    prices and amounts on the same scales. With an `Instrumentation`, the
+    phases of every call are timed into per endpoint histograms.
+    """
+
+    def __init__(
+            self,
+            private_key: str = None,
+            public_key: str = None,
+            base_url: str = None,
+            pooled: bool = True,
+            pool_size: int = 10,
+            max_connections_per_host: int = 10,
+            keep_alive_timeout: float = 30.0,
+            strict: bool = False,
+            raw_timestamps: bool = False,
+            cache: ResponseCache = None,
+            rate_limiter: RateLimiter = None,
+            timeout: float = None,
+            resilience: Resilience = None,
+            balance_max_age: float = 0.0,
+            coalesce: bool = False,
+            json_codec: Union[str, JSONCodec] = None,
+            fixed_point: FixedPoint = None,
+            instrumentation: Instrumentation = None,
+            open_order_max_age: float = 0.0,
+            parallel_decoder: ParallelDecoder = None,
+            lazy: bool = False):
+        super().__init__(private_key, public_key, base_url, strict, raw_timestamps)
+        self.session_pool = SessionPool(
+            pool_size, max_connections_per_host, keep_alive_timeout,
+            timed_connections=instrumentation is not None) if pooled else None
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.resilience = resilience
+        self.balances = BalanceCache(balance_max_age)
+        self.open_orders = OpenOrderStore(open_order_max_age)
+        self.single_flight = SingleFlight() if coalesce else None
+        self.json_codec = get_codec(json_codec)
+        self.fixed_point = fixed_point
+        self.instrumentation = instrumentation
+        self.parallel_decoder = parallel_decoder
+        self.lazy = lazy
+        self._templates = {}
+
+    def _send(
+            self,
+            command: str,
+            http_method: HTTPMethod = HTTPMethod.GET,
+            params: object = {},
+            body: Union[str, bytes] = None):
+        """Send a request over the shared connection pool
+
+        `body` is the already serialized JSON of `params`, if at hand. GET
+        and DELETE requests without parameters are sent without a body.
+        """
+        if body is None:
+            if params:
+                body = self.json_codec.dumps(params)
+            elif http_method not in BODILESS_METHODS:
+                body = EMPTY_BODY
+        timing = current_timing() if self.instrumentation is not None else None
+        if self.resilience is not None:
+            return self.resilience.call(
+                command, http_method, lambda: self._send_once(command, http_method, body, timing))
+        return self._send_once(command, http_method, body, timing)
+
+    def _template(self, command: str, http_method: HTTPMethod) -> RequestTemplate:
+        """Request template of an endpoint for the current credentials"""
+        key = (command, http_method, self.private_key, self.public_key)
+        template = self._templates.get(key)
+        if template is None:
+            if len(self._templates) >= _MAX_TEMPLATES:
+                # Order identifiers make commands unbounded, start over
+                self._templates.clear()
+            template = self._templates[key] = RequestTemplate(
+                self.private_key, self.public_key, command, http_method, self.base_url)
+        return template
+
+    def _send_once(self, command: str, http_method: HTTPMethod, body: Union[str, bytes],
+                   timing=None):
+        """Send one attempt of a request once the rate limiter allows it
+
+        Retried and hedged attempts time their phases into the same `timing`,
+        the last one to finish leaving its durations.
+        """
+        if (self.rate_limiter is not None and
+                not self.rate_limiter.acquire(priority_for(command, http_method))):
+            return SHED_RESPONSE
+
+        template = self._template(command, http_method)
+        if self.session_pool is None:
+            return template.send(None, body, self.timeout, self.json_codec.loads, timing)
+        with self.session_pool.use() as session:
+            return template.send(session, body, self.timeout, self.json_codec.loads, timing)
+
+    def _stream(self, command: str, chunk_size: int) -> Iterator[bytes]:
+        """Send a GET request, yielding the body in chunks as they arrive
+
+        Streams go through the rate limiter but are not retried, a retry
+        could not take back the items already yielded.
+        """
+        if (self.rate_limiter is not None and
+                not self.rate_limiter.acquire(priority_for(command, HTTPMethod.GET))):
+            return iter([json.dumps(SHED_RESPONSE).encode()])
+
+        request = Request(self.private_key, self.public_key, command, HTTPMethod.GET,
+                          base_url=self.base_url)
+        if self.session_pool is None:
+            return request.stream(None, self.timeout, chunk_size)
+        return self._pooled_stream(request, chunk_size)
+
+    def _pooled_stream(self, request: Request, chunk_size: int) -> Iterator[bytes]:
+        """Stream a request over the pooled session, in use until the stream ends"""
+        with self.session_pool.use() as session:
+            yield from request.stream(session, self.timeout, chunk_size)
+
+    def _learn_pairs(self, currency_pairs: Iterable[str]) -> None:
+        """Download the currency pairs if the price scale of any is unknown"""
+        if not all(self.fixed_point.knows(pair) for pair in currency_pairs):
+            response = self.get_currency_pairs()
+            if succeeded(response):
+                self.fixed_point.update(response.currency_pairs)
+
+    def _fixed(self, response, currency_pair: str = None):
+        """Response with fixed-point prices and quantities, when enabled"""
+        if self.fixed_point is None or not succeeded(response):
+            return response
+        for key in ('transactions', 'trades', 'orders'):
+            items = getattr(response, key, None)
+            if isinstance(items, LazyList):
+                items.then(self._learn_item_pairs)
+        self._learn_pairs(self.fixed_point.currency_pairs(response, currency_pair))
+        return self.fixed_point.convert(response, currency_pair)
+
+    def _learn_item_pairs(self, item):
+        """Item of a lazy list, once the price scales converting it are known"""
+        self._learn_pairs(self.fixed_point.item_pairs(item))
+        return item
+
+    def _fixed_trades(self, trades: Iterator, currency_pair: str = None) -> Iterator:
+        """Streamed trades with fixed-point prices and quantities, when enabled"""
+        if self.fixed_point is None:
+            return trades
+        return (self._fixed_trade(trade, currency_pair) for trade in trades)
+
+    def _fixed_trade(self, trade, currency_pair: str):
+        self._learn_pairs({trade.currency_pair or currency_pair})
+        self.fixed_point.convert_trades([trade], currency_pair)
+        return trade
+
+    def close(self) -> None:
+        """Close pooled connections, hedging threads and decoding processes held by the API"""
+        if self.session_pool is not None:
+            self.session_pool.close()
+        if self.resilience is not None:
+            self.resilience.close()
+        if self.parallel_decoder is not None:
+            self.parallel_decoder.close()
+
+    @staticmethod
+    def _map_orders(function, items: list, max_workers: int) -> List[object]:
+        """Call a function on every item over a bounded thread pool, in input order
+
+        Exceptions are returned in place of the response of their call.
+        """
+        def call(item):
+            try:
+                return function(item)
+            except Exception as error:  # pylint: disable=broad-except
+                return error
+
+        if not items:
+            return []
+        with ThreadPoolExecutor(min(max_workers, len(items))) as executor:
+            return list(executor.map(call, items))
+
+    def _many(self, method, currency_pairs: Iterable[str], max_workers: int, **kwargs) -> BatchResponse:
+        """Call a per pair method for many pairs over a bounded thread pool"""
+        def call(currency_pair):
+            try:
+                return method(currency_pair, **kwargs)
+            except Exception as error:  # pylint: disable=broad-except
+                return error
+
+        currency_pairs = list(dict.fromkeys(currency_pairs))
+        batch = BatchResponse({}, {})
+        if not currency_pairs:
+            return batch
+
+        with ThreadPoolExecutor(min(max_workers, len(currency_pairs))) as executor:
+            for currency_pair, response in zip(currency_pairs, executor.map(call, currency_pairs)):
+                if not isinstance(response, Exception) and succeeded(response):
+                    batch.responses[currency_pair] = response
+                else:
+                    batch.errors[currency_pair] = response
+        return batch
+
+    # The following methods are in the public domain
+    # of the API and can be used without setting API
+    # credentials first
+    @cached
+    @coalesced
+    @instrumented
+    def get_currency_pairs(self) -> GetCurrencyPairsResponse:
+        """Get currency pairs"""
+        response = self._send('v1/Reference/CurrencyPairs')
+        return self._load(get_currency_pairs_response_schema, response)
+
+    @cached
+    @coalesced
+    @instrumented
+    def get_market_depth(self, currency_pair: str, columnar: bool = False) -> GetMarketDepthResponse:
+        """Get currency pair market depth, as NumPy columns if columnar"""
+        response = self._send('v1/Public/MarketDepth/{0}'.format(currency_pair))
+        return self._fixed(self._load_book(get_market_depth_response_schema, response, columnar),
+                           currency_pair)
+
+    @cached
+    @coalesced
+    @instrumented
+    def get_order_book(self, currency_pair: str, columnar: bool = False) -> GetOrderBookResponse:
+        """Get currency pair order book, as NumPy columns if columnar"""
+        response = self._send('v1/{0}/OrderBook'.format(currency_pair))
+        return self._fixed(self._load_book(get_order_book_response_schema, response, columnar),
+                           currency_pair)
+
+    @cached
+    @coalesced
+    @instrumented
+    def get_recent_transactions(self, currency_pair: str) -> GetRecentTransactionsResponse:
+        """Get recent transactions for the currency pair"""
+        response = self._send('v1/Public/Transactions/{0}'.format(currency_pair))
+        return self._fixed(self._load(get_recent_transactions_response_schema, response), currency_pair)
+
+    @instrumented_stream
+    def iter_recent_transactions(self, currency_pair: str, chunk_size: int = 65536) -> Iterator[Transaction]:
+        """Iterate over recent transactions, decoded as the response arrives"""
+        chunks = self._stream('v1/Public/Transactions/{0}'.format(currency_pair), chunk_size)
+        return self._fixed_trades(self._load_items(transaction_schema, chunks, 'transactions'),
+                                  currency_pair)
+
+    # Batch variants of the public methods run up to
+    # max_workers requests at a time and report
+    # failures per currency pair
+    def get_market_depth_many(
+            self,
+            currency_pairs: Iterable[str],
+            max_workers: int = 8,
+            columnar: bool = False) -> BatchResponse:
+        """Get market depth of many currency pairs concurrently"""
+        return self._many(self.get_market_depth, currency_pairs, max_workers, columnar=columnar)
 
+    def get_order_book_many(
+            self,
+            currency_pairs: Iterable[str],
+            max_workers: int = 8,
+            columnar: bool = False) -> BatchResponse:
+        """Get order books of many currency pairs concurrently"""
+        return self._many(self.get_order_book, currency_pairs, max_workers, columnar=columnar)
+
+    def get_recent_transactions_many(
+            self,
+            currency_pairs: Iterable[str],
+            max_workers: int = 8) -> BatchResponse:
+        """Get recent transactions of many currency pairs concurrently"""
+        return self._many(self.get_recent_transactions, currency_pairs, max_workers)
+
+    # The following methods are in the trading
+    # domain of the API and must be used only
+    # after credentials have been set otherwise
+    # the response will always be a failure
+    @coalesced
+    @instrumented
+    def get_balances(self) -> GetBalancesResponse:
+        """Get all balances, refreshing the balance snapshot"""
+        requested = self.balances.clock()
+        response = self._send('v1/Balance/Balances')
+        balances = self._load(get_balances_response_schema, response)
+        self.balances.update(balances, requested)
+        return balances
+
+    def refresh_balances(self) -> GetBalancesResponse:
+        """Download the balances again whatever the age of the snapshot"""
+        return self.get_balances()
+
+    def _balance_snapshot(self) -> GetBalancesResponse:
+        """Balances response still fresh, downloaded again otherwise"""
+        if self.balances.fresh():
+            return self.balances.response
+        return self.get_balances()
+
+    @instrumented
+    def get_balance(self, currency_code: str) -> GetBalanceResponse:
+        """Get specific currency balance, from the snapshot while it is fresh"""
+        snapshot = self._balance_snapshot()
+        if snapshot is None:
+            return None
+        if not succeeded(snapshot):
+            return GetBalanceResponse(response_status=snapshot.response_status)
+
+        balance = self.balances.get(currency_code, snapshot)
+        if balance is None:
+            return self._load(get_balance_response_schema, unknown_currency_response(currency_code))
+        return GetBalanceResponse(balance, snapshot.response_status)
+
+    def get_balances_for(self, currency_codes: Iterable[str]) -> Dict[str, AccountBalance]:
+        """Get the balances of several currencies with at most one request
+
+        Currencies without a balance map to None, and so do all of them when
+        the balances could not be downloaded.
+        """
+        snapshot = self._balance_snapshot()
+        if not succeeded(snapshot):
+            return dict.fromkeys(currency_codes)
+        return self.balances.get_many(currency_codes, snapshot)
+
+    @coalesced
+    @instrumented
+    def get_open_orders(self) -> GetOpenOrdersResponse:
+        """Get all open orders, reconciling the open order store with them"""
+        requested = self.open_orders.clock()
+        response = self._send('v1/Trade/Orders')
+        orders = self._fixed(self._load(get_open_orders_response_schema, response))
+        self.open_orders.reconcile(orders, requested)
+        return orders
+
+    @coalesced
+    @instrumented
+    def get_open_order(self, order_id: str) -> GetOpenOrderResponse:
+        """Get specific open order, from the open order store while it is fresh"""
+        if self.open_orders.fresh():
+            order = self.open_orders.get(order_id)
+            if order is not None:
+                return GetOpenOrderResponse(order, ResponseStatus(message='OK'))
+        response = self._send('v1/Trade/Orders/{0}'.format(order_id))
+        return self._fixed(self._load(get_open_order_response_schema, response))
+
+    @instrumented
+    def create_order(
+            self,
+            currency_pair: str,
+            order_way: str,
+            price: float = None,
+            amount: float = None,
+            spend_amount: float = None,
+            external_order_id: str = None,
+            validation_code: str = None,
+            fixed_price: int = None,
+            fixed_amount: int = None,
+            fixed_spend_amount: int = None) -> CreateOrderResponse:
+        """Place new order
+
+        With a `FixedPoint`, `fixed_price`, `fixed_amount` and
+        `fixed_spend_amount` take fixed-point values in place of `price`,
+        `amount` and `spend_amount`.
+        """
+        price, amount, spend_amount = self._order_values(
+            currency_pair, price, amount, spend_amount, fixed_price, fixed_amount, fixed_spend_amount)
+        order = OpenOrder(currency_pair, None, SIDES.get(order_way), price, amount, amount)
+        if self.fixed_point is not None:
+            order.price, order.initial_quantity, order.remaining_quantity = self._fixed_order_values(
+                currency_pair, price, amount)
+        body = order_body(currency_pair, order_way, price, amount,
+                          spend_amount, external_order_id, validation_code)
+
+        response = self._send('v1/Trade/Orders', HTTPMethod.POST, body=body)
+        self.balances.invalidate()
+        created = self._load(create_order_response_schema, response)
+        if succeeded(created) and created.cl_order_id is not None:
+            order.cl_order_id = created.cl_order_id
+            order.status_desc = created.order_status
+            self.open_orders.track(order)
+        return created
+
+    def _order_values(self, currency_pair: str, price, amount, spend_amount,
+                      fixed_price, fixed_amount, fixed_spend_amount) -> tuple:
+        """Price and amounts of an order, fixed-point ones as floats exact in their JSON text"""
+        fixed_point = self.fixed_point
+        if fixed_point is None and (fixed_price, fixed_amount, fixed_spend_amount) != (None, None, None):
+            raise ValueError('Fixed-point order values need a FixedPoint')
+        if fixed_price is not None:
+            self._learn_pairs({currency_pair})
+        price = self._one_of('price', price, fixed_price,
+                             lambda value: fixed_point.price_value(currency_pair, value))
+        if price is None:
+            raise ValueError('An order needs a price or a fixed_price')
+        amount = self._one_of('amount', amount, fixed_amount, lambda value: fixed_point.quantity_value(value))
+        spend_amount = self._one_of('spend_amount', spend_amount, fixed_spend_amount,
+                                    lambda value: fixed_point.quantity_value(value))
+        return price, amount, spend_amount
+
+    @staticmethod
+    def _one_of(name: str, value, fixed_value, to_value):
+        """Value of an order argument given either as a float or as a fixed-point integer"""
+        if fixed_value is None:
+            return value
+        if value is not None:
+            raise ValueError('Give either {0} or fixed_{0}, not both'.format(name))
+        return to_value(fixed_value)
+
+    def _fixed_order_values(self, currency_pair: str, price: float, amount: float) -> tuple:
+        """Fixed-point price and quantities of an order, as its snapshots will hold them"""
+        self._learn_pairs({currency_pair})
+        fixed_point = self.fixed_point
+        quantity = None if amount is None else fixed_point.to_quantity(amount)
+        return fixed_point.to_price(currency_pair, price), quantity, quantity
+
+    @instrumented
     def cancel_order(self, order_id: str) -> CancelOpenOrderResponse:
         """Cancel an active order"""
         params = {
             'OrderID': order_id
         }
 
-        response = Request(self.private_key, self.public_key,
-                           'v1/Trade/Orders/{0}'.format(order_id), HTTPMethod.DELETE, params).send()
-        obj, err = cancel_open_order_response_schema.load(
-            response, partial=True)
-
-        return self._handle_response(obj, err)
+        response = self._send('v1/Trade/Orders/{0}'.format(order_id), HTTPMethod.DELETE, params)
+        self.balances.invalidate()
+        cancelled = self._load(cancel_open_order_response_schema, response)
+        if succeeded(cancelled):
+            self.open_orders.remove(order_id)
+        return cancelled
 
+    @instrumented
     def cancel_all_orders(self) -> CancelAllOpenOrdersResponse:
         """Cancel all active orders"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Trade/Orders', HTTPMethod.DELETE).send()
-        obj, err = cancel_all_open_orders_response_schema.load(
-            response, partial=True)
-
-        return self._handle_response(obj, err)
-
+        response = self._send('v1/Trade/Orders', HTTPMethod.DELETE)
+        self.balances.invalidate()
+        cancelled = self._load(cancel_all_open_orders_response_schema, response)
+        if succeeded(cancelled):
+            self.open_orders.clear()
+        return cancelled
+
+    # Bulk variants of the order methods run up to
+    # max_workers requests at a time and report
+    # failures per order
+    def create_orders(self, orders: Iterable[dict], max_workers: int = 10) -> OrderBatchResponse:
+        """Place many orders concurrently
+
+        Each order is a dictionary of `create_order` keyword arguments.
+        """
+        orders = list(orders)
+        responses = self._map_orders(lambda order: self.create_order(**order), orders, max_workers)
+        batch = OrderBatchResponse(responses, {}, {})
+        for index, (order, response) in enumerate(zip(orders, responses)):
+            if isinstance(response, Exception) or not succeeded(response):
+                batch.errors[index] = response
+            elif order.get('external_order_id') is not None:
+                batch.cl_order_ids[order['external_order_id']] = response.cl_order_id
+        return batch
+
+    def cancel_orders(self, order_ids: Iterable[str], max_workers: int = 10) -> OrderBatchResponse:
+        """Cancel many orders concurrently"""
+        responses = self._map_orders(self.cancel_order, list(order_ids), max_workers)
+        return OrderBatchResponse(responses, {
+            index: response for index, response in enumerate(responses)
+            if isinstance(response, Exception) or not succeeded(response)
+        }, {})
+
+    @coalesced
+    @instrumented
     def get_trade_history(self) -> GetTradeHistoryResponse:
         """Get trade history"""
-        response = Request(self.private_key, self.public_key,
-                           'v1/Trade/TradeHistory').send()
-        obj, err = get_trade_history_response_schema.load(
-            response, partial=True)
+        response = self._send('v1/Trade/TradeHistory')
+        return self._fixed(self._load(get_trade_history_response_schema, response))
 
-        return self._handle_response(obj, err)
+    @instrumented_stream
+    def iter_trade_history(
+            self,
+            chunk_size: int = 65536,
+            known_ids: Container[int] = ()) -> Iterator[TraderTransaction]:
+        """Iterate over trade history, decoded as the response arrives
+
+        Trades whose transaction id is in `known_ids` are skipped before
+        being decoded.
+        """
+        chunks = self._stream('v1/Trade/TradeHistory', chunk_size)
+        return self._fixed_trades(self._load_items(trader_transaction_schema, chunks, 'trades',
+                                                   known_ids, 'transactionId'))
@@ -0,0 +1,214 @@
+"""Asyncio API client module for Gatecoin REST API"""
+import time
+from typing import Union
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .api import BaseGatecoinAPI
+from .constants import HTTPMethod
+from .json_codec import STDLIB, JSONCodec, get_codec
+from .request import UNSUPPORTED_REQUEST_RESPONSE, Request, _transient
+from .schemas import (cancel_all_open_orders_response_schema,
+                      cancel_open_order_response_schema,
+                      create_order_response_schema,
+                      get_balance_response_schema,
+                      get_balances_response_schema,
+                      get_currency_pairs_response_schema,
+                      get_market_depth_response_schema,
+                      get_open_order_response_schema,
+                      get_open_orders_response_schema,
+                      get_order_book_response_schema,
+                      get_recent_transactions_response_schema,
+                      get_trade_history_response_schema)
+from .types import (CancelAllOpenOrdersResponse, CancelOpenOrderResponse,
+                    CreateOrderResponse, GetBalanceResponse,
+                    GetBalancesResponse, GetCurrencyPairsResponse,
+                    GetMarketDepthResponse, GetOpenOrderResponse,
+                    GetOpenOrdersResponse, GetOrderBookResponse,
+                    GetRecentTransactionsResponse, GetTradeHistoryResponse)
+
+
+class AsyncRequest(Request):
+    """Request sent over an aiohttp client session"""
+
+    async def send(self, session: 'aiohttp.ClientSession', json_codec: JSONCodec = STDLIB,
+                   timeout: float = None):
+        """Coroutine to launch the request, parsing the response bytes with the codec
+
+        GET and DELETE requests without parameters are sent without a body.
+        Server errors, throttling and error statuses whose body is not JSON
+        raise `aiohttp.ClientResponseError`, and `timeout` bounds in seconds
+        the wait for connecting and each read.
+        """
+        if not isinstance(self.http_method, HTTPMethod):
+            return UNSUPPORTED_REQUEST_RESPONSE
+
+        headers = self.signed_headers('{:.3f}'.format(time.time()))
+        # aiohttp refuses None header values where requests drops them
+        headers = {name: value for name, value in headers.items() if value is not None}
+
+        client_timeout = None
+        if timeout is not None:
+            client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+        async with session.request(self.http_method.value, self.url, data=self.body(json_codec.dumps),
+                                   headers=headers, timeout=client_timeout) as response:
+            if _transient(response.status):
+                response.raise_for_status()
+            content = await response.read()
+            try:
+                return json_codec.loads(content)
+            except ValueError:
+                response.raise_for_status()
+                raise
+
+
+class AsyncGatecoinAPI(BaseGatecoinAPI):
+    """Gatecoin API class for asyncio applications
+
+    Every method of `GatecoinAPI` is available as a coroutine. Requests are
+    signed exactly like the blocking client and decoded with the same
+    schemas, while a single aiohttp session keeps up to `max_connections`
+    requests in flight on one event loop. The session is opened lazily on the
+    first request and released by `close()` or by leaving an `async with`
+    block. `timeout` bounds every request in seconds, and error statuses
+    raise as they do in the blocking client.
+    """
+
+    def __init__(
+            self,
+            private_key: str = None,
+            public_key: str = None,
+            base_url: str = None,
+            max_connections: int = 100,
+            max_connections_per_host: int = 0,
+            keep_alive_timeout: float = 30.0,
+            strict: bool = False,
+            raw_timestamps: bool = False,
+            json_codec: Union[str, JSONCodec] = None,
+            timeout: float = None):
+        if aiohttp is None:
+            raise ImportError('AsyncGatecoinAPI requires aiohttp, install gatecoin_api[async]')
+
+        super().__init__(private_key, public_key, base_url, strict, raw_timestamps)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive_timeout = keep_alive_timeout
+        self.json_codec = get_codec(json_codec)
+        self.timeout = timeout
+        self._session = None
+
+    def _client_session(self) -> 'aiohttp.ClientSession':
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keep_alive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _send(
+            self,
+            command: str,
+            http_method: HTTPMethod = HTTPMethod.GET,
+            params: object = {}):
+        """Send a request over the shared client session"""
+        return await AsyncRequest(self.private_key, self.public_key, command,
+                                  http_method, params, self.base_url).send(
+                                      self._client_session(), self.json_codec, self.timeout)
+
+    async def close(self) -> None:
+        """Close the client session and its connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    # The following methods are in the public domain
+    # of the API and can be used without setting API
+    # credentials first
+    async def get_currency_pairs(self) -> GetCurrencyPairsResponse:
+        """Get currency pairs"""
+        response = await self._send('v1/Reference/CurrencyPairs')
+        return self._load(get_currency_pairs_response_schema, response)
+
+    async def get_market_depth(self, currency_pair: str, columnar: bool = False) -> GetMarketDepthResponse:
+        """Get currency pair market depth, as NumPy columns if columnar"""
+        response = await self._send('v1/Public/MarketDepth/{0}'.format(currency_pair))
+        return self._load_book(get_market_depth_response_schema, response, columnar)
+
+    async def get_order_book(self, currency_pair: str, columnar: bool = False) -> GetOrderBookResponse:
+        """Get currency pair order book, as NumPy columns if columnar"""
+        response = await self._send('v1/{0}/OrderBook'.format(currency_pair))
+        return self._load_book(get_order_book_response_schema, response, columnar)
+
+    async def get_recent_transactions(self, currency_pair: str) -> GetRecentTransactionsResponse:
+        """Get recent transactions for the currency pair"""
+        response = await self._send('v1/Public/Transactions/{0}'.format(currency_pair))
+        return self._load(get_recent_transactions_response_schema, response)
+
+    # The following methods are in the trading
+    # domain of the API and must be used only
+    # after credentials have been set otherwise
+    # the response will always be a failure
+    async def get_balances(self) -> GetBalancesResponse:
+        """Get all balances"""
+        response = await self._send('v1/Balance/Balances')
+        return self._load(get_balances_response_schema, response)
+
+    async def get_balance(self, currency_code: str) -> GetBalanceResponse:
+        """Get specific currency balance"""
+        response = self._select_balance(await self._send('v1/Balance/Balances'), currency_code)
+        return self._load(get_balance_response_schema, response)
+
+    async def get_open_orders(self) -> GetOpenOrdersResponse:
+        """Get all open orders"""
+        response = await self._send('v1/Trade/Orders')
+        return self._load(get_open_orders_response_schema, response)
+
+    async def get_open_order(self, order_id: str) -> GetOpenOrderResponse:
+        """Get specific open order"""
+        response = await self._send('v1/Trade/Orders/{0}'.format(order_id))
+        return self._load(get_open_order_response_schema, response)
+
+    async def create_order(
+            self,
+            currency_pair: str,
+            order_way: str,
+            price: float,
+            amount: float = None,
+            spend_amount: float = None,
+            external_order_id: str = None,
+            validation_code: str = None) -> CreateOrderResponse:
+        """Place new order"""
+        params = self._create_order_params(currency_pair, order_way, price, amount,
+                                           spend_amount, external_order_id, validation_code)
+
+        response = await self._send('v1/Trade/Orders', HTTPMethod.POST, params)
+        return self._load(create_order_response_schema, response)
+
+    async def cancel_order(self, order_id: str) -> CancelOpenOrderResponse:
+        """Cancel an active order"""
+        params = {
+            'OrderID': order_id
+        }
+
+        response = await self._send('v1/Trade/Orders/{0}'.format(order_id), HTTPMethod.DELETE, params)
+        return self._load(cancel_open_order_response_schema, response)
+
+    async def cancel_all_orders(self) -> CancelAllOpenOrdersResponse:
+        """Cancel all active orders"""
+        response = await self._send('v1/Trade/Orders', HTTPMethod.DELETE)
+        return self._load(cancel_all_open_orders_response_schema, response)
+
+    async def get_trade_history(self) -> GetTradeHistoryResponse:
+        """Get trade history"""
+        response = await self._send('v1/Trade/TradeHistory')
+        return self._load(get_trade_history_response_schema, response)
@@ -0,0 +1,84 @@
+"""Snapshot of the account balances indexed by currency
+
+Every `get_balance` call used to download the whole balance list and scan
+it for one currency. A `BalanceCache` keeps the last decoded balances
+response with an index by currency code, so that lookups within the
+freshness window are dictionary reads instead of round trips.
+"""
+import threading
+import time
+from typing import Callable, Dict
+
+from .types import AccountBalance, GetBalancesResponse, succeeded
+
+
+def unknown_currency_response(currency_code: str) -> dict:
+    """Failed balance response for a currency without a balance"""
+    return {
+        "responseStatus": {
+            "errorCode": "404",
+            "message": "No balance for currency {0}".format(currency_code)
+        }
+    }
+
+
+class BalanceCache:
+    """Last balances response and its index, fresh for `max_age` seconds
+
+    Responses to requests sent before the last invalidation are not kept,
+    as they may predate the order change which invalidated the snapshot.
+    """
+
+    def __init__(self, max_age: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self.clock = clock
+        self.response = None
+        self._indexed = (None, {})
+        self._taken = None
+        self._invalidated = None
+        self._lock = threading.Lock()
+
+    def fresh(self) -> bool:
+        """Whether a snapshot younger than `max_age` is held"""
+        taken = self._taken
+        return taken is not None and self.clock() - taken < self.max_age
+
+    def update(self, response: GetBalancesResponse, requested: float = None) -> None:
+        """Keep a successful balances response as the current snapshot
+
+        `requested` is the clock reading when the balances were requested,
+        a response requested before the last invalidation is ignored.
+        """
+        if not succeeded(response):
+            return
+        by_currency = {balance.currency: balance for balance in response.balances or ()}
+        with self._lock:
+            if requested is not None and self._invalidated is not None and requested < self._invalidated:
+                return
+            self.response = response
+            self._indexed = (response, by_currency)
+            self._taken = self.clock() if requested is None else requested
+
+    def invalidate(self) -> None:
+        """Forget the snapshot, the next lookup downloads the balances again"""
+        with self._lock:
+            self._taken = None
+            self._invalidated = self.clock()
+
+    def _index(self, response: GetBalancesResponse) -> Dict[str, AccountBalance]:
+        indexed, by_currency = self._indexed
+        if response is None or response is indexed:
+            return by_currency
+        return {balance.currency: balance for balance in response.balances or ()}
+
+    def get(self, currency_code: str, response: GetBalancesResponse = None) -> AccountBalance:
+        """Balance of a currency in the snapshot, or in `response`, None if there is none"""
+        return self._index(response).get(currency_code)
+
+    def get_many(self, currency_codes, response: GetBalancesResponse = None) -> Dict[str, AccountBalance]:
+        """Balances of several currencies, None for those without one
+
+        A `response` which was not kept as the snapshot is indexed for the lookup.
+        """
+        by_currency = self._index(response)
+        return {code: by_currency.get(code) for code in currency_codes}
@@ -0,0 +1,137 @@
+"""Cache of decoded responses for the public reference endpoints
+
+Currency pairs change a few times a year and several components often ask
+for the same market depth within milliseconds. A `ResponseCache` attached
+to `GatecoinAPI` keeps the decoded response objects of the endpoints given
+a time to live, so a hit skips both the HTTP round trip and the decoding.
+Cached objects are shared between callers and must not be modified.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict
+
+from .types import succeeded
+
+# Seconds during which responses of each endpoint are served from the cache
+DEFAULT_TTLS = {
+    'get_currency_pairs': 3600.0,
+    'get_market_depth': 1.0,
+    'get_order_book': 1.0,
+    'get_recent_transactions': 1.0
+}
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """Thread safe TTL cache of decoded responses with LRU eviction
+
+    Only endpoints present in `ttls` are cached. Once `max_entries` entries
+    are held, storing another one evicts the least recently used. Hits and
+    misses are counted per endpoint.
+    """
+
+    def __init__(
+            self,
+            ttls: Dict[str, float] = None,
+            max_entries: int = 256,
+            clock: Callable[[], float] = time.monotonic):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def caches(self, endpoint: str) -> bool:
+        """Whether responses of an endpoint are cached"""
+        return self.ttls.get(endpoint, 0) > 0
+
+    def get(self, key: tuple):
+        """Return the fresh value stored under a key, `_MISSING` if there is none"""
+        endpoint = key[0]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits[endpoint] += 1
+                    return value
+                del self._entries[key]
+            self.misses[endpoint] += 1
+        return _MISSING
+
+    def put(self, key: tuple, value) -> None:
+        """Store a value under a key for the time to live of its endpoint"""
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttls[key[0]], value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoint: str = None, *args) -> int:
+        """Drop cached responses, returning how many were dropped
+
+        Without arguments everything is dropped. Otherwise only responses of
+        `endpoint` whose call arguments start with `args` are, for instance
+        `invalidate('get_market_depth', 'BTCUSD')`.
+        """
+        with self._lock:
+            if endpoint is None:
+                count = len(self._entries)
+                self._entries.clear()
+                return count
+            keys = [key for key in self._entries
+                    if key[0] == endpoint and key[1][:len(args)] == args]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def stats(self) -> dict:
+        """Totals of hits, misses and evictions and the current size"""
+        return {
+            'hits': sum(self.hits.values()),
+            'misses': sum(self.misses.values()),
+            'evictions': self.evictions,
+            'size': len(self._entries)
+        }
+
+
+def cached(method):
+    """Serve an API method from the `cache` of its API when it has one
+
+    Failed calls, returning None or an error status, are not cached. Calls
+    are keyed by their arguments bound to the parameters, defaults
+    included, so `get_order_book('BTCUSD')` and
+    `get_order_book('BTCUSD', columnar=False)` share an entry.
+    """
+    endpoint = method.__name__
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None or not cache.caches(endpoint):
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (endpoint, tuple(bound.arguments.values())[1:])
+        value = cache.get(key)
+        if value is _MISSING:
+            value = method(self, *args, **kwargs)
+            if succeeded(value):
+                cache.put(key, value)
+        return value
+
+    return wrapper
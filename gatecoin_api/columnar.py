@@ -0,0 +1,90 @@
+"""Columnar NumPy representation of order book sides
+
+Deep books decoded into one `Limit` object per price level cost thousands
+of allocations. In columnar mode each side of `get_order_book` and
+`get_market_depth` responses is a `LimitColumns`, two contiguous float64
+arrays built straight from the JSON lists, and `Limit` objects are only
+created when levels are indexed or iterated.
+"""
+from operator import itemgetter
+from typing import Iterator, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from . import decoders
+from .types import Limit
+
+_price = itemgetter('price')
+_volume = itemgetter('volume')
+
+
+class LimitColumns:
+    """One side of a book as contiguous price and volume arrays"""
+
+    def __init__(self, prices: 'np.ndarray', volumes: 'np.ndarray'):
+        self.prices = prices
+        self.volumes = volumes
+
+    @classmethod
+    def from_levels(cls, levels: list) -> 'LimitColumns':
+        """Build the columns from `[price, volume]` pairs or limit dictionaries"""
+        if np is None:
+            raise ImportError('Columnar books require numpy, install gatecoin_api[columnar]')
+
+        count = len(levels)
+        if count and isinstance(levels[0], dict):
+            prices = np.fromiter(map(_price, levels), np.float64, count)
+            volumes = np.fromiter(map(_volume, levels), np.float64, count)
+        else:
+            prices, volumes = np.array(levels, dtype=np.float64).reshape(count, 2).T.copy()
+
+        # NumPy turns nulls into NaN where the schemas reject them
+        if np.isnan(prices).any() or np.isnan(volumes).any():
+            raise ValueError('Book levels may not be null')
+        return cls(prices, volumes)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LimitColumns(self.prices[index], self.volumes[index])
+        return Limit(self.prices[index].item(), self.volumes[index].item())
+
+    def __iter__(self) -> Iterator[Limit]:
+        return map(Limit, self.prices.tolist(), self.volumes.tolist())
+
+    def __repr__(self):
+        return repr(self.to_limits())
+
+    def to_limits(self) -> List[Limit]:
+        """Materialize every level as a `Limit`"""
+        return list(self)
+
+
+def load_columnar(schema, response, strict: bool = False):
+    """Deserialize a book response with columnar `asks` and `bids`
+
+    The envelope is decoded by the regular decoders. Sides that do not
+    convert to float arrays send the whole response down the regular path so
+    that errors are reported as usual.
+    """
+    if not isinstance(response, dict):
+        return decoders.load(schema, response, strict)
+
+    envelope = {key: value for key, value in response.items() if key not in ('asks', 'bids')}
+    obj, err = decoders.load(schema, envelope, strict)
+    if err:
+        return obj, err
+
+    try:
+        for side in ('asks', 'bids'):
+            if side in response:
+                setattr(obj, side, LimitColumns.from_levels(response[side]))
+    except (TypeError, ValueError, KeyError):
+        return decoders.load(schema, response, strict)
+
+    return obj, err
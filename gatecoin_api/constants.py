@@ -1,5 +1,5 @@
 """Common constants and enums"""
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class HTTPMethod(Enum):
@@ -13,6 +13,14 @@ class HTTPMethod(Enum):
         return self.value + other
 
 
+class Priority(IntEnum):
+    """Rate limiter priority classes, lower values served first"""
+    CANCEL = 0
+    CREATE = 1
+    PRIVATE = 2
+    PUBLIC = 3
+
+
 # Order Ways
 BID = 'bid'
 ASK = 'ask'
@@ -0,0 +1,258 @@
+"""Compiled fast-path decoders for the response schemas
+
+Marshmallow runs every field of every item through its generic validation
+machinery, which costs more than the network round trip for long trade
+lists. The decoders built here read the field definitions of a schema once
+(attribute names, `load_from` keys and field types) and generate one plain
+Python function per schema that converts a JSON payload straight into the
+objects the schema's `make_object` hook produces.
+
+Marshmallow stays the reference implementation: payloads a decoder cannot
+handle, for instance a null or mistyped value, are handed to
+`Schema.load` so that errors are reported exactly as before, and
+`strict=True` skips the decoders altogether.
+"""
+from marshmallow import ValidationError, fields
+
+from .schemas import EpochDateTime
+from .timestamps import EpochTime, epoch_to_datetime, epochs_to_datetimes
+
+# Hooks of the schemas in this package whose behaviour the decoders reproduce
+_KNOWN_HOOKS = {'make_object', 'transform_to_dict'}
+
+# Errors raised by a decoder on payloads it does not handle
+_DECODE_ERRORS = (TypeError, ValueError, KeyError, IndexError,
+                  AttributeError, OverflowError, OSError, ValidationError)
+
+_MISSING = object()
+
+_decoders = {}
+
+_raw_timestamp_schemas = {}
+
+
+class _Invalid(ValueError):
+    """Raised by generated code on values marshmallow would reject"""
+
+
+def _compilable(schema) -> bool:
+    """Whether every hook and field of the schema is understood"""
+    for names in type(schema).__processors__.values():
+        if not _KNOWN_HOOKS.issuperset(names):
+            return False
+    for field in schema.fields.values():
+        if (field.validators or field.attribute or field.allow_none or
+                field.required or field.dump_only):
+            return False
+    return True
+
+
+def _epoch_attributes(schema) -> tuple:
+    """Attributes of a schema loaded from unix timestamps"""
+    return tuple(attr for attr, field in schema.fields.items()
+                 if isinstance(field, EpochDateTime))
+
+
+def _convert_epochs(kwargs_list: list, attributes: tuple) -> None:
+    """Replace epoch seconds by datetimes over a whole list of items at once"""
+    for attr in attributes:
+        holders = [kwargs for kwargs in kwargs_list if attr in kwargs]
+        moments = epochs_to_datetimes([kwargs[attr] for kwargs in holders])
+        for kwargs, moment in zip(holders, moments):
+            kwargs[attr] = moment
+
+
+class _Compiler:
+    """Generates the source of the decoder functions of a schema tree
+
+    With `raw_timestamps` timestamp fields are decoded to `EpochTime`
+    values. Otherwise items of a list keep their epoch seconds until the
+    whole list is decoded, then all of them are converted in one batch.
+    """
+
+    def __init__(self, raw_timestamps: bool = False):
+        self.raw_timestamps = raw_timestamps
+        self.namespace = {
+            '_Invalid': _Invalid,
+            '_MISSING': _MISSING,
+            '_EpochTime': EpochTime,
+            '_epoch_to_datetime': epoch_to_datetime,
+            '_convert_epochs': _convert_epochs
+        }
+        self.functions = {}
+        self.batched = {}
+        self.sources = []
+
+    def _bind(self, prefix: str, value) -> str:
+        name = '_{0}{1}'.format(prefix, len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def function(self, schema) -> str:
+        """Return the name of the decoder function of a schema"""
+        if schema in self.functions:
+            return self.functions[schema]
+
+        if not _compilable(schema):
+            name = self._bind('load', _strict_loader(schema))
+            self.functions[schema] = name
+            return name
+
+        name = 'decode_{0}_{1}'.format(type(schema).__name__, len(self.functions))
+        self.functions[schema] = name
+        make_object = self._bind('make', schema.make_object)
+        epoch_attributes = () if self.raw_timestamps else _epoch_attributes(schema)
+
+        if not epoch_attributes:
+            lines = ['def {0}(d):'.format(name)]
+            lines.extend(self.body(schema))
+            lines.append('    return {0}(kw)'.format(make_object))
+            self.sources.append('\n'.join(lines))
+            return name
+
+        # Timestamps are read as seconds by the keyword builder, so that
+        # lists of items can convert them in one batch
+        kwargs_name = 'kwargs_' + name
+        lines = ['def {0}(d):'.format(kwargs_name)]
+        lines.extend(self.body(schema))
+        lines.append('    return kw')
+        lines.append('')
+        lines.append('def {0}(d):'.format(name))
+        lines.append('    kw = {0}(d)'.format(kwargs_name))
+        for attr in epoch_attributes:
+            lines.append('    if {0!r} in kw: kw[{0!r}] = _epoch_to_datetime(kw[{0!r}])'.format(attr))
+        lines.append('    return {0}(kw)'.format(make_object))
+        self.sources.append('\n'.join(lines))
+        self.batched[schema] = (kwargs_name, make_object, epoch_attributes)
+        return name
+
+    def body(self, schema) -> list:
+        """Source lines filling the `kw` dictionary from the item `d`"""
+        positional_keys = getattr(schema, 'positional_keys', None)
+        lines = []
+        if positional_keys is not None:
+            # The schema hook maps list items to keys, so all of them must exist
+            lines.append('    d = ({0},)'.format(', '.join(
+                'd[{0}]'.format(index) for index in range(len(positional_keys)))))
+        else:
+            lines.append('    if d.__class__ is not dict: raise _Invalid')
+        lines.append('    kw = {}')
+
+        for attr, field in schema.fields.items():
+            target = 'kw[{0!r}]'.format(attr)
+            if positional_keys is not None:
+                if attr in positional_keys:
+                    lines.append('    v = d[{0}]'.format(positional_keys.index(attr)))
+                    lines.extend('    ' + line for line in self.conversion(field, 'v', target))
+                continue
+            lines.append('    v = d.get({0!r}, _MISSING)'.format(attr))
+            if field.load_from:
+                lines.append('    if v is _MISSING: v = d.get({0!r}, _MISSING)'.format(field.load_from))
+            lines.append('    if v is not _MISSING:')
+            lines.extend('        ' + line for line in self.conversion(field, 'v', target))
+        return lines
+
+    def conversion(self, field, value: str, target: str) -> list:
+        """Source lines assigning the converted `value` of a field to `target`"""
+        if isinstance(field, EpochDateTime):
+            # Seconds are validated here and turned into datetimes afterwards
+            converter = '_EpochTime' if self.raw_timestamps else 'float'
+            return ['{0} = {1}({2})'.format(target, converter, value)]
+        if isinstance(field, fields.Integer):
+            return ['{0} = int({1})'.format(target, value)]
+        if isinstance(field, fields.Float):
+            return ['{0} = float({1})'.format(target, value)]
+        if isinstance(field, fields.String):
+            return ['if {0}.__class__ is not str: raise _Invalid'.format(value),
+                    '{0} = {1}'.format(target, value)]
+        if isinstance(field, fields.Boolean):
+            return ['if {0} is not True and {0} is not False: raise _Invalid'.format(value),
+                    '{0} = {1}'.format(target, value)]
+        if isinstance(field, fields.Nested):
+            return self.nested(field.schema, field.many, value, target)
+        if isinstance(field, fields.List) and isinstance(field.container, fields.Nested):
+            return self.nested(field.container.schema, True, value, target)
+        if isinstance(field, fields.List):
+            item = self.conversion(field.container, 'i', 'x')
+            if len(item) == 1 and item[0].startswith('x = '):
+                return ['if {0}.__class__ is not list: raise _Invalid'.format(value),
+                        '{0} = [{1} for i in {2}]'.format(target, item[0][4:], value)]
+        # Anything else goes through the marshmallow field itself
+        deserialize = self._bind('field', field.deserialize)
+        return ['{0} = {1}({2})'.format(target, deserialize, value)]
+
+    def nested(self, schema, many: bool, value: str, target: str) -> list:
+        """Source lines decoding one nested item or a list of them"""
+        function = self.function(schema)
+        if not many:
+            return ['{0} = {1}({2})'.format(target, function, value)]
+
+        lines = ['if {0}.__class__ is not list: raise _Invalid'.format(value)]
+        if schema not in self.batched:
+            lines.append('{0} = [{1}(i) for i in {2}]'.format(target, function, value))
+            return lines
+
+        kwargs_name, make_object, epoch_attributes = self.batched[schema]
+        lines.append('k = [{0}(i) for i in {1}]'.format(kwargs_name, value))
+        lines.append('_convert_epochs(k, {0!r})'.format(epoch_attributes))
+        lines.append('{0} = [{1}(i) for i in k]'.format(target, make_object))
+        return lines
+
+    def compile(self, schema):
+        """Compile the decoders of a schema tree, returning the root one"""
+        name = self.function(schema)
+        exec('\n\n'.join(self.sources), self.namespace)  # pylint: disable=exec-used
+        return self.namespace[name]
+
+
+def _strict_loader(schema):
+    """Nested loader raising on errors so that the root falls back as well"""
+    def load(data):
+        obj, err = schema.load(data)
+        if err:
+            raise _Invalid(err)
+        return obj
+    return load
+
+
+def raw_timestamp_schema(schema):
+    """Return a copy of a schema decoding timestamps to `EpochTime` values"""
+    copy = _raw_timestamp_schemas.get(schema)
+    if copy is None:
+        copy = _raw_timestamp_schemas[schema] = type(schema)(context={'raw_timestamps': True})
+    return copy
+
+
+def decoder_for(schema, raw_timestamps: bool = False):
+    """Return the compiled decoder of a schema, building it on first use
+
+    Returns None for schemas using hooks or field options the compiler does
+    not reproduce, these are always loaded by marshmallow.
+    """
+    key = (schema, raw_timestamps)
+    decoder = _decoders.get(key, _MISSING)
+    if decoder is _MISSING:
+        decoder = _decoders[key] = (_Compiler(raw_timestamps).compile(schema)
+                                    if _compilable(schema) else None)
+    return decoder
+
+
+def load(schema, data, strict: bool = False, raw_timestamps: bool = False):
+    """Deserialize data like `schema.load(data, partial=True)`
+
+    Returns the same `(obj, errors)` pair. Unless `strict` is set the
+    compiled decoder is tried first and marshmallow only runs for payloads
+    the decoder rejects. With `raw_timestamps` timestamps are decoded to
+    `EpochTime` values instead of datetimes.
+    """
+    if not strict:
+        decoder = decoder_for(schema, raw_timestamps)
+        if decoder is not None:
+            try:
+                return decoder(data), {}
+            except _DECODE_ERRORS:
+                pass
+
+    if raw_timestamps:
+        schema = raw_timestamp_schema(schema)
+    return schema.load(data, partial=True)
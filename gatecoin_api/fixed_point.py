@@ -0,0 +1,167 @@
+"""Fixed-point integer prices and quantities
+
+Floats make every sum of book volumes or price difference inexact, and
+`Decimal` is too slow for aggregating deep books. With a `FixedPoint`
+attached to `GatecoinAPI`, prices are decoded to integers counting units of
+the last decimal place of their pair (`CurrencyPair.price_decimal_places`)
+and quantities to integers counting units of `quantity_decimal_places`
+decimals, so arithmetic on them is exact and runs at integer speed.
+
+The lists of lazy responses are converted item by item as they are read.
+"""
+import functools
+from typing import Dict, Iterable
+
+from .columnar import LimitColumns, np
+from .lazy import LazyList
+from .types import CurrencyPair
+
+# Decimal places of quantities, the smallest unit of bitcoin
+QUANTITY_DECIMAL_PLACES = 8
+
+
+class FixedPoint:
+    """Scales of the prices of each currency pair and of quantities
+
+    Pairs missing from `price_decimal_places` are learnt from a currency
+    pairs response with `update`.
+    """
+
+    def __init__(self, price_decimal_places: Dict[str, int] = None,
+                 quantity_decimal_places: int = QUANTITY_DECIMAL_PLACES):
+        self.price_scales = {}
+        for currency_pair, places in (price_decimal_places or {}).items():
+            self.price_scales[currency_pair] = 10 ** places
+        self.quantity_scale = 10 ** quantity_decimal_places
+
+    def knows(self, currency_pair: str) -> bool:
+        """Whether the price scale of a pair is known"""
+        return currency_pair in self.price_scales
+
+    def update(self, currency_pairs: Iterable[CurrencyPair]) -> None:
+        """Learn the price scales of pairs from their reference data"""
+        for currency_pair in currency_pairs:
+            if currency_pair.price_decimal_places is not None:
+                self.price_scales[currency_pair.trading_code] = 10 ** currency_pair.price_decimal_places
+
+    def price_scale(self, currency_pair: str) -> int:
+        """Price units per unit of quote currency of a pair, ValueError if it is unknown"""
+        scale = self.price_scales.get(currency_pair)
+        if scale is None:
+            raise ValueError('Unknown price decimal places of {0}'.format(currency_pair))
+        return scale
+
+    def to_price(self, currency_pair: str, price: float) -> int:
+        """Fixed-point price of a float price"""
+        return round(price * self.price_scale(currency_pair))
+
+    def to_quantity(self, quantity: float) -> int:
+        """Fixed-point quantity of a float quantity"""
+        return round(quantity * self.quantity_scale)
+
+    def price_value(self, currency_pair: str, price: int) -> float:
+        """Float of a fixed-point price, written with its exact decimals by `repr`"""
+        return price / self.price_scale(currency_pair)
+
+    def quantity_value(self, quantity: int) -> float:
+        """Float of a fixed-point quantity, written with its exact decimals by `repr`"""
+        return quantity / self.quantity_scale
+
+    def currency_pairs(self, response, currency_pair: str = None) -> set:
+        """Pairs whose price scale converting a response needs, but for its lazy lists"""
+        pairs = set() if currency_pair is None else {currency_pair}
+        items = []
+        for key in ('transactions', 'trades', 'orders'):
+            values = getattr(response, key, None)
+            if values and not isinstance(values, LazyList):
+                items.extend(values)
+        if getattr(response, 'order', None) is not None:
+            items.append(response.order)
+        for item in items:
+            pairs.update(self.item_pairs(item))
+        return pairs
+
+    @staticmethod
+    def item_pairs(item) -> set:
+        """Pairs whose price scale converting a trade or an order needs"""
+        if hasattr(item, 'code'):
+            pairs = {item.code}
+            pairs.update(trade.currency_pair for trade in item.trades or ())
+        else:
+            pairs = {item.currency_pair}
+        pairs.discard(None)
+        return pairs
+
+    def convert(self, response, currency_pair: str = None):
+        """Turn the prices and quantities of a decoded response into integers in place
+
+        Trades and orders are scaled by the pair they name, book levels by
+        `currency_pair`. Balances are left as floats.
+        """
+        for side in ('asks', 'bids'):
+            levels = getattr(response, side, None)
+            if isinstance(levels, LimitColumns):
+                setattr(response, side, self._columns(currency_pair, levels))
+            elif levels:
+                _apply(self.convert_levels, levels, currency_pair)
+        for key in ('transactions', 'trades'):
+            items = getattr(response, key, None)
+            if items:
+                _apply(self.convert_trades, items, currency_pair)
+        orders = getattr(response, 'orders', None)
+        if orders:
+            _apply(self.convert_orders, orders)
+        order = getattr(response, 'order', None)
+        if order is not None:
+            self.convert_orders([order])
+        return response
+
+    def convert_levels(self, levels: list, currency_pair: str) -> None:
+        """Scale book levels in place"""
+        self._scale(levels, currency_pair, ('volume',))
+
+    def convert_trades(self, trades: list, currency_pair: str = None) -> None:
+        """Scale transactions or trader transactions in place"""
+        self._scale(trades, currency_pair, ('quantity',), 'currency_pair')
+
+    def convert_orders(self, orders: list) -> None:
+        """Scale open orders and their trades in place"""
+        self._scale(orders, None, ('initial_quantity', 'remaining_quantity'), 'code')
+        for order in orders:
+            if order.trades:
+                self.convert_trades(order.trades, order.code)
+
+    def _scale(self, items: list, currency_pair: str, quantities: tuple,
+               pair_attribute: str = None) -> None:
+        quantity_scale = self.quantity_scale
+        default_scale = None if currency_pair is None else self.price_scale(currency_pair)
+        for item in items:
+            price_scale = default_scale
+            if pair_attribute is not None and getattr(item, pair_attribute) is not None:
+                price_scale = self.price_scale(getattr(item, pair_attribute))
+            if item.price is not None:
+                if price_scale is None:
+                    raise ValueError('No currency pair to scale the price of a {0}'.format(type(item).__name__))
+                item.price = round(item.price * price_scale)
+            for attr in quantities:
+                value = getattr(item, attr)
+                if value is not None:
+                    setattr(item, attr, round(value * quantity_scale))
+
+    def _columns(self, currency_pair: str, levels: LimitColumns) -> LimitColumns:
+        prices = np.rint(levels.prices * self.price_scale(currency_pair)).astype(np.int64)
+        volumes = np.rint(levels.volumes * self.quantity_scale).astype(np.int64)
+        return LimitColumns(prices, volumes)
+
+
+def _apply(convert, items: list, *args) -> None:
+    """Convert a list now, or each item of a lazy list once decoded"""
+    if isinstance(items, LazyList):
+        items.then(functools.partial(_converted, convert, args))
+    else:
+        convert(items, *args)
+
+
+def _converted(convert, args: tuple, item):
+    convert([item], *args)
+    return item
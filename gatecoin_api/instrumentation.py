@@ -0,0 +1,255 @@
+"""Opt-in latency instrumentation of API calls
+
+With an `Instrumentation` attached to `GatecoinAPI`, every call of an API
+method is timed phase by phase: opening the connection (TCP and TLS), the
+wait for the response headers, the transfer of the body, JSON parsing and
+schema decoding. Each phase and the whole call feed a latency histogram per
+endpoint, endpoints being named after the API methods, and every call is
+handed to the registered sinks. Without an instrumentation the API only
+checks one attribute per call.
+
+Connecting is only timed over pooled sessions, without them it is part of
+the wait for the first byte and no connect phase is reported. Streamed
+calls such as `iter_trade_history` only report their total, the time spent
+producing their items, and their errors.
+"""
+import bisect
+import functools
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable
+
+from .types import succeeded
+
+PHASES = ('connect', 'ttfb', 'transfer', 'parse', 'decode', 'total')
+
+# Upper bounds of the histogram buckets in seconds, zero for phases which
+# did not take any time, such as connecting over a kept-alive connection,
+# then from 25us to about 100s
+BUCKETS = (0.0,) + tuple(25e-6 * 2 ** (index / 2) for index in range(45))
+
+_current = threading.local()
+
+_END = object()
+
+
+class Timing:
+    """Phase durations in seconds of one API call, None for phases that did not run"""
+    __slots__ = ('endpoint', 'connect', 'ttfb', 'transfer', 'parse', 'decode', 'total', 'error')
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.connect = None
+        self.ttfb = None
+        self.transfer = None
+        self.parse = None
+        self.decode = None
+        self.total = None
+        self.error = False
+
+    def __repr__(self):
+        return 'Timing({0})'.format(', '.join(
+            '{0}={1!r}'.format(name, getattr(self, name)) for name in self.__slots__))
+
+
+class Histogram:
+    """Latency histogram over fixed logarithmic buckets"""
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percentile: float) -> float:
+        """Latency at a percentile, interpolated within its bucket"""
+        if not self.count:
+            return None
+        rank = self.count * percentile / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+            'max': self.max
+        }
+
+
+class Instrumentation:
+    """Thread safe per endpoint phase histograms and call counters
+
+    `sinks` are called with the `Timing` of every call once it is recorded,
+    from the thread which made the call.
+    """
+
+    def __init__(self, sinks: Iterable[Callable[[Timing], None]] = ()):
+        self.sinks = list(sinks)
+        self.calls = Counter()
+        self.errors = Counter()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink: Callable[[Timing], None]) -> None:
+        """Register a function called with the timing of every call"""
+        self.sinks.append(sink)
+
+    def record(self, timing: Timing) -> None:
+        """Add the phases of a call to the histograms of its endpoint"""
+        with self._lock:
+            self.calls[timing.endpoint] += 1
+            if timing.error:
+                self.errors[timing.endpoint] += 1
+            for phase in PHASES:
+                value = getattr(timing, phase)
+                if value is not None:
+                    key = (timing.endpoint, phase)
+                    histogram = self._histograms.get(key)
+                    if histogram is None:
+                        histogram = self._histograms[key] = Histogram()
+                    histogram.add(value)
+        for sink in self.sinks:
+            sink(timing)
+
+    def snapshot(self) -> dict:
+        """Calls, errors and latency percentiles of every phase per endpoint"""
+        with self._lock:
+            snapshot = {endpoint: {'calls': count, 'errors': self.errors[endpoint], 'phases': {}}
+                        for endpoint, count in self.calls.items()}
+            for (endpoint, phase), histogram in self._histograms.items():
+                snapshot[endpoint]['phases'][phase] = histogram.as_dict()
+        return snapshot
+
+    def prometheus(self, prefix: str = 'gatecoin_api') -> str:
+        """Histograms and counters in the Prometheus text exposition format"""
+        lines = ['# HELP {0}_phase_seconds Duration of API call phases'.format(prefix),
+                 '# TYPE {0}_phase_seconds histogram'.format(prefix)]
+        with self._lock:
+            for (endpoint, phase), histogram in sorted(self._histograms.items()):
+                labels = 'endpoint="{0}",phase="{1}"'.format(endpoint, phase)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append('{0}_phase_seconds_bucket{{{1},le="{2:.6g}"}} {3}'.format(
+                        prefix, labels, bound, cumulative))
+                lines.append('{0}_phase_seconds_bucket{{{1},le="+Inf"}} {2}'.format(
+                    prefix, labels, histogram.count))
+                lines.append('{0}_phase_seconds_sum{{{1}}} {2!r}'.format(prefix, labels, histogram.sum))
+                lines.append('{0}_phase_seconds_count{{{1}}} {2}'.format(prefix, labels, histogram.count))
+            for name, counter, help_text in (('calls', self.calls, 'API calls'),
+                                             ('errors', self.errors, 'Failed API calls')):
+                lines.append('# HELP {0}_{1}_total {2}'.format(prefix, name, help_text))
+                lines.append('# TYPE {0}_{1}_total counter'.format(prefix, name))
+                for endpoint in sorted(self.calls):
+                    lines.append('{0}_{1}_total{{endpoint="{2}"}} {3}'.format(
+                        prefix, name, endpoint, counter[endpoint]))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Forget every recorded call"""
+        with self._lock:
+            self.calls.clear()
+            self.errors.clear()
+            self._histograms.clear()
+
+
+def current_timing() -> Timing:
+    """Timing of the API call running in this thread, if instrumented"""
+    return getattr(_current, 'timing', None)
+
+
+def add_connect_time(seconds: float) -> None:
+    """Account the time spent opening a connection in this thread"""
+    _current.connect = getattr(_current, 'connect', 0.0) + seconds
+
+
+def take_connect_time() -> float:
+    """Connection time accounted in this thread since the last call"""
+    seconds = getattr(_current, 'connect', 0.0)
+    _current.connect = 0.0
+    return seconds
+
+
+def instrumented(method):
+    """Time the calls of an API method through its `instrumentation`"""
+    endpoint = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+
+        timing = Timing(endpoint)
+        outer = getattr(_current, 'timing', None)
+        _current.timing = timing
+        start = time.perf_counter()
+        try:
+            response = method(self, *args, **kwargs)
+            timing.error = not succeeded(response)
+            return response
+        except BaseException:
+            timing.error = True
+            raise
+        finally:
+            timing.total = time.perf_counter() - start
+            _current.timing = outer
+            instrumentation.record(timing)
+
+    return wrapper
+
+
+def instrumented_stream(method):
+    """Time the iterations of a streaming API method through its `instrumentation`"""
+    endpoint = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        return _timed_items(instrumentation, Timing(endpoint), method(self, *args, **kwargs))
+
+    return wrapper
+
+
+def _timed_items(instrumentation: Instrumentation, timing: Timing, items):
+    """Yield the items, recording the time spent producing them once done"""
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items, _END)
+            finally:
+                elapsed += time.perf_counter() - start
+            if item is _END:
+                return
+            yield item
+    except GeneratorExit:
+        raise
+    except BaseException:
+        timing.error = True
+        raise
+    finally:
+        timing.total = elapsed
+        instrumentation.record(timing)
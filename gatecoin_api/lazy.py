@@ -0,0 +1,123 @@
+"""Lazy responses decoding their lists on access
+
+Many calls only check `response_status` or read the first levels of a
+book, yet decoding builds every item of every list. In lazy mode only the
+envelope of a response is decoded up front, each list field holding a
+`LazyList` of the raw items which decodes an item the first time it is
+read. `book.asks[:5]` decodes five levels, whatever the depth of the book.
+"""
+import functools
+from collections.abc import Sequence
+
+from marshmallow import fields
+
+from . import decoders
+
+_UNDECODED = object()
+
+_lazy_fields = {}
+
+
+class LazyList(Sequence):
+    """List of raw items decoded one by one on first access
+
+    Items which do not decode raise `ValueError` when read. Decoded items
+    are kept, so reading an item again returns the same object.
+    """
+    __slots__ = ('_items', '_decode', '_decoded')
+
+    def __init__(self, items: list, decode):
+        self._items = items
+        self._decode = decode
+        self._decoded = [_UNDECODED] * len(items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(position) for position in range(*index.indices(len(self._items)))]
+        if index < 0:
+            index += len(self._items)
+        if not 0 <= index < len(self._items):
+            raise IndexError('LazyList index out of range')
+        return self._item(index)
+
+    def _item(self, index: int):
+        item = self._decoded[index]
+        if item is _UNDECODED:
+            item = self._decoded[index] = self._decode(self._items[index])
+        return item
+
+    def __iter__(self):
+        return map(self._item, range(len(self._items)))
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def then(self, function) -> None:
+        """Pass every item through `function` once decoded, items already decoded at once"""
+        self._decode = functools.partial(_chained, self._decode, function)
+        for index, item in enumerate(self._decoded):
+            if item is not _UNDECODED:
+                self._decoded[index] = function(item)
+
+    @property
+    def decoded(self) -> int:
+        """Number of items decoded so far"""
+        return sum(1 for item in self._decoded if item is not _UNDECODED)
+
+
+def _chained(decode, function, item):
+    return function(decode(item))
+
+
+def _load_item(schema, raw_timestamps: bool, item):
+    obj, err = decoders.load(schema, item, False, raw_timestamps)
+    if err:
+        raise ValueError(err)
+    return obj
+
+
+def _list_fields(schema) -> tuple:
+    """`(attribute, raw keys, item schema)` of the nested list fields of a schema"""
+    cached = _lazy_fields.get(schema)
+    if cached is None:
+        cached = []
+        for attr, field in schema.fields.items():
+            if isinstance(field, fields.List) and isinstance(field.container, fields.Nested):
+                item_schema = field.container.schema
+            elif isinstance(field, fields.Nested) and field.many:
+                item_schema = field.schema
+            else:
+                continue
+            keys = (attr, field.load_from) if field.load_from else (attr,)
+            cached.append((attr, keys, item_schema))
+        cached = _lazy_fields[schema] = tuple(cached)
+    return cached
+
+
+def load_lazy(schema, response, raw_timestamps: bool = False):
+    """Deserialize a response like `decoders.load`, its list fields as `LazyList`
+
+    Responses whose lists are not lists are decoded eagerly, so that
+    errors are reported as usual.
+    """
+    list_fields = _list_fields(schema)
+    if not list_fields or not isinstance(response, dict):
+        return decoders.load(schema, response, False, raw_timestamps)
+
+    raw_keys = {key for _, keys, _ in list_fields for key in keys}
+    envelope = {key: value for key, value in response.items() if key not in raw_keys}
+    obj, err = decoders.load(schema, envelope, False, raw_timestamps)
+    if err:
+        return obj, err
+
+    for attr, keys, item_schema in list_fields:
+        items = next((response[key] for key in keys if key in response), None)
+        if items is None:
+            continue
+        if not isinstance(items, list):
+            return decoders.load(schema, response, False, raw_timestamps)
+        setattr(obj, attr, LazyList(items, functools.partial(_load_item, item_schema, raw_timestamps)))
+    return obj, err
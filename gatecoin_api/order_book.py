@@ -0,0 +1,212 @@
+"""Local order books maintained incrementally from repeated snapshots"""
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+from typing import Callable, Iterable, List
+
+from .constants import ASK, BID
+from .types import LevelChange, Limit, succeeded
+
+# Above this share of levels added or removed a side is re-sorted at once
+# instead of inserting and deleting level by level
+_RESORT_RATIO = 0.25
+
+
+class _Levels:
+    """Levels of a book side, replaced whole on every change"""
+    __slots__ = ('keys', 'volumes', 'cumulative')
+
+    def __init__(self, keys: List[float], volumes: dict):
+        self.keys = keys
+        self.volumes = volumes
+        self.cumulative = None
+
+
+class BookSide:
+    """One side of a local order book, sorted best level first
+
+    Levels are kept as a price to volume index plus a list of sort keys
+    (prices for asks, negated prices for bids) so that the best level is
+    always the first one. Cumulative volumes are rebuilt lazily after a
+    change, giving O(1) best level and access by rank, and O(log n) price
+    lookups and cumulative depth queries. A change builds new levels and
+    swaps them in with one assignment, so readers need no lock and never
+    see a half applied snapshot.
+    """
+
+    def __init__(self, side: str):
+        self.side = side
+        self._sign = 1.0 if side == ASK else -1.0
+        self._levels = _Levels([], {})
+
+    def __len__(self) -> int:
+        return len(self._levels.keys)
+
+    def __iter__(self):
+        sign = self._sign
+        levels = self._levels
+        volumes = levels.volumes
+        return (Limit(key * sign, volumes[key * sign]) for key in levels.keys)
+
+    def best(self) -> Limit:
+        """Best level, None when the side is empty"""
+        levels = self._levels
+        return self._level(levels, 0) if levels.keys else None
+
+    def level(self, rank: int) -> Limit:
+        """Level at the given rank, 0 being the best one"""
+        return self._level(self._levels, rank)
+
+    def _level(self, levels: _Levels, rank: int) -> Limit:
+        price = levels.keys[rank] * self._sign
+        return Limit(price, levels.volumes[price])
+
+    def volume(self, price: float) -> float:
+        """Volume resting at a price, 0.0 when there is no such level"""
+        return self._levels.volumes.get(price, 0.0)
+
+    def rank(self, price: float) -> int:
+        """Rank of the level at a price, -1 when there is no such level"""
+        keys = self._levels.keys
+        key = price * self._sign
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return index
+        return -1
+
+    def _cumulative_volumes(self, levels: _Levels) -> List[float]:
+        if levels.cumulative is None:
+            sign = self._sign
+            volumes = levels.volumes
+            levels.cumulative = list(accumulate(volumes[key * sign] for key in levels.keys))
+        return levels.cumulative
+
+    def depth(self, price: float) -> float:
+        """Total volume of the levels at `price` or better"""
+        levels = self._levels
+        index = bisect_right(levels.keys, price * self._sign)
+        return self._cumulative_volumes(levels)[index - 1] if index else 0.0
+
+    def price_for_depth(self, volume: float) -> float:
+        """Worst price reached when taking `volume`, None if the side is too thin"""
+        levels = self._levels
+        cumulative = self._cumulative_volumes(levels)
+        index = bisect_left(cumulative, volume)
+        return levels.keys[index] * self._sign if index < len(cumulative) else None
+
+    def apply(self, levels: Iterable[Limit], currency_pair: str = None) -> List[LevelChange]:
+        """Replace the side with a snapshot, returning the level changes"""
+        snapshot = {}
+        for limit in levels:
+            snapshot[limit.price] = snapshot.get(limit.price, 0.0) + limit.volume
+
+        current = self._levels
+        old = current.volumes
+        changes = []
+        added = []
+        removed = []
+        for price, volume in snapshot.items():
+            previous = old.get(price)
+            if previous is None:
+                added.append(price)
+                changes.append(LevelChange(currency_pair, self.side, price, 0.0, volume))
+            elif previous != volume:
+                changes.append(LevelChange(currency_pair, self.side, price, previous, volume))
+        for price, previous in old.items():
+            if price not in snapshot:
+                removed.append(price)
+                changes.append(LevelChange(currency_pair, self.side, price, previous, 0.0))
+
+        if not changes:
+            return changes
+
+        sign = self._sign
+        if len(added) + len(removed) > _RESORT_RATIO * max(len(current.keys), 1):
+            keys = sorted(price * sign for price in snapshot)
+        else:
+            keys = list(current.keys)
+            for price in removed:
+                del keys[bisect_left(keys, price * sign)]
+            for price in added:
+                insort(keys, price * sign)
+        self._levels = _Levels(keys, snapshot)
+        return changes
+
+
+class LocalOrderBook:
+    """Local order book of one currency pair"""
+
+    def __init__(self, currency_pair: str):
+        self.currency_pair = currency_pair
+        self.asks = BookSide(ASK)
+        self.bids = BookSide(BID)
+        self.lock = threading.Lock()
+
+    @property
+    def best_ask(self) -> Limit:
+        """Lowest ask, None when there is none"""
+        return self.asks.best()
+
+    @property
+    def best_bid(self) -> Limit:
+        """Highest bid, None when there is none"""
+        return self.bids.best()
+
+    @property
+    def spread(self) -> float:
+        """Best ask minus best bid, None when a side is empty"""
+        if not self.asks or not self.bids:
+            return None
+        return self.asks.best().price - self.bids.best().price
+
+    def apply(self, snapshot) -> List[LevelChange]:
+        """Apply an order book or market depth response as a diff"""
+        with self.lock:
+            changes = self.asks.apply(snapshot.asks or (), self.currency_pair)
+            changes.extend(self.bids.apply(snapshot.bids or (), self.currency_pair))
+        return changes
+
+
+class OrderBookEngine:
+    """Local order books of many currency pairs fed by polled snapshots
+
+    Each snapshot passed to `apply` is diffed against the local book of its
+    pair; subscribers registered with `subscribe` receive the pair and the
+    list of changed, added and removed levels whenever a snapshot differs.
+    """
+
+    def __init__(self):
+        self.books = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def book(self, currency_pair: str) -> LocalOrderBook:
+        """Local book of a currency pair, created empty on first use"""
+        book = self.books.get(currency_pair)
+        if book is None:
+            with self._lock:
+                book = self.books.setdefault(currency_pair, LocalOrderBook(currency_pair))
+        return book
+
+    def subscribe(self, callback: Callable[[str, List[LevelChange]], None]) -> None:
+        """Call `callback(currency_pair, changes)` for every changed snapshot"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, List[LevelChange]], None]) -> None:
+        """Stop calling a subscribed callback"""
+        self._subscribers.remove(callback)
+
+    def apply(self, currency_pair: str, snapshot) -> List[LevelChange]:
+        """Apply a snapshot to the book of a pair, returning its changes"""
+        changes = self.book(currency_pair).apply(snapshot)
+        if changes:
+            for callback in list(self._subscribers):
+                callback(currency_pair, changes)
+        return changes
+
+    def refresh(self, api, currency_pair: str) -> List[LevelChange]:
+        """Fetch the order book of a pair and apply it, None if the call failed"""
+        snapshot = api.get_order_book(currency_pair)
+        if not succeeded(snapshot):
+            return None
+        return self.apply(currency_pair, snapshot)
@@ -0,0 +1,191 @@
+"""Local index of the open orders of the account
+
+Most open orders were placed by this process, yet `get_open_order` used to
+download and decode them again on every call. An `OpenOrderStore` tracks
+the orders placed and cancelled through the API and reconciles itself with
+every `get_open_orders` snapshot, reporting the differences keyed by
+`cl_order_id`. While the last snapshot is younger than `max_age` seconds,
+orders are looked up locally, by identifier or by pair, side and status.
+"""
+import threading
+import time
+from typing import Callable, Dict, List
+
+from .constants import ASK, BID
+from .types import GetOpenOrdersResponse, OpenOrder, OrderChange, succeeded
+
+# Sides of open orders by order way
+SIDES = {BID: 0, ASK: 1}
+
+# Attributes whose difference makes an order changed, unless not known locally
+_COMPARED = ('price', 'initial_quantity', 'remaining_quantity', 'status')
+
+
+class OpenOrderStore:
+    """Open orders indexed by identifier, pair, side and status
+
+    Orders tracked after a snapshot was requested are kept when the
+    snapshot misses them, as it may predate them. Subscribers registered
+    with `subscribe` receive the changes of every reconciliation.
+    """
+
+    def __init__(self, max_age: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.max_age = max_age
+        self.clock = clock
+        self._orders = {}
+        self._tracked = {}
+        self._by_pair = {}
+        self._by_side = {}
+        self._by_status = {}
+        self._taken = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def fresh(self) -> bool:
+        """Whether the last snapshot is younger than `max_age`"""
+        taken = self._taken
+        return taken is not None and self.clock() - taken < self.max_age
+
+    def subscribe(self, callback: Callable[[List[OrderChange]], None]) -> None:
+        """Call `callback(changes)` for every reconciliation changing the store"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[List[OrderChange]], None]) -> None:
+        """Stop calling a subscribed callback"""
+        self._subscribers.remove(callback)
+
+    def _index(self, order: OpenOrder) -> None:
+        cl_order_id = order.cl_order_id
+        self._orders[cl_order_id] = order
+        self._by_pair.setdefault(order.code, set()).add(cl_order_id)
+        self._by_side.setdefault(order.side, set()).add(cl_order_id)
+        self._by_status.setdefault(order.status, set()).add(cl_order_id)
+
+    def _unindex(self, cl_order_id: str) -> OpenOrder:
+        order = self._orders.pop(cl_order_id, None)
+        if order is not None:
+            self._by_pair[order.code].discard(cl_order_id)
+            self._by_side[order.side].discard(cl_order_id)
+            self._by_status[order.status].discard(cl_order_id)
+        self._tracked.pop(cl_order_id, None)
+        return order
+
+    def track(self, order: OpenOrder) -> None:
+        """Add or replace an order placed through the API
+
+        Nothing is tracked without a `max_age`, as lookups never answer
+        locally then. Orders tracked more than `max_age` ago are forgotten,
+        since answering locally takes a later snapshot, which lists them
+        again while they are open.
+        """
+        if not self.max_age:
+            return
+        with self._lock:
+            now = self.clock()
+            self._expire(now - self.max_age)
+            self._unindex(order.cl_order_id)
+            self._index(order)
+            self._tracked[order.cl_order_id] = now
+
+    def _expire(self, before: float) -> None:
+        """Forget the orders tracked before a time and not seen in a snapshot since"""
+        # Tracked orders are kept in the order they were tracked
+        while self._tracked:
+            cl_order_id, tracked = next(iter(self._tracked.items()))
+            if tracked >= before:
+                break
+            self._unindex(cl_order_id)
+
+    def remove(self, cl_order_id: str) -> OpenOrder:
+        """Forget a cancelled order, returning it if it was known"""
+        with self._lock:
+            return self._unindex(cl_order_id)
+
+    def clear(self) -> None:
+        """Forget every order, after all of them were cancelled"""
+        with self._lock:
+            for cl_order_id in list(self._orders):
+                self._unindex(cl_order_id)
+
+    def invalidate(self) -> None:
+        """Stop answering lookups locally until the next snapshot"""
+        with self._lock:
+            self._taken = None
+
+    def reconcile(self, response: GetOpenOrdersResponse, requested: float = None) -> List[OrderChange]:
+        """Bring the store in line with an open orders snapshot, returning the changes
+
+        `requested` is the clock reading when the snapshot was requested,
+        orders tracked since then stay in the store.
+        """
+        if not succeeded(response):
+            return []
+        snapshot = {order.cl_order_id: order for order in response.orders or ()}
+        changes = []
+        with self._lock:
+            for cl_order_id, order in snapshot.items():
+                old = self._orders.get(cl_order_id)
+                if old is None or _differs(old, order):
+                    changes.append(OrderChange(cl_order_id, old, order))
+                elif cl_order_id not in self._tracked:
+                    continue
+                # Orders tracked locally are replaced by their complete version
+                self._unindex(cl_order_id)
+                self._index(order)
+            for cl_order_id in [cl_order_id for cl_order_id in self._orders if cl_order_id not in snapshot]:
+                tracked = self._tracked.get(cl_order_id)
+                if tracked is not None and requested is not None and tracked >= requested:
+                    continue
+                changes.append(OrderChange(cl_order_id, self._unindex(cl_order_id), None))
+            self._taken = self.clock() if requested is None else requested
+
+        if changes:
+            for callback in list(self._subscribers):
+                callback(changes)
+        return changes
+
+    def get(self, cl_order_id: str) -> OpenOrder:
+        """Open order with an identifier, None if it is not known"""
+        return self._orders.get(cl_order_id)
+
+    def select(self, currency_pair: str = None, side: int = None, status: int = None) -> List[OpenOrder]:
+        """Open orders matching every given criterion"""
+        with self._lock:
+            selected = None
+            for index, key in ((self._by_pair, currency_pair), (self._by_side, side),
+                               (self._by_status, status)):
+                if key is not None:
+                    ids = index.get(key, set())
+                    selected = set(ids) if selected is None else selected & ids
+            if selected is None:
+                return list(self._orders.values())
+            return [self._orders[cl_order_id] for cl_order_id in selected]
+
+    def by_pair(self, currency_pair: str) -> List[OpenOrder]:
+        """Open orders of a currency pair"""
+        return self.select(currency_pair=currency_pair)
+
+    def by_side(self, side: int) -> List[OpenOrder]:
+        """Open orders of a side, 0 for bids and 1 for asks"""
+        return self.select(side=side)
+
+    def by_status(self, status: int) -> List[OpenOrder]:
+        """Open orders with a status"""
+        return self.select(status=status)
+
+    def orders(self) -> Dict[str, OpenOrder]:
+        """Copy of the open orders keyed by `cl_order_id`"""
+        with self._lock:
+            return dict(self._orders)
+
+
+def _differs(old: OpenOrder, new: OpenOrder) -> bool:
+    """Whether a snapshot order differs from the known one where that one is known"""
+    for attr in _COMPARED:
+        value = getattr(old, attr)
+        if value is not None and value != getattr(new, attr):
+            return True
+    return False
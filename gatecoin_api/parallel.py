@@ -0,0 +1,118 @@
+"""Decoding of very large list responses over a process pool
+
+Decoding a long trade history is CPU bound and can take longer than the
+request itself. A `ParallelDecoder` attached to `GatecoinAPI` splits the
+`trades`, `transactions` or `orders` list of responses holding at least
+`threshold` items into chunks of `chunk_size` items, decodes the chunks in
+a `ProcessPoolExecutor` and stitches the items back in order.
+
+Workers send their items back column by column, one list per attribute,
+which pickles to less than the objects themselves and is rebuilt in one
+pass. Below the threshold the cost of shipping items between processes
+exceeds the decoding saved, `benchmarks/bench_parallel.py` shows where the
+two meet.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from . import decoders
+from .schemas import (get_open_orders_response_schema,
+                      get_recent_transactions_response_schema,
+                      get_trade_history_response_schema)
+
+# Response schemas decoded in chunks by the key of their list
+_SCHEMAS = {
+    'trades': get_trade_history_response_schema,
+    'transactions': get_recent_transactions_response_schema,
+    'orders': get_open_orders_response_schema
+}
+
+_KEYS = {schema: key for key, schema in _SCHEMAS.items()}
+
+
+def _decode_chunk(key: str, items: list, strict: bool, raw_timestamps: bool):
+    """Decode a chunk of list items in a worker, returning their class and columns
+
+    Returns None when the chunk does not decode, so that the whole response
+    is decoded again in the parent and errors are reported as usual.
+    """
+    obj, err = decoders.load(_SCHEMAS[key], {key: items}, strict, raw_timestamps)
+    if err or obj is None:
+        return None
+    decoded = getattr(obj, key) or []
+    if not decoded:
+        return ()
+    cls = type(decoded[0])
+    return cls, tuple([getattr(item, attr) for item in decoded] for attr in cls.__slots__)
+
+
+def _context():
+    """Start method of the workers, never forking the threads of the client"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+class ParallelDecoder:
+    """Process pool decoding the lists of large responses in chunks
+
+    The pool of `max_workers` processes, one per CPU by default, is started
+    on first use and kept until `close()`. Workers are started by a fork
+    server, or spawned where there is none, since forking a process running
+    poller, batch and hedging threads can deadlock. With a single worker
+    nothing is decoded over the pool, as it could only be slower.
+    """
+
+    def __init__(self, threshold: int = 20000, chunk_size: int = 10000, max_workers: int = None):
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def handles(self, schema, response) -> bool:
+        """Whether a response is decoded over the pool"""
+        key = _KEYS.get(schema)
+        if key is None or self.max_workers < 2 or not isinstance(response, dict):
+            return False
+        items = response.get(key)
+        return isinstance(items, list) and len(items) >= self.threshold
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=_context())
+            return self._executor
+
+    def load(self, schema, response: dict, strict: bool = False, raw_timestamps: bool = False):
+        """Deserialize a response like `decoders.load`, its list over the pool"""
+        key = _KEYS[schema]
+        items = response[key]
+        envelope = {name: value for name, value in response.items() if name != key}
+        obj, err = decoders.load(schema, envelope, strict, raw_timestamps)
+        if err:
+            return obj, err
+
+        chunks = [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+        results = list(self._pool().map(
+            _decode_chunk, repeat(key), chunks, repeat(strict), repeat(raw_timestamps)))
+        if any(result is None for result in results):
+            return decoders.load(schema, response, strict, raw_timestamps)
+
+        decoded = []
+        for result in results:
+            if result:
+                cls, columns = result
+                decoded.extend(map(cls, *columns))
+        setattr(obj, key, decoded)
+        return obj, err
+
+    def close(self) -> None:
+        """Shut the worker processes down"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
@@ -0,0 +1,240 @@
+"""Background polling of market data with an adaptive cadence per pair
+
+A `Poller` polls one public endpoint of `GatecoinAPI` for many currency
+pairs from a pool of worker threads. Each pair has its own interval,
+shortened when its data changed since the previous poll and lengthened when
+it did not, between `min_interval` and `max_interval`. The intervals are
+stretched together whenever polling all pairs at their pace would spend
+more than the poller's share of the rate budget. Snapshots are published to
+subscriber callbacks and, with a `queue_size`, to a bounded queue which
+drops its oldest snapshot when full.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable
+
+from .types import PollSnapshot, succeeded
+
+# Endpoints a poller can poll, all of them taking a currency pair
+ENDPOINTS = ('get_market_depth', 'get_order_book', 'get_recent_transactions')
+
+# Book levels of each side compared by the default fingerprint
+TOP_LEVELS = 5
+
+# Interval factors after a poll which saw a change, saw none or failed
+_CHANGED = 0.5
+_UNCHANGED = 1.5
+_FAILED = 2.0
+
+
+def top_of_response(response) -> tuple:
+    """Fingerprint of a response from its top book levels and its end transactions
+
+    Only reads the items it compares, so lazy responses stay mostly
+    undecoded. Changes below the top levels which keep the depth of a book
+    are not seen.
+    """
+    fingerprint = []
+    for side in ('asks', 'bids'):
+        levels = getattr(response, side, None) or ()
+        fingerprint.append(len(levels))
+        fingerprint.extend((limit.price, limit.volume) for limit in levels[:TOP_LEVELS])
+    transactions = getattr(response, 'transactions', None)
+    if transactions:
+        fingerprint.extend((len(transactions), transactions[0].transaction_id,
+                            transactions[-1].transaction_id))
+    return tuple(fingerprint)
+
+
+class Poller:
+    """Polls an endpoint for many pairs in the background
+
+    Without `max_rate`, the poller allows itself `rate_share` of the rate of
+    the API's `RateLimiter`, halved while other requests queue for tokens,
+    and is unbounded when the API has no limiter. Only snapshots which
+    changed are published unless `only_changes` is off, changes being told
+    by comparing the `fingerprint` of consecutive responses, by default
+    their top levels and end transactions (`fingerprint=repr` compares
+    whole responses at the cost of formatting them). Callbacks run on the
+    worker threads.
+    """
+
+    def __init__(
+            self,
+            api,
+            currency_pairs: Iterable[str],
+            endpoint: str = 'get_market_depth',
+            min_interval: float = 0.5,
+            max_interval: float = 30.0,
+            max_workers: int = 4,
+            max_rate: float = None,
+            rate_share: float = 0.5,
+            queue_size: int = 0,
+            only_changes: bool = True,
+            fingerprint: Callable[[object], object] = top_of_response,
+            clock: Callable[[], float] = time.monotonic):
+        if endpoint not in ENDPOINTS:
+            raise ValueError('Cannot poll {0}, only {1}'.format(endpoint, ', '.join(ENDPOINTS)))
+        self.api = api
+        self.endpoint = endpoint
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_workers = max_workers
+        self.max_rate = max_rate
+        self.rate_share = rate_share
+        self.only_changes = only_changes
+        self.fingerprint = fingerprint
+        self.clock = clock
+        self.intervals = {pair: min_interval for pair in currency_pairs}
+        self.queue = deque(maxlen=queue_size) if queue_size else None
+        self.polls = Counter()
+        self.changes = Counter()
+        self.errors = Counter()
+        self.dropped = 0
+        self._fingerprints = {}
+        self._subscribers = []
+        self._due = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._queue_condition = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._executor = None
+
+    def subscribe(self, callback: Callable[[PollSnapshot], None]) -> None:
+        """Call `callback(snapshot)` for every published snapshot"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[PollSnapshot], None]) -> None:
+        """Stop calling a subscribed callback"""
+        self._subscribers.remove(callback)
+
+    def start(self) -> 'Poller':
+        """Start polling every pair at once"""
+        with self._condition:
+            if self._running:
+                return self
+            self._running = True
+            now = self.clock()
+            self._due = [(now, next(self._sequence), pair) for pair in self.intervals]
+            heapq.heapify(self._due)
+        self._executor = ThreadPoolExecutor(self.max_workers)
+        self._thread = threading.Thread(target=self._schedule, name='gatecoin-poller', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop scheduling polls and wait for those in flight"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def budget(self) -> float:
+        """Polls per second the poller may spend, None when unbounded"""
+        if self.max_rate is not None:
+            return self.max_rate
+        limiter = getattr(self.api, 'rate_limiter', None)
+        if limiter is None:
+            return None
+        rate = limiter.rate * self.rate_share
+        return rate / 2 if limiter.queue_depth() else rate
+
+    def interval(self, currency_pair: str) -> float:
+        """Interval before the next poll of a pair, stretched to fit the budget"""
+        interval = self.intervals[currency_pair]
+        budget = self.budget()
+        if budget is None:
+            return interval
+        demand = sum(1.0 / value for value in self.intervals.values())
+        return interval * max(1.0, demand / budget)
+
+    def _schedule(self) -> None:
+        """Submit the polls falling due until stopped"""
+        with self._condition:
+            while self._running:
+                now = self.clock()
+                while self._due and self._due[0][0] <= now:
+                    self._executor.submit(self._poll, heapq.heappop(self._due)[2])
+                timeout = self._due[0][0] - now if self._due else None
+                self._condition.wait(timeout)
+
+    def _poll(self, currency_pair: str) -> None:
+        """Poll a pair, always rescheduling it whatever was raised on the way"""
+        started = self.clock()
+        snapshot = None
+        interval = self.intervals[currency_pair]
+        failed = True
+        try:
+            response = getattr(self.api, self.endpoint)(currency_pair)
+            if succeeded(response):
+                fingerprint = self.fingerprint(response)
+                changed = self._fingerprints.get(currency_pair) != fingerprint
+                self._fingerprints[currency_pair] = fingerprint
+                if changed:
+                    self.changes[currency_pair] += 1
+                interval *= _CHANGED if changed else _UNCHANGED
+                if changed or not self.only_changes:
+                    snapshot = PollSnapshot(currency_pair, self.endpoint, response, changed, self.clock())
+                failed = False
+        except Exception:  # pylint: disable=broad-except
+            pass
+        finally:
+            self.polls[currency_pair] += 1
+            if failed:
+                self.errors[currency_pair] += 1
+                interval = self.intervals[currency_pair] * _FAILED
+            self.intervals[currency_pair] = min(self.max_interval, max(self.min_interval, interval))
+            with self._condition:
+                heapq.heappush(self._due, (started + self.interval(currency_pair),
+                                           next(self._sequence), currency_pair))
+                self._condition.notify_all()
+
+        if snapshot is not None:
+            self._publish(snapshot)
+
+    def _publish(self, snapshot: PollSnapshot) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception:  # pylint: disable=broad-except
+                self.errors['callbacks'] += 1
+        if self.queue is not None:
+            with self._queue_condition:
+                if len(self.queue) == self.queue.maxlen:
+                    self.dropped += 1
+                self.queue.append(snapshot)
+                self._queue_condition.notify()
+
+    def get(self, timeout: float = None) -> PollSnapshot:
+        """Oldest queued snapshot, waiting up to `timeout` seconds, None if there was none"""
+        if self.queue is None:
+            raise ValueError('The poller has no queue, set a queue_size')
+        with self._queue_condition:
+            if not self._queue_condition.wait_for(lambda: self.queue, timeout):
+                return None
+            return self.queue.popleft()
+
+    def stats(self) -> Dict[str, int]:
+        """Totals of polls, changes, errors and dropped snapshots"""
+        return {
+            'polls': sum(self.polls.values()),
+            'changes': sum(self.changes.values()),
+            'errors': sum(self.errors.values()),
+            'dropped': self.dropped
+        }
@@ -0,0 +1,139 @@
+"""Client-side rate limiting of API requests
+
+A `RateLimiter` shared by every call of a `GatecoinAPI` instance spends a
+token bucket refilled at the request budget of the exchange. When requests
+have to wait for tokens they are granted by priority class, so cancels are
+never stuck behind market data polls, and polls can be shed outright once
+the expected wait exceeds a bound.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable
+
+from .constants import HTTPMethod, Priority
+
+SHED_RESPONSE = {
+    "responseStatus": {
+        "errorCode": "429",
+        "message": "Request shed by the client rate limiter"
+    }
+}
+
+
+def priority_for(command: str, http_method: HTTPMethod) -> Priority:
+    """Priority class of an API command"""
+    if http_method == HTTPMethod.DELETE:
+        return Priority.CANCEL
+    if http_method == HTTPMethod.POST:
+        return Priority.CREATE
+    if command.startswith(('v1/Public/', 'v1/Reference/')) or command.endswith('/OrderBook'):
+        return Priority.PUBLIC
+    return Priority.PRIVATE
+
+
+class _PriorityMetrics:
+    """Counters of one priority class"""
+
+    def __init__(self):
+        self.queued = 0
+        self.max_queued = 0
+        self.granted = 0
+        self.shed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'queued': self.queued,
+            'max_queued': self.max_queued,
+            'granted': self.granted,
+            'shed': self.shed,
+            'mean_wait': self.total_wait / self.granted if self.granted else 0.0,
+            'max_wait': self.max_wait
+        }
+
+
+class RateLimiter:
+    """Thread safe token bucket granting requests by priority
+
+    The bucket holds up to `burst` tokens and is refilled with `rate` tokens
+    per second, each request spending one. Waiting requests are served in
+    priority order, first come first served within a class. Requests of
+    `shed_priority` or lower priority are refused instead of queued when
+    their expected wait exceeds `max_wait` seconds; without `max_wait`
+    nothing is shed.
+    """
+
+    def __init__(
+            self,
+            rate: float = 10.0,
+            burst: int = 10,
+            max_wait: float = None,
+            shed_priority: Priority = Priority.PUBLIC,
+            clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.shed_priority = shed_priority
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._metrics = {priority: _PriorityMetrics() for priority in Priority}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _expected_wait(self, priority: Priority) -> float:
+        ahead = sum(1 for waiting in self._waiting if waiting[0] <= priority)
+        return max(0.0, (ahead + 1 - self._tokens) / self.rate)
+
+    def acquire(self, priority: Priority = Priority.PUBLIC) -> bool:
+        """Wait for a token, returning False if the request was shed"""
+        metrics = self._metrics[priority]
+        with self._condition:
+            start = self.clock()
+            self._refill(start)
+            if (self.max_wait is not None and priority >= self.shed_priority and
+                    self._expected_wait(priority) > self.max_wait):
+                metrics.shed += 1
+                return False
+
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            metrics.queued += 1
+            metrics.max_queued = max(metrics.max_queued, metrics.queued)
+            while True:
+                now = self.clock()
+                self._refill(now)
+                if self._waiting[0] is not ticket:
+                    self._condition.wait()
+                elif self._tokens >= 1.0:
+                    break
+                else:
+                    self._condition.wait((1.0 - self._tokens) / self.rate)
+
+            heapq.heappop(self._waiting)
+            self._tokens -= 1.0
+            metrics.queued -= 1
+            metrics.granted += 1
+            wait = now - start
+            metrics.total_wait += wait
+            metrics.max_wait = max(metrics.max_wait, wait)
+            self._condition.notify_all()
+        return True
+
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a token"""
+        return len(self._waiting)
+
+    def metrics(self) -> dict:
+        """Queue depth, grants, sheds and wait times per priority class name"""
+        with self._condition:
+            return {priority.name.lower(): metrics.as_dict()
+                    for priority, metrics in self._metrics.items()}
@@ -1,13 +1,96 @@
 import base64
+import functools
 import hashlib
 import hmac
 import json
+import math
 import os
 import time
+from typing import Iterator, Union
 
 import requests
 
 from .constants import HTTPMethod
+from .instrumentation import Timing, take_connect_time
+
+UNSUPPORTED_REQUEST_RESPONSE = {
+    "responseStatus": {
+        "errorCode": "500",
+        "message": "Unsupported request type"
+    }
+}
+
+
+# Body of requests without parameters
+EMPTY_BODY = json.dumps({})
+
+# Methods whose requests carry no body when they have no parameters
+BODILESS_METHODS = (HTTPMethod.GET, HTTPMethod.DELETE)
+
+_json_string = json.encoder.encode_basestring_ascii
+
+
+@functools.lru_cache(maxsize=32)
+def _keyed_hmac(private_key: str):
+    """HMAC-SHA256 state already keyed with a private key, to be copied"""
+    return hmac.new(private_key.encode(), digestmod=hashlib.sha256)
+
+
+def _sign(private_key: str, message: str) -> str:
+    """Base64 HMAC-SHA256 signature of a message"""
+    mac = _keyed_hmac(private_key).copy()
+    mac.update(message.encode())
+    return str(base64.b64encode(mac.digest()), 'UTF-8')
+
+
+def _transient(status_code: int) -> bool:
+    """Whether a status is a server error or throttling, worth retrying whatever the body"""
+    return status_code >= 500 or status_code == 429
+
+
+def _decode(response: requests.Response, loads=json.loads):
+    """JSON body of a response parsed from its bytes
+
+    Server errors and throttling raise `requests.HTTPError`, as do other
+    error statuses without a JSON body.
+    """
+    if _transient(response.status_code):
+        response.raise_for_status()
+    try:
+        return loads(response.content)
+    except ValueError:
+        response.raise_for_status()
+        raise
+
+
+def _json_number(value) -> str:
+    if value.__class__ is float and math.isfinite(value):
+        return float.__repr__(value)
+    if value.__class__ is int:
+        return int.__repr__(value)
+    return json.dumps(value)
+
+
+def order_body(
+        currency_pair: str,
+        order_way: str,
+        price: float,
+        amount: float = None,
+        spend_amount: float = None,
+        external_order_id: str = None,
+        validation_code: str = None) -> str:
+    """JSON body of a new order, as `json.dumps` of its parameters would write it"""
+    body = '{{"Code": {0}, "Way": {1}, "Price": {2}'.format(
+        _json_string(currency_pair), _json_string(order_way), _json_number(price))
+    if amount is not None:
+        body += ', "Amount": ' + _json_number(amount)
+    if spend_amount is not None:
+        body += ', "SpendAmount": ' + _json_number(spend_amount)
+    if external_order_id is not None:
+        body += ', "ExternalOrderId": ' + _json_string(external_order_id)
+    if validation_code is not None:
+        body += ', "ValidationCode": ' + _json_string(validation_code)
+    return body + '}'
 
 
 class Request:
@@ -21,7 +104,8 @@ class Request:
             public_key: str,
             command: str,
             http_method: HTTPMethod = HTTPMethod.GET,
-            params: object = {}):
+            params: object = {},
+            base_url: str = None):
         """Request object initialization"""
         self.private_key = private_key
         self.public_key = public_key
@@ -29,44 +113,71 @@ class Request:
         self.http_method = http_method
         self.params = params
         self.content_type = '' if self.http_method == HTTPMethod.GET else 'application/json'
-        self.url = self.__class__.BASE_URL + self.command
+        self.url = (base_url or self.__class__.BASE_URL) + self.command
 
-    def send(self):
-        """Method to launch the request"""
-        timestamp = '{:.3f}'.format(time.time())
+    def send(self, session: requests.Session = None, timeout: float = None):
+        """Method to launch the request, over a pooled session if given
 
-        signature = self.message_signature(timestamp)
+        Server errors, throttling and error statuses whose body is not JSON
+        raise `requests.HTTPError`, and
+        `timeout` bounds in seconds the wait for connecting and each read.
+        """
+        headers = self.signed_headers('{:.3f}'.format(time.time()))
 
-        headers = {
-            'API_PUBLIC_KEY': self.public_key,
-            'API_REQUEST_SIGNATURE': signature,
-            'API_REQUEST_DATE': timestamp,
-            'Content-Type': self.content_type,
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        }
+        payload = self.body()
 
-        payload = json.dumps(self.params)
+        requester = requests if session is None else session
 
         if self.http_method == HTTPMethod.GET:
-            F = requests.get
+            F = requester.get
         elif self.http_method == HTTPMethod.POST:
-            F = requests.post
+            F = requester.post
         elif self.http_method == HTTPMethod.DELETE:
-            F = requests.delete
+            F = requester.delete
         elif self.http_method == HTTPMethod.PUT:
-            F = requests.put
+            F = requester.put
         else:
-            return {
-                "responseStatus": {
-                    "errorCode": "500",
-                    "message": "Unsupported request type"
-                }
-            }
+            return UNSUPPORTED_REQUEST_RESPONSE
 
-        response = F(self.url, data=payload, headers=headers)
+        response = F(self.url, data=payload, headers=headers, timeout=timeout)
 
-        return response.json()
+        return _decode(response)
+
+    def body(self, dumps=json.dumps) -> str:
+        """Serialized parameters, None for GET and DELETE requests without any"""
+        if self.params:
+            return dumps(self.params)
+        return None if self.http_method in BODILESS_METHODS else EMPTY_BODY
+
+    def stream(self, session: requests.Session = None, timeout: float = None,
+               chunk_size: int = 65536) -> Iterator[bytes]:
+        """Launch the request and yield the body in chunks as they arrive"""
+        if not isinstance(self.http_method, HTTPMethod):
+            yield json.dumps(UNSUPPORTED_REQUEST_RESPONSE).encode()
+            return
+
+        headers = self.signed_headers('{:.3f}'.format(time.time()))
+        requester = requests if session is None else session
+        response = requester.request(self.http_method.value, self.url, data=self.body(),
+                                     headers=headers, timeout=timeout, stream=True)
+        try:
+            if _transient(response.status_code) or (
+                    not response.ok and 'json' not in response.headers.get('Content-Type', '')):
+                response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+        finally:
+            response.close()
+
+    def signed_headers(self, timestamp: str) -> dict:
+        """Return the request headers signed for the given timestamp"""
+        return {
+            'API_PUBLIC_KEY': self.public_key,
+            'API_REQUEST_SIGNATURE': self.message_signature(timestamp),
+            'API_REQUEST_DATE': timestamp,
+            'Content-Type': self.content_type,
+            'Cache-Control': 'no-cache',
+            'Pragma': 'no-cache'
+        }
 
     def message_signature(self, timestamp: str) -> str:
         """Return the message signature to sign the request with"""
@@ -76,7 +187,100 @@ class Request:
 
         message = (self.http_method + self.url +
                    self.content_type + timestamp).lower()
-        digest = hmac.new(self.private_key.encode(),
-                          message.encode(), hashlib.sha256).digest()
-        b64_digest = base64.b64encode(digest, altchars=None)
-        return str(b64_digest, 'UTF-8')
+        return _sign(self.private_key, message)
+
+
+class RequestTemplate:
+    """Precomputed request of one endpoint, reused by every call to it
+
+    The HMAC state is keyed and fed the lowercased method, URL and content
+    type the signature starts with once, then copied for every request, so
+    that sending only hashes the timestamp. The headers which never change
+    are built once too, each request copying them and adding its signature
+    and date.
+    """
+
+    def __init__(
+            self,
+            private_key: str,
+            public_key: str,
+            command: str,
+            http_method: HTTPMethod = HTTPMethod.GET,
+            base_url: str = None):
+        request = Request(private_key, public_key, command, http_method, base_url=base_url)
+        self.private_key = private_key
+        self.public_key = public_key
+        self.http_method = http_method
+        self.method = http_method.value if isinstance(http_method, HTTPMethod) else None
+        self.url = request.url
+        self.content_type = request.content_type
+        self.signing_prefix = (http_method + self.url + self.content_type).lower()
+        self._prefixed_hmac = None
+        if private_key is not None and public_key is not None:
+            self._prefixed_hmac = _keyed_hmac(private_key).copy()
+            self._prefixed_hmac.update(self.signing_prefix.encode())
+        self.static_headers = {
+            'API_PUBLIC_KEY': public_key,
+            'Content-Type': self.content_type,
+            'Cache-Control': 'no-cache',
+            'Pragma': 'no-cache'
+        }
+
+    def message_signature(self, timestamp: str) -> str:
+        """Return the message signature to sign the request with"""
+        if self._prefixed_hmac is None:
+            return ''
+
+        mac = self._prefixed_hmac.copy()
+        mac.update(timestamp.lower().encode())
+        return str(base64.b64encode(mac.digest()), 'UTF-8')
+
+    def signed_headers(self, timestamp: str) -> dict:
+        """Return the request headers signed for the given timestamp"""
+        headers = self.static_headers.copy()
+        headers['API_REQUEST_SIGNATURE'] = self.message_signature(timestamp)
+        headers['API_REQUEST_DATE'] = timestamp
+        return headers
+
+    def send(self, session: requests.Session = None, body: Union[str, bytes] = None,
+             timeout: float = None, loads=json.loads, timing: Timing = None):
+        """Send the request with an already serialized JSON body, or none
+
+        The response bytes are parsed with `loads`. With a `timing` the
+        network phases and the parsing are timed into it, connecting being
+        told apart from the wait for the first byte only over a session.
+        """
+        if self.method is None:
+            return UNSUPPORTED_REQUEST_RESPONSE
+
+        headers = self.signed_headers('{:.3f}'.format(time.time()))
+        requester = requests if session is None else session
+        if timing is not None:
+            return self._send_timed(requester, body, headers, timeout, loads, timing, session is not None)
+        response = requester.request(self.method, self.url, data=body, headers=headers, timeout=timeout)
+
+        return _decode(response, loads)
+
+    def _send_timed(self, requester, body, headers: dict, timeout: float, loads, timing: Timing,
+                    timed_connect: bool = True):
+        """Send the request, timing each phase
+
+        The body is streamed so that waiting for the headers and reading the
+        body are told apart. Without `timed_connect` the connection time is
+        not known and stays in the wait for the first byte.
+        """
+        take_connect_time()
+        start = time.perf_counter()
+        response = requester.request(self.method, self.url, data=body, headers=headers,
+                                     timeout=timeout, stream=True)
+        headers_received = time.perf_counter()
+        response.content  # pylint: disable=pointless-statement
+        received = time.perf_counter()
+        connect = take_connect_time()
+        timing.connect = connect if timed_connect else None
+        timing.ttfb = headers_received - start - connect
+        timing.transfer = received - headers_received
+        try:
+            return _decode(response, loads)
+        finally:
+            timing.parse = time.perf_counter() - received
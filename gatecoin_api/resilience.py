@@ -0,0 +1,266 @@
+"""Retries, hedged requests and circuit breakers around API requests
+
+One slow or failed response should not stall a polling loop. `Resilience`
+wraps every request of a `GatecoinAPI`:
+
+- idempotent requests (GET by default) that raise, because of a network
+  error, a timeout, a server error, throttling (429) or another error
+  status without a JSON body, are retried with exponential backoff and
+  full jitter;
+- with `hedge_percentile`, an idempotent request still running after that
+  percentile of the recent latencies of its endpoint is duplicated and the
+  first answer wins;
+- each endpoint has a circuit breaker which opens after consecutive
+  failures, failing calls at once until `reset_timeout` has elapsed.
+
+Non idempotent requests such as `create_order` are sent exactly once.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable
+
+from .constants import HTTPMethod
+
+CIRCUIT_OPEN_RESPONSE = {
+    "responseStatus": {
+        "errorCode": "503",
+        "message": "Circuit open after repeated failures"
+    }
+}
+
+
+def endpoint_for(command: str, http_method: HTTPMethod) -> str:
+    """Endpoint of a command, order identifiers left out"""
+    if command.startswith('v1/Trade/Orders/'):
+        command = 'v1/Trade/Orders/{order_id}'
+    return '{0} {1}'.format(http_method.value, command)
+
+
+class CircuitBreaker:
+    """Consecutive failure circuit breaker of one endpoint
+
+    The circuit opens after `failure_threshold` failures in a row. Once
+    `reset_timeout` seconds have elapsed one trial call is let through: its
+    success closes the circuit again, its failure keeps it open.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self._opened >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit past the threshold"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened = self.clock()
+
+
+class _Latencies:
+    """Sliding window of the latencies of one endpoint"""
+
+    def __init__(self, size: int):
+        self._samples = deque(maxlen=size)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, percentile: float, min_samples: int) -> float:
+        """Latency at a percentile, None until enough samples were seen"""
+        if len(self._samples) < min_samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(int(len(samples) * percentile / 100.0), len(samples) - 1)]
+
+
+def _spawn(function, *args) -> Future:
+    """Run a function on a new daemon thread, returning the future of its result"""
+    future = Future()
+
+    def run():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(function(*args))
+            except BaseException as error:  # pylint: disable=broad-except
+                future.set_exception(error)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+class Resilience:
+    """Retry, hedging and circuit breaking policy shared by API requests
+
+    Failed idempotent requests are tried up to `attempts` times, sleeping
+    a random delay up to `backoff * 2 ** retry` seconds, capped at
+    `max_backoff`, between tries. Hedging is off unless `hedge_percentile`
+    is set, and starts once `hedge_min_samples` latencies of an endpoint
+    were measured. Duplicates are sent from a pool of `hedge_workers`
+    threads. Calls that still fail raise their last error, calls on an
+    open circuit return a failed response with error code 503.
+    """
+
+    def __init__(
+            self,
+            attempts: int = 3,
+            backoff: float = 0.05,
+            max_backoff: float = 1.0,
+            idempotent_methods: Iterable[HTTPMethod] = (HTTPMethod.GET,),
+            hedge_percentile: float = None,
+            hedge_min_samples: int = 20,
+            hedge_workers: int = 8,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            sleep: Callable[[float], None] = time.sleep,
+            clock: Callable[[], float] = time.monotonic):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_workers = hedge_workers
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep
+        self.clock = clock
+        self.breakers = {}
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """Circuit breaker of an endpoint, created closed on first use"""
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(endpoint, CircuitBreaker(
+                    self.failure_threshold, self.reset_timeout, self.clock))
+        return breaker
+
+    def _latency_window(self, endpoint: str) -> _Latencies:
+        window = self._latencies.get(endpoint)
+        if window is None:
+            with self._lock:
+                window = self._latencies.setdefault(endpoint, _Latencies(200))
+        return window
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.hedge_workers)
+            return self._executor
+
+    def delay(self, retry: int) -> float:
+        """Random backoff before the given retry, counted from 0"""
+        return random.uniform(0.0, min(self.max_backoff, self.backoff * 2 ** retry))
+
+    def call(self, command: str, http_method: HTTPMethod, send: Callable[[], object]):
+        """Send a request through `send()` under the policy"""
+        endpoint = endpoint_for(command, http_method)
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            return CIRCUIT_OPEN_RESPONSE
+
+        idempotent = http_method in self.idempotent_methods
+        attempts = self.attempts if idempotent else 1
+        for attempt in range(attempts):
+            try:
+                if idempotent and self.hedge_percentile is not None:
+                    response = self._hedged(endpoint, send)
+                else:
+                    response = self._timed(endpoint, send)
+            except Exception:  # pylint: disable=broad-except
+                breaker.record_failure()
+                if attempt + 1 == attempts or not breaker.allow():
+                    raise
+                self.retries += 1
+                self.sleep(self.delay(attempt))
+            else:
+                breaker.record_success()
+                return response
+
+    def _timed(self, endpoint: str, send: Callable[[], object]):
+        start = self.clock()
+        response = send()
+        self._latency_window(endpoint).add(self.clock() - start)
+        return response
+
+    def _hedged(self, endpoint: str, send: Callable[[], object]):
+        threshold = self._latency_window(endpoint).percentile(
+            self.hedge_percentile, self.hedge_min_samples)
+        if threshold is None:
+            return self._timed(endpoint, send)
+
+        # The primary gets a thread of its own, so it neither queues behind
+        # other calls for the hedging threads nor waits there past the
+        # threshold, and it can still lose to the hedge
+        primary = _spawn(self._timed, endpoint, send)
+        done, _ = wait([primary], threshold)
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        hedge = self._pool().submit(self._timed, endpoint, send)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.hedge_wins += 1
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def stats(self) -> Dict[str, object]:
+        """Retry and hedge counters and the state of every circuit"""
+        return {
+            'retries': self.retries,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'circuits': {endpoint: breaker.state for endpoint, breaker in self.breakers.items()}
+        }
+
+    def close(self) -> None:
+        """Stop the hedging threads"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
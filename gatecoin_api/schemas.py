@@ -1,10 +1,7 @@
 """Types for attributes and request/response for the API"""
-from datetime import datetime
-from typing import List
-
-import pytz
 from marshmallow import Schema, fields, post_load, pre_load
 
+from .timestamps import EpochTime, epoch_to_datetime
 from .types import (AccountBalance, CancelAllOpenOrdersResponse,
                     CancelOpenOrderResponse, CreateOrderResponse, CurrencyPair,
                     GetBalanceResponse, GetBalancesResponse,
@@ -15,37 +12,21 @@ from .types import (AccountBalance, CancelAllOpenOrdersResponse,
                     ResponseStatus, TraderTransaction, Transaction)
 
 
-class TransactionTimeMixin:
-    """Mixin to convert unix timestamp to datetime string for schema"""
+class EpochDateTime(fields.DateTime):
+    """DateTime field loaded straight from a unix timestamp
 
-    @pre_load(pass_many=True)
-    def transform_timestamp(self, data, many):
-        """OrderedLimit is the same as Limit but only without keys"""
-        if many is True:
-            for transaction in data:
-                transaction['transactionTime'] = datetime.fromtimestamp(
-                    float(transaction['transactionTime']), tz=pytz.utc).isoformat()
-            return data
-        else:
-            data['transactionTime'] = datetime.fromtimestamp(
-                float(data['transactionTime']), tz=pytz.utc).isoformat()
-            return data
+    The value becomes an aware UTC datetime, or an `EpochTime` keeping the
+    raw seconds when the schema context sets `raw_timestamps`.
+    """
 
-class DateMixin:
-    """Mixin to convert unix timestamp to datetime string for schema"""
+    def _deserialize(self, value, attr, data):
+        try:
+            if self.context.get('raw_timestamps'):
+                return EpochTime(value)
+            return epoch_to_datetime(value)
+        except (TypeError, ValueError, OverflowError, OSError):
+            self.fail('invalid')
 
-    @pre_load(pass_many=True)
-    def transform_timestamp(self, data, many):
-        """OrderedLimit is the same as Limit but only without keys"""
-        if many is True:
-            for transaction in data:
-                transaction['date'] = datetime.fromtimestamp(
-                    float(transaction['date']), tz=pytz.utc).isoformat()
-            return data
-        else:
-            data['date'] = datetime.fromtimestamp(
-                float(data['date']), tz=pytz.utc).isoformat()
-            return data
 
 class ResponseErrorSchema(Schema):
     """ResponseError schema"""
@@ -103,24 +84,21 @@ class LimitSchema(Schema):
 
 class OrderedLimitSchema(LimitSchema):
     """OrderedLimit schema"""
+    positional_keys = ('price', 'volume')
 
     @pre_load(pass_many=True)
     def transform_to_dict(self, data, many):
         """OrderedLimit is the same as Limit but only without keys"""
         if many is True:
-            proxied = List()
-            for limit in data:
-                proxied.append({'price': limit[0], 'volume': limit[1]})
-            return proxied
+            return [{'price': limit[0], 'volume': limit[1]} for limit in data]
         else:
             return {'price': data[0], 'volume': data[1]}
 
 
-class TransactionSchema(Schema, TransactionTimeMixin):
+class TransactionSchema(Schema):
     """Transaction schema"""
     transaction_id = fields.Integer(load_from='transactionId')
-    transaction_time = fields.DateTime(
-        load_from='transactionTime')
+    transaction_time = EpochDateTime(load_from='transactionTime')
     price = fields.Float()
     quantity = fields.Float()
     currency_pair = fields.Str(load_from='currencyPair')
@@ -148,10 +126,10 @@ class AccountBalanceSchema(Schema):
     def make_object(self, data):
         return AccountBalance(**data)
 
-class TraderTransactionSchema(Schema, TransactionTimeMixin):
+class TraderTransactionSchema(Schema):
     """TraderTransaction schema"""
     transaction_id = fields.Int(load_from='transactionId')
-    transaction_time = fields.DateTime(load_from='transactionTime')
+    transaction_time = EpochDateTime(load_from='transactionTime')
     ask_order_id = fields.Str(load_from='askOrderId')
     bid_order_id = fields.Str(load_from='bidOrderId')
     price = fields.Float()
@@ -166,7 +144,7 @@ class TraderTransactionSchema(Schema, TransactionTimeMixin):
     def make_object(self, data):
         return TraderTransaction(**data)
 
-class OpenOrderSchema(Schema, DateMixin):
+class OpenOrderSchema(Schema):
     """OpenOrder schema"""
     code = fields.Str()
     cl_order_id = fields.Str(load_from='clOrderId')
@@ -178,7 +156,7 @@ class OpenOrderSchema(Schema, DateMixin):
     status_desc = fields.Str(load_from='statusDesc')
     transaction_sequence_number = fields.Int(load_from='transSeqNo')
     type = fields.Int()
-    date = fields.DateTime()
+    date = EpochDateTime()
 
     @post_load
     def make_object(self, data):
@@ -319,3 +297,8 @@ class GetTradeHistoryResponseSchema(Schema, ResponseStatusMixin):
         return GetTradeHistoryResponse(**data)
 
 get_trade_history_response_schema = GetTradeHistoryResponseSchema()
+
+# Item schemas of the responses decoded one item at a time while streaming
+response_status_schema = ResponseStatusSchema()
+transaction_schema = TransactionSchema()
+trader_transaction_schema = TraderTransactionSchema()
@@ -0,0 +1,130 @@
+"""Pooled keep-alive HTTP sessions shared by API requests"""
+import contextlib
+import threading
+import time
+from typing import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .instrumentation import add_connect_time
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """Connection accounting the time spent opening it"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """TLS connection accounting the time spent opening it, handshake included"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """Adapter whose connections account their opening time for instrumentation"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class SessionPool:
+    """Thread-safe pool of keep-alive connections reused by every request
+
+    A single `requests.Session` is shared between threads, backed by one
+    `HTTPAdapter` whose urllib3 pool manager keeps up to `pool_size` host
+    pools of up to `max_connections_per_host` connections each, requests
+    beyond that number waiting for a connection to be released. When no
+    request has been in flight for longer than `keep_alive_timeout` seconds
+    the kept-alive connections are dropped before the next request, as the
+    server has most likely closed them on its side already. With
+    `timed_connections` the time spent opening connections is accounted for
+    instrumentation.
+    """
+
+    def __init__(
+            self,
+            pool_size: int = 10,
+            max_connections_per_host: int = 10,
+            keep_alive_timeout: float = 30.0,
+            timed_connections: bool = False):
+        self.pool_size = pool_size
+        self.max_connections_per_host = max_connections_per_host
+        self.keep_alive_timeout = keep_alive_timeout
+        self.timed_connections = timed_connections
+        self._lock = threading.Lock()
+        self._last_used = None
+        self._in_use = 0
+        self._session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter_class = _TimedHTTPAdapter if self.timed_connections else HTTPAdapter
+        adapter = adapter_class(pool_connections=self.pool_size,
+                                pool_maxsize=self.max_connections_per_host, pool_block=True)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def session(self) -> requests.Session:
+        """Return the shared session, expiring idle connections first
+
+        The pool counts as used when the session is handed out, `use`
+        tracks requests until they complete instead.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire_idle(now)
+            self._last_used = now
+            return self._session
+
+    @contextlib.contextmanager
+    def use(self) -> Iterator[requests.Session]:
+        """Shared session for one request, the pool being idle only once it completed"""
+        with self._lock:
+            self._expire_idle(time.monotonic())
+            self._in_use += 1
+        try:
+            yield self._session
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+
+    def _expire_idle(self, now: float) -> None:
+        if (not self._in_use and self._last_used is not None and
+                now - self._last_used > self.keep_alive_timeout):
+            # Closing the adapters only clears the urllib3 pools,
+            # connections are opened again on demand
+            self._session.close()
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            self._session.close()
+            self._last_used = None
@@ -0,0 +1,89 @@
+"""Coalescing of identical concurrent API calls
+
+Threads polling the same data often ask for it at the same moment. With a
+`SingleFlight` attached to `GatecoinAPI`, a GET call made while an
+identical one (same method, hence same URL, with the same parameters) is
+in flight waits for that call and receives the same decoded response, so
+one HTTP request and one decode serve every caller.
+"""
+import functools
+import threading
+from collections import Counter
+
+
+class _Call:
+    """One in-flight call and its outcome"""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs a single call per key at a time, sharing its outcome
+
+    `calls` counts the calls actually made and `coalesced` those which
+    waited for an identical call instead, both per endpoint.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.coalesced = Counter()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: tuple, function):
+        """Return `function()`, or the outcome of the in-flight call with the same key
+
+        The first element of the key names the endpoint in the counters.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls[key[0]] += 1
+            else:
+                self.coalesced[key[0]] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        """Totals of calls made and calls coalesced"""
+        return {
+            'calls': sum(self.calls.values()),
+            'coalesced': sum(self.coalesced.values())
+        }
+
+
+def coalesced(method):
+    """Coalesce identical concurrent calls of an API method through its `single_flight`"""
+    endpoint = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        single_flight = self.single_flight
+        if single_flight is None:
+            return method(self, *args, **kwargs)
+
+        key = (endpoint, args, tuple(sorted(kwargs.items())))
+        return single_flight.do(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -0,0 +1,111 @@
+"""Incremental parsing of the item lists of large responses
+
+Trade histories can hold hundreds of thousands of trades. Instead of
+buffering the body and building every object before returning,
+`iter_items` parses the body as it arrives and yields the items of one
+top-level list one at a time, so memory stays flat whatever the size of the
+history and consumers start working before the download completes.
+"""
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Text decoded from a byte stream, consumed from the front"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.position = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Read one more chunk, returning False at the end of the stream"""
+        if self.exhausted:
+            return False
+        # Drop the consumed text so that the buffer holds about one item
+        self.text = self.text[self.position:]
+        self.position = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+        self.text += self._decoder.decode(b'', final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Next non whitespace character, empty at the end of the stream"""
+        while True:
+            text = self.text
+            position = self.position
+            while position < len(text) and text[position] in _WHITESPACE:
+                position += 1
+            self.position = position
+            if position < len(text):
+                return text[position]
+            if not self.fill():
+                return ''
+
+    def expect(self, character: str) -> None:
+        """Consume a structural character"""
+        if self.peek() != character:
+            raise ValueError('Expected {0!r} at offset {1}'.format(character, self.position))
+        self.position += 1
+
+    def value(self):
+        """Parse and consume the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.position)
+            except ValueError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may still continue
+            if end == len(self.text) and not self.exhausted:
+                self.fill()
+                continue
+            self.position = end
+            return value
+
+
+def iter_items(chunks: Iterable[bytes], key: str, members: dict = None) -> Iterator[object]:
+    """Yield the items of the list under `key` of a streamed JSON object
+
+    Other members of the object are parsed and skipped, or stored in
+    `members` when given, so that a caller can check the status of the
+    response once the items are consumed.
+    """
+    buffer = _Buffer(chunks)
+    buffer.expect('{')
+    if buffer.peek() == '}':
+        return
+    while True:
+        name = buffer.value()
+        buffer.expect(':')
+        if name == key and buffer.peek() == '[':
+            buffer.expect('[')
+            if buffer.peek() == ']':
+                buffer.position += 1
+            else:
+                while True:
+                    yield buffer.value()
+                    if buffer.peek() == ']':
+                        buffer.position += 1
+                        break
+                    buffer.expect(',')
+        elif members is None:
+            buffer.value()
+        else:
+            members[name] = buffer.value()
+        if buffer.peek() == '}':
+            return
+        buffer.expect(',')
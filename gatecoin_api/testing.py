@@ -0,0 +1,262 @@
+"""Local stand-in for the Gatecoin REST API used by tests and benchmarks"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+NOT_FOUND = {
+    "responseStatus": {
+        "errorCode": "404",
+        "message": "Unknown command"
+    }
+}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 handler answering from the server routes"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count_connection()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        command = self.path.lstrip('/')
+        self.server.record(self.command, command, dict(self.headers), body)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        payload = self.server.route(self.command, command)
+        status = 404 if payload is NOT_FOUND else 200
+        if callable(payload):
+            payload = payload(self.command, command, body)
+        if isinstance(payload, tuple):
+            status, payload = payload
+        content = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded local HTTP server answering API commands with canned payloads
+
+    Routes map a command such as `v1/Public/MarketDepth/BTCUSD`, optionally
+    prefixed with the HTTP method (`DELETE v1/Trade/Orders`), to a JSON-able
+    payload, raw bytes or a callable `(method, command, body)` returning one,
+    any of them possibly paired with an HTTP status in a `(status, payload)`
+    tuple.
+    `latency` injects a fixed delay in seconds before every response.
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, routes: Dict[str, object] = None, latency: float = 0.0):
+        super().__init__(('127.0.0.1', 0), _StandInHandler)
+        self.routes = routes or {}
+        self.latency = latency
+        self.connections = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to point the API client at"""
+        return 'http://{0}:{1}/'.format(*self.server_address)
+
+    def count_connection(self) -> None:
+        """Count a newly accepted TCP connection"""
+        with self._lock:
+            self.connections += 1
+
+    def record(self, method: str, command: str, headers: dict, body: bytes) -> None:
+        """Record a received request for later inspection"""
+        with self._lock:
+            self.requests.append((method, command, headers, body))
+
+    def route(self, method: str, command: str) -> object:
+        """Find the payload registered for the request"""
+        key = '{0} {1}'.format(method, command)
+        if key in self.routes:
+            return self.routes[key]
+        return self.routes.get(command, NOT_FOUND)
+
+    def start(self) -> 'StandInServer':
+        """Serve requests from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket"""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+# Payload generators, seeded so that every run produces the same data
+
+def _ok() -> dict:
+    return {"message": "OK"}
+
+
+def market_depth_payload(levels: int = 50, seed: int = 0) -> dict:
+    """Market depth response with `levels` asks and bids"""
+    rand = random.Random(seed)
+    mid = 6500.0
+    return {
+        "asks": [{"price": round(mid + 0.1 * (i + 1), 1),
+                  "volume": round(rand.uniform(0.001, 5.0), 8)}
+                 for i in range(levels)],
+        "bids": [{"price": round(mid - 0.1 * (i + 1), 1),
+                  "volume": round(rand.uniform(0.001, 5.0), 8)}
+                 for i in range(levels)],
+        "responseStatus": _ok()
+    }
+
+
+def order_book_payload(levels: int = 50, seed: int = 0) -> dict:
+    """Order book response with `levels` positional asks and bids"""
+    depth = market_depth_payload(levels, seed)
+    return {
+        "asks": [[limit['price'], limit['volume']] for limit in depth['asks']],
+        "bids": [[limit['price'], limit['volume']] for limit in depth['bids']]
+    }
+
+
+def _transaction(rand: random.Random, index: int, currency_pair: str) -> dict:
+    return {
+        "transactionId": 10000000 + index,
+        "transactionTime": str(1535000000 + index * 7),
+        "price": round(rand.uniform(6000.0, 7000.0), 1),
+        "quantity": round(rand.uniform(0.001, 2.0), 8),
+        "currencyPair": currency_pair,
+        "way": rand.choice(("bid", "ask")),
+        "askOrderId": "BK11{0:012d}".format(rand.randrange(10 ** 12)),
+        "bidOrderId": "BK11{0:012d}".format(rand.randrange(10 ** 12))
+    }
+
+
+def recent_transactions_payload(
+        count: int = 100, currency_pair: str = 'BTCUSD', seed: int = 0) -> dict:
+    """Recent transactions response with `count` transactions"""
+    rand = random.Random(seed)
+    return {
+        "transactions": [_transaction(rand, i, currency_pair) for i in range(count)],
+        "responseStatus": _ok()
+    }
+
+
+def trade_history_payload(
+        count: int = 100, currency_pairs: List[str] = ('BTCUSD', 'ETHBTC'), seed: int = 0) -> dict:
+    """Trade history response with `count` trades"""
+    rand = random.Random(seed)
+    trades = []
+    for i in range(count):
+        trade = _transaction(rand, i, currency_pairs[i % len(currency_pairs)])
+        trade.update({
+            "feeRoll": rand.choice(("Maker", "Taker")),
+            "feeRate": 0.0025,
+            "feeAmount": round(rand.uniform(0.0, 1.0), 8)
+        })
+        trades.append(trade)
+    return {"trades": trades, "responseStatus": _ok()}
+
+
+def open_orders_payload(count: int = 10, seed: int = 0) -> dict:
+    """Open orders response with `count` orders"""
+    rand = random.Random(seed)
+    orders = []
+    for i in range(count):
+        quantity = round(rand.uniform(0.01, 2.0), 8)
+        orders.append({
+            "code": "BTCUSD",
+            "clOrderId": "BK11{0:012d}".format(i),
+            "side": rand.choice((0, 1)),
+            "price": round(rand.uniform(6000.0, 7000.0), 1),
+            "initialQuantity": quantity,
+            "remainingQuantity": quantity,
+            "status": 1,
+            "statusDesc": "New",
+            "transSeqNo": 0,
+            "type": 0,
+            "date": str(1535000000 + i)
+        })
+    return {"orders": orders, "responseStatus": _ok()}
+
+
+def balances_payload(currencies: List[str] = ('BTC', 'ETH', 'USD', 'EUR', 'HKD')) -> dict:
+    """Balances response with one balance per currency"""
+    return {
+        "balances": [{
+            "currency": currency,
+            "balance": 10.0,
+            "availableBalance": 8.0,
+            "pendingIncoming": 0.0,
+            "pendingOutgoing": 0.0,
+            "openOrder": 2.0,
+            "pledging": 0.0,
+            "isDigital": currency in ('BTC', 'ETH')
+        } for currency in currencies],
+        "responseStatus": _ok()
+    }
+
+
+def currency_pairs_payload(
+        pairs: List[str] = ('BTCUSD', 'BTCEUR', 'BTCHKD', 'ETHBTC', 'ETHUSD')) -> dict:
+    """Currency pairs reference response"""
+    return {
+        "currencyPairs": [{
+            "tradingCode": pair,
+            "baseCurrency": pair[:3],
+            "quoteCurrency": pair[3:],
+            "displayName": '{0} / {1}'.format(pair[:3], pair[3:]),
+            "priceDecimalPlaces": 5 if pair.endswith('BTC') else 1,
+            "name": '{0} / {1}'.format(pair[:3], pair[3:])
+        } for pair in pairs],
+        "responseStatus": _ok()
+    }
+
+
+def public_routes(pairs: List[str] = ('BTCUSD', 'BTCEUR', 'ETHBTC'), levels: int = 50) -> Dict[str, object]:
+    """Routes serving the public commands for the given pairs"""
+    routes = {'v1/Reference/CurrencyPairs': currency_pairs_payload(pairs)}
+    for seed, pair in enumerate(pairs):
+        routes['v1/Public/MarketDepth/' + pair] = market_depth_payload(levels, seed)
+        routes['v1/{0}/OrderBook'.format(pair)] = order_book_payload(levels, seed)
+        routes['v1/Public/Transactions/' + pair] = recent_transactions_payload(
+            levels, pair, seed)
+    return routes
+
+
+def timed(function: Callable, repeat: int) -> List[float]:
+    """Call `function` `repeat` times, returning each latency in seconds"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - start)
+    return latencies
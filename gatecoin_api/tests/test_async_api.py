@@ -0,0 +1,79 @@
+"""Test suite for the asyncio API client against a local stand-in"""
+import asyncio
+import time
+
+import pytest
+
+from gatecoin_api import AsyncGatecoinAPI
+from gatecoin_api.constants import HTTPMethod
+from gatecoin_api.request import Request
+from gatecoin_api.testing import StandInServer, balances_payload, public_routes
+
+aiohttp = pytest.importorskip('aiohttp')
+
+
+@pytest.fixture
+def server() -> StandInServer:
+    """Fixture to serve public and balance commands from a local stand-in"""
+    routes = public_routes(levels=5)
+    routes['v1/Balance/Balances'] = balances_payload()
+    with StandInServer(routes, latency=0.01) as standin:
+        yield standin
+
+
+def test_concurrent_requests(server: StandInServer):
+    """Test many coroutines in flight decode into the usual types"""
+    async def run():
+        async with AsyncGatecoinAPI(base_url=server.base_url) as api:
+            return await asyncio.gather(*[api.get_market_depth('BTCUSD') for _ in range(50)])
+
+    responses = asyncio.run(run())
+
+    assert (len(responses) == 50), 'Not all requests completed'
+    for response in responses:
+        assert (response.response_status.message == 'OK'), 'API response not successful'
+        assert (len(response.asks) == 5), 'Asks did not deserialize properly'
+
+
+def test_signature_matches_blocking_request(server: StandInServer):
+    """Test async requests are signed like the blocking client"""
+    async def run():
+        async with AsyncGatecoinAPI('private', 'public', base_url=server.base_url) as api:
+            return await api.get_balance('ETH')
+
+    response = asyncio.run(run())
+    assert (response.balance.currency == 'ETH'), 'Balance was not selected'
+
+    _, command, headers, body = server.requests[-1]
+    expected = Request('private', 'public', command, HTTPMethod.GET,
+                       base_url=server.base_url).message_signature(headers['API_REQUEST_DATE'])
+    assert (headers['API_REQUEST_SIGNATURE'] == expected), 'Request signature differs'
+    assert (body == b''), 'GET request without parameters was sent a body'
+
+
+def test_error_statuses_and_timeouts_raise():
+    """Test async requests raise on server errors, bodies which are not JSON and timeouts"""
+    routes = {
+        'v1/Public/MarketDepth/BTCUSD': (503, {'responseStatus': {'errorCode': '503', 'message': 'Down'}}),
+        'v1/Public/MarketDepth/ETHBTC': (404, b'<html>Not found</html>'),
+        'v1/Public/MarketDepth/SLOW': lambda method, command, body: time.sleep(0.5) or {}
+    }
+
+    async def run(base_url):
+        async with AsyncGatecoinAPI(base_url=base_url, timeout=0.1) as api:
+            outcomes = []
+            for pair in ('BTCUSD', 'ETHBTC', 'SLOW'):
+                try:
+                    await api.get_market_depth(pair)
+                except (aiohttp.ClientResponseError, asyncio.TimeoutError) as error:
+                    outcomes.append(error)
+            outcomes.append(await api.get_market_depth('XXXYYY'))
+            return outcomes
+
+    with StandInServer(routes) as server:
+        server_error, not_json, timed_out, client_error = asyncio.run(run(server.base_url))
+
+    assert (server_error.status == 503), 'Server error did not raise'
+    assert (not_json.status == 404), 'Error status without a JSON body did not raise'
+    assert (isinstance(timed_out, asyncio.TimeoutError)), 'Slow request did not time out'
+    assert (client_error.response_status.error_code == '404'), 'JSON error body was not decoded'
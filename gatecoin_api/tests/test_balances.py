@@ -0,0 +1,71 @@
+"""Test suite for balance lookups served from the balance snapshot"""
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, balances_payload
+
+
+@pytest.fixture
+def server() -> StandInServer:
+    """Fixture to serve balances from a local stand-in"""
+    with StandInServer({'v1/Balance/Balances': balances_payload()}) as standin:
+        yield standin
+
+
+def test_lookups_share_one_download(server: StandInServer):
+    """Test balance lookups within the freshness window reuse one response"""
+    api = GatecoinAPI('private', 'public', base_url=server.base_url, balance_max_age=60.0)
+    assert (api.get_balance('BTC').balance.is_digital is True), 'BTC balance is wrong'
+    assert (api.get_balance('USD').balance.currency == 'USD'), 'USD balance is wrong'
+    balances = api.get_balances_for(['ETH', 'EUR', 'XYZ'])
+
+    assert (balances['ETH'].currency == 'ETH' and balances['XYZ'] is None), 'Bulk lookup is wrong'
+    assert (len(server.requests) == 1), 'Lookups downloaded the balances again'
+
+    api.refresh_balances()
+    api.cancel_all_orders()
+    api.get_balance('BTC')
+    assert (len(server.requests) == 4), 'Refresh or order change did not refresh the snapshot'
+    api.close()
+
+
+def test_lookups_without_freshness_window_download(server: StandInServer):
+    """Test every lookup downloads the balances by default"""
+    api = GatecoinAPI('private', 'public', base_url=server.base_url)
+    api.get_balance('BTC')
+    api.get_balance('ETH')
+
+    assert (len(server.requests) == 2), 'Balances were reused without a freshness window'
+    api.close()
+
+
+def test_unknown_currency_fails(server: StandInServer):
+    """Test an unknown currency returns a failed response instead of raising"""
+    api = GatecoinAPI('private', 'public', base_url=server.base_url)
+    response = api.get_balance('XYZ')
+
+    assert (response.balance is None and response.response_status.error_code == '404'), \
+        'Unknown currency did not fail'
+    api.close()
+
+
+def test_balances_requested_before_an_invalidation_are_not_kept():
+    """Test a balances response racing an order change does not become the snapshot"""
+    now = [0.0]
+
+    def balances(method, command, body):
+        # An order is placed while the balances are on their way
+        now[0] += 1.0
+        api.balances.invalidate()
+        return balances_payload()
+
+    with StandInServer({'v1/Balance/Balances': balances}) as standin:
+        api = GatecoinAPI('private', 'public', base_url=standin.base_url, balance_max_age=60.0)
+        api.balances.clock = lambda: now[0]
+        stale = api.get_balance('BTC')
+        api.get_balance('ETH')
+        api.close()
+
+    assert (stale.balance.currency == 'BTC'), 'Ignored response was not used for the lookup'
+    assert (api.balances.response is None and len(standin.requests) == 2), \
+        'Balances requested before the invalidation were kept'
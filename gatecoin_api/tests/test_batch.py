@@ -0,0 +1,70 @@
+"""Test suite for bounded-concurrency batch calls against a local stand-in"""
+import json
+import time
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, public_routes
+
+
+def test_batch_calls_report_failures_per_pair():
+    """Test batch calls key responses by pair and keep failed pairs apart"""
+    routes = public_routes(pairs=('BTCUSD', 'ETHBTC'), levels=5)
+    routes['v1/Public/MarketDepth/BADPAIR'] = b'not json'
+    with StandInServer(routes) as server:
+        api = GatecoinAPI(base_url=server.base_url)
+        batch = api.get_market_depth_many(['BTCUSD', 'ETHBTC', 'XXXYYY', 'BADPAIR'])
+        books = api.get_order_book_many(['BTCUSD', 'XXXYYY'])
+        api.close()
+
+    assert (sorted(batch.responses) == ['BTCUSD', 'ETHBTC']), 'Successful pairs are missing'
+    assert (batch.errors['XXXYYY'].response_status.error_code == '404'), 'Error response was not reported'
+    assert (isinstance(batch.errors['BADPAIR'], ValueError)), 'Raised error was not reported'
+    assert (list(books.responses) == ['BTCUSD'] and list(books.errors) == ['XXXYYY']), \
+        'Order book error body was reported as a response'
+
+
+def test_batch_calls_bound_concurrency():
+    """Test batch calls overlap requests up to the worker limit"""
+    pairs = ['P{0}'.format(index) for index in range(8)]
+    routes = public_routes(pairs=pairs, levels=5)
+    with StandInServer(routes, latency=0.1) as server:
+        api = GatecoinAPI(base_url=server.base_url)
+        start = time.perf_counter()
+        batch = api.get_order_book_many(pairs, max_workers=4)
+        elapsed = time.perf_counter() - start
+        api.close()
+
+    assert (len(batch.responses) == 8), 'Batch responses are missing'
+    assert (0.2 <= elapsed < 0.7), 'Requests did not run four at a time'
+
+
+def test_bulk_orders_keep_input_order_and_map_order_ids():
+    """Test bulk order calls overlap, keep input order and report failures per order"""
+    def place(method, command, body):
+        order = json.loads(body)
+        if order['Price'] <= 0:
+            return {'responseStatus': {'errorCode': '1002', 'message': 'Invalid price'}}
+        return {'clOrderId': 'BK' + order['ExternalOrderId'], 'responseStatus': {'message': 'OK'}}
+
+    routes = {'POST v1/Trade/Orders': place,
+              'DELETE v1/Trade/Orders/BKmine-1': {'responseStatus': {'message': 'OK'}}}
+    orders = [{'currency_pair': 'BTCUSD', 'order_way': 'bid', 'price': 6500.0 - level,
+               'amount': 0.1, 'external_order_id': 'mine-{0}'.format(level)} for level in range(20)]
+    orders[3]['price'] = 0
+    with StandInServer(routes, latency=0.1) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        start = time.perf_counter()
+        created = api.create_orders(orders, max_workers=20)
+        elapsed = time.perf_counter() - start
+        cancelled = api.cancel_orders(['BKmine-1', 'BKunknown'])
+        api.close()
+
+    assert (elapsed < 0.5), 'Orders were not placed concurrently'
+    assert ([response.cl_order_id for response in created.responses[:3]] ==
+            ['BKmine-0', 'BKmine-1', 'BKmine-2']), \
+        'Input order was not kept'
+    assert (list(created.errors) == [3] and created.errors[3].response_status.error_code == '1002'), \
+        'Failed order was not reported'
+    assert (len(created.cl_order_ids) == 19 and created.cl_order_ids['mine-7'] == 'BKmine-7'), \
+        'External order ids were not mapped'
+    assert (list(cancelled.errors) == [1]), 'Failed cancel was not reported'
@@ -0,0 +1,86 @@
+"""Test suite for the decoded response cache"""
+import pytest
+
+from gatecoin_api import GatecoinAPI, ResponseCache
+from gatecoin_api.testing import StandInServer, public_routes
+
+
+class _Clock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def server() -> StandInServer:
+    """Fixture to serve public commands from a local stand-in"""
+    with StandInServer(public_routes(levels=5)) as standin:
+        yield standin
+
+
+def test_hits_skip_requests_until_expiry(server: StandInServer):
+    """Test cached responses are reused until their time to live elapses"""
+    clock = _Clock()
+    cache = ResponseCache({'get_market_depth': 1.0}, clock=clock)
+    api = GatecoinAPI(base_url=server.base_url, cache=cache)
+
+    first = api.get_market_depth('BTCUSD')
+    assert (api.get_market_depth('BTCUSD') is first), 'Cached response was not reused'
+    assert (len(server.requests) == 1), 'Cache hit sent a request'
+
+    clock.now = 1.5
+    assert (api.get_market_depth('BTCUSD') is not first), 'Expired response was reused'
+    assert (cache.hits['get_market_depth'] == 1 and cache.misses['get_market_depth'] == 2), 'Counters are wrong'
+
+    api.get_recent_transactions('BTCUSD')
+    api.get_recent_transactions('BTCUSD')
+    assert (len(server.requests) == 4), 'Endpoint without a time to live was cached'
+    api.close()
+
+
+def test_lru_eviction_and_invalidation(server: StandInServer):
+    """Test least recently used entries are evicted and invalidation drops entries"""
+    cache = ResponseCache(max_entries=2)
+    api = GatecoinAPI(base_url=server.base_url, cache=cache)
+
+    api.get_market_depth('BTCUSD')
+    api.get_market_depth('BTCEUR')
+    api.get_market_depth('BTCUSD')
+    api.get_market_depth('ETHBTC')
+    assert (cache.stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2}), 'LRU entry was not evicted'
+
+    api.get_market_depth('BTCEUR')
+    assert (len(server.requests) == 4), 'Evicted entry was served'
+
+    assert (cache.invalidate('get_market_depth', 'ETHBTC') == 1), 'Entry was not invalidated'
+    api.get_market_depth('ETHBTC')
+    assert (len(server.requests) == 5), 'Invalidated entry was served'
+    assert (cache.invalidate() == 2 and len(cache) == 0), 'Cache was not cleared'
+    api.close()
+
+
+def test_failed_responses_are_not_cached(server: StandInServer):
+    """Test error responses are fetched again"""
+    api = GatecoinAPI(base_url=server.base_url, cache=ResponseCache())
+    api.get_market_depth('XXXYYY')
+    api.get_market_depth('XXXYYY')
+    api.get_order_book('XXXYYY')
+    api.get_order_book('XXXYYY')
+
+    assert (len(server.requests) == 4 and len(api.cache) == 0), 'Error response was cached'
+    api.close()
+
+
+def test_keys_include_default_arguments(server: StandInServer):
+    """Test calls differing only by spelled out defaults share an entry"""
+    api = GatecoinAPI(base_url=server.base_url, cache=ResponseCache())
+    first = api.get_order_book('BTCUSD')
+
+    assert (api.get_order_book('BTCUSD', columnar=False) is first), 'Default argument made another entry'
+    assert (api.get_order_book(currency_pair='BTCUSD') is first), 'Keyword argument made another entry'
+    assert (len(server.requests) == 1 and len(api.cache) == 1), 'Cache entries were duplicated'
+    api.close()
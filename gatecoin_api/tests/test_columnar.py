@@ -0,0 +1,46 @@
+"""Test suite for columnar order book decoding"""
+import pytest
+
+from gatecoin_api import GatecoinAPI, schemas, testing
+from gatecoin_api.columnar import LimitColumns, load_columnar
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('schema,payload', [
+    (schemas.get_order_book_response_schema, testing.order_book_payload(30)),
+    (schemas.get_market_depth_response_schema, testing.market_depth_payload(30)),
+])
+def test_columns_match_limits(schema, payload):
+    """Test columnar sides hold the same levels as Limit lists"""
+    columnar, err = load_columnar(schema, payload)
+    regular, _ = schema.load(payload, partial=True)
+
+    assert (not err), 'Payload did not deserialize properly'
+    for side in ('asks', 'bids'):
+        columns = getattr(columnar, side)
+        assert (isinstance(columns, LimitColumns)), 'Side is not columnar'
+        assert (columns.prices.dtype == np.float64), 'Prices are not float64'
+        assert (columns.prices.flags['C_CONTIGUOUS']), 'Prices are not contiguous'
+        assert (repr(columns) == repr(getattr(regular, side))), 'Levels differ'
+
+
+def test_limit_views():
+    """Test indexing and slicing only build the requested levels"""
+    book, _ = load_columnar(schemas.get_order_book_response_schema, testing.order_book_payload(10))
+
+    top = book.asks[:3]
+    assert (isinstance(top, LimitColumns) and len(top) == 3), 'Slice is not columnar'
+    assert (book.asks[0].price == pytest.approx(6500.1)), 'Limit view is wrong'
+    assert (isinstance(book.asks[0].price, float)), 'Limit view is not a float'
+
+
+def test_null_levels_fall_back():
+    """Test invalid levels are rejected like the regular decoders do"""
+    payload = testing.order_book_payload(3)
+    payload['bids'][1][1] = None
+
+    with testing.StandInServer({'v1/BTCUSD/OrderBook': payload}) as server:
+        api = GatecoinAPI(base_url=server.base_url)
+        assert (api.get_order_book('BTCUSD', columnar=True) is None), 'Null volume was accepted'
+        assert (api.get_order_book('BTCUSD') is None), 'Null volume was accepted'
@@ -0,0 +1,105 @@
+"""Parity test suite for compiled decoders against marshmallow schemas"""
+import copy
+from datetime import datetime, timezone
+
+import pytest
+
+from gatecoin_api import decoders, schemas, testing
+from gatecoin_api.timestamps import EpochTime, epoch_to_datetime
+
+PAYLOADS = [
+    (schemas.get_currency_pairs_response_schema, testing.currency_pairs_payload()),
+    (schemas.get_market_depth_response_schema, testing.market_depth_payload(20)),
+    (schemas.get_order_book_response_schema, testing.order_book_payload(20)),
+    (schemas.get_recent_transactions_response_schema, testing.recent_transactions_payload(20)),
+    (schemas.get_balances_response_schema, testing.balances_payload()),
+    (schemas.get_balance_response_schema,
+     dict(testing.balances_payload(), balance=testing.balances_payload()['balances'][0])),
+    (schemas.get_open_orders_response_schema, testing.open_orders_payload(5)),
+    (schemas.get_open_order_response_schema,
+     dict(testing.open_orders_payload(1), order=testing.open_orders_payload(1)['orders'][0])),
+    (schemas.create_order_response_schema,
+     {"clOrderId": "BK11000000000001", "orderStatus": "New", "responseStatus": {"message": "OK"}}),
+    (schemas.cancel_open_order_response_schema, {"responseStatus": {"message": "OK"}}),
+    (schemas.cancel_all_open_orders_response_schema, {"responseStatus": {"message": "OK"}}),
+    (schemas.get_trade_history_response_schema, testing.trade_history_payload(20)),
+    (schemas.get_trade_history_response_schema, {
+        "responseStatus": {
+            "errorCode": "1001",
+            "message": "Invalid signature",
+            "errors": [{"errorCode": "1001", "fieldName": "signature", "message": "Invalid"}]
+        }
+    }),
+]
+
+
+def _both(schema, payload):
+    """Decode a payload with the compiled decoder and with marshmallow"""
+    fast = decoders.load(schema, copy.deepcopy(payload))
+    strict = decoders.load(schema, copy.deepcopy(payload), strict=True)
+    return fast, strict
+
+
+@pytest.mark.parametrize('schema,payload', PAYLOADS)
+def test_decoder_parity(schema, payload):
+    """Test compiled decoders build the same objects as marshmallow"""
+    assert (decoders.decoder_for(schema) is not None), 'Schema was not compiled'
+    (fast, fast_err), (strict, strict_err) = _both(schema, payload)
+
+    assert (not fast_err and not strict_err), 'Payload did not deserialize properly'
+    assert (type(fast) is type(strict)), 'Decoded types differ'
+    assert (repr(fast) == repr(strict)), 'Decoded objects differ'
+
+
+@pytest.mark.parametrize('field,value', [
+    ('price', None),
+    ('price', 'abc'),
+    ('transactionId', '12.5'),
+    ('currencyPair', 42),
+])
+def test_invalid_values_fall_back(field, value):
+    """Test payloads the decoders reject report marshmallow errors"""
+    payload = testing.recent_transactions_payload(3)
+    payload['transactions'][1][field] = value
+    (fast, fast_err), (strict, strict_err) = _both(
+        schemas.get_recent_transactions_response_schema, payload)
+
+    assert (strict_err), 'Marshmallow accepted an invalid value'
+    assert (fast_err == strict_err), 'Errors differ from marshmallow'
+
+
+def test_lenient_values_match():
+    """Test values marshmallow coerces are coerced identically"""
+    payload = testing.trade_history_payload(2)
+    payload['trades'][0].update({'price': '6500.5', 'transactionId': 7.0, 'feeRate': True})
+    (fast, _), (strict, _) = _both(schemas.get_trade_history_response_schema, payload)
+
+    assert (repr(fast) == repr(strict)), 'Coerced values differ'
+
+
+def test_timestamps_decode_to_aware_datetimes():
+    """Test epoch values decode straight to aware UTC datetimes"""
+    payload = testing.trade_history_payload(3)
+    payload['trades'][1]['transactionTime'] = payload['trades'][0]['transactionTime']
+    del payload['trades'][2]['transactionTime']
+    (fast, _), (strict, _) = _both(schemas.get_trade_history_response_schema, payload)
+
+    first, second, third = fast.trades
+    assert (first.transaction_time == datetime(2018, 8, 23, 4, 53, 20, tzinfo=timezone.utc)), \
+        'Transaction time did not deserialize properly'
+    assert (first.transaction_time is second.transaction_time), 'Equal timestamps were converted twice'
+    assert (third.transaction_time is None), 'Missing timestamp did not stay empty'
+    assert (repr(fast) == repr(strict)), 'Decoded objects differ'
+
+
+@pytest.mark.parametrize('strict', [False, True])
+def test_raw_timestamps(strict):
+    """Test raw timestamps keep epoch seconds with a lazy datetime"""
+    payload = testing.open_orders_payload(2)
+    obj, err = decoders.load(schemas.get_open_orders_response_schema, payload,
+                             strict=strict, raw_timestamps=True)
+
+    assert (not err), 'Payload did not deserialize properly'
+    date = obj.orders[0].date
+    assert (isinstance(date, EpochTime) and date == 1535000000.0), 'Raw timestamp was not kept'
+    assert (date.datetime == epoch_to_datetime(1535000000)), 'Lazy datetime is wrong'
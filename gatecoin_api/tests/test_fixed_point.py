@@ -0,0 +1,71 @@
+"""Test suite for fixed-point integer prices and quantities"""
+import json
+
+import pytest
+
+from gatecoin_api import FixedPoint, GatecoinAPI
+from gatecoin_api.types import Limit
+from gatecoin_api.testing import (StandInServer, currency_pairs_payload,
+                                  public_routes, trade_history_payload)
+
+
+def test_books_and_trades_decode_to_scaled_integers():
+    """Test prices use the decimal places of their pair and quantities eight"""
+    routes = public_routes(['BTCUSD', 'ETHBTC'], levels=20)
+    routes['v1/Trade/TradeHistory'] = trade_history_payload(10, ['BTCUSD', 'ETHBTC'])
+    with StandInServer(routes) as server:
+        api = GatecoinAPI(base_url=server.base_url, fixed_point=FixedPoint())
+        book = api.get_order_book('BTCUSD')
+        columns = api.get_market_depth('BTCUSD', columnar=True)
+        trades = api.get_trade_history().trades
+        streamed = list(api.iter_trade_history(chunk_size=256))
+        api.close()
+
+    payload = routes['v1/BTCUSD/OrderBook']
+    assert ([(limit.price, limit.volume) for limit in book.asks] ==
+            [(round(price * 10), round(volume * 1e8)) for price, volume in payload['asks']]), \
+        'Book levels were not scaled'
+    assert (sum(limit.volume for limit in book.asks) == int(columns.asks.volumes.sum())), \
+        'Columnar volumes differ'
+    assert (columns.bids[0].price == book.bids[0].price), 'Columnar prices differ'
+    assert (all(type(trade.price) is int for trade in trades)), 'Trade prices are not integers'
+    assert ([trade.price for trade in streamed] == [trade.price for trade in trades]), \
+        'Streamed trades differ'
+    assert (trades[1].price == round(routes['v1/Trade/TradeHistory']['trades'][1]['price'] * 1e5)), \
+        'Trade was not scaled by its own pair'
+    assert (sum(1 for request in server.requests if request[1] == 'v1/Reference/CurrencyPairs') == 1), \
+        'Currency pairs were downloaded more than once'
+
+
+def test_create_order_takes_fixed_point_values():
+    """Test fixed-point prices and amounts are sent with their exact decimals, plain ones unchanged"""
+    routes = {
+        'v1/Reference/CurrencyPairs': currency_pairs_payload(),
+        'POST v1/Trade/Orders': {'clOrderId': 'BK11', 'responseStatus': {'message': 'OK'}}
+    }
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url, fixed_point=FixedPoint())
+        api.create_order('ETHBTC', 'bid', fixed_price=3512345, fixed_amount=12345678)
+        api.create_order('BTCUSD', 'ask', 6500.5, 0.5)
+        api.create_order('BTCUSD', 'bid', 6500, 1)
+        with pytest.raises(ValueError):
+            api.create_order('BTCUSD', 'bid', 6500, fixed_price=65000)
+        with pytest.raises(ValueError):
+            api.create_order('XXXYYY', 'bid', fixed_price=65000, amount=1)
+        api.close()
+
+    bodies = [request[3].decode() for request in server.requests if request[0] == 'POST']
+    assert (len(bodies) == 3), 'Invalid orders were sent'
+    assert ('"Price": 35.12345, "Amount": 0.12345678' in bodies[0]), 'Fixed-point values were not sent'
+    assert (json.loads(bodies[1])['Price'] == 6500.5), 'Float prices were changed'
+    assert (json.loads(bodies[2])['Price'] == 6500 and json.loads(bodies[2])['Amount'] == 1), \
+        'Plain integers were read as fixed-point values'
+
+
+def test_unknown_scales_raise_value_errors():
+    """Test prices without a known pair scale raise a clear ValueError"""
+    fixed_point = FixedPoint({'BTCUSD': 1})
+    with pytest.raises(ValueError, match='XXXYYY'):
+        fixed_point.price_scale('XXXYYY')
+    with pytest.raises(ValueError):
+        fixed_point.convert_levels([Limit(6500.5, 1.0)], None)
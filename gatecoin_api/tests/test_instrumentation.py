@@ -0,0 +1,80 @@
+"""Test suite for latency instrumentation of API calls"""
+import pytest
+
+from gatecoin_api import GatecoinAPI, Instrumentation
+from gatecoin_api.instrumentation import Histogram, instrumented
+from gatecoin_api.testing import StandInServer, public_routes
+from gatecoin_api.types import ResponseStatusError
+
+
+def test_calls_are_timed_phase_by_phase():
+    """Test every phase of instrumented calls feeds the endpoint histograms"""
+    timings = []
+    instrumentation = Instrumentation(sinks=[timings.append])
+    with StandInServer(public_routes(['BTCUSD'], levels=50), latency=0.01) as server:
+        api = GatecoinAPI(base_url=server.base_url, instrumentation=instrumentation)
+        for _ in range(3):
+            api.get_order_book('BTCUSD')
+        api.get_market_depth('ETHBTC')
+        api.close()
+
+    snapshot = instrumentation.snapshot()
+    phases = snapshot['get_order_book']['phases']
+    assert (set(phases) == {'connect', 'ttfb', 'transfer', 'parse', 'decode', 'total'}), 'Phases are missing'
+    assert (phases['ttfb']['p50'] >= 0.01), 'Server latency was not attributed to the first byte'
+    assert (phases['connect']['max'] > 0 and phases['connect']['p50'] == 0.0), \
+        'Only the first call should open a connection'
+    assert (snapshot['get_order_book']['calls'] == 3 and snapshot['get_order_book']['errors'] == 0), \
+        'Calls were not counted'
+    assert (snapshot['get_market_depth']['errors'] == 1), 'Failed call was not counted'
+    assert ([timing.endpoint for timing in timings] == ['get_order_book'] * 3 + ['get_market_depth']), \
+        'Sinks were not called'
+
+    text = instrumentation.prometheus()
+    assert ('gatecoin_api_phase_seconds_count{endpoint="get_order_book",phase="decode"} 3' in text), \
+        'Histogram was not exported'
+    assert ('gatecoin_api_errors_total{endpoint="get_market_depth"} 1' in text), 'Errors were not exported'
+
+
+def test_histogram_percentiles():
+    """Test percentiles fall within the bucket of the ranked sample"""
+    histogram = Histogram()
+    for index in range(1, 1001):
+        histogram.add(index / 1000.0)
+
+    assert (abs(histogram.percentile(50) - 0.5) / 0.5 < 0.2), 'p50 is off'
+    assert (abs(histogram.percentile(99) - 0.99) / 0.99 < 0.2), 'p99 is off'
+    assert (histogram.percentile(99.9) <= histogram.max == 1.0), 'p999 exceeds the maximum'
+    assert (Histogram().percentile(50) is None), 'Empty histogram has a percentile'
+
+
+def test_disabled_instrumentation_calls_through():
+    """Test methods run untouched without an instrumentation"""
+    class Client:
+        instrumentation = None
+
+        @instrumented
+        def call(self, value):
+            return value
+
+    assert (Client().call(1) == 1), 'Call did not go through'
+
+
+def test_streamed_and_unpooled_calls():
+    """Test streamed calls are timed and unpooled calls report no connect phase"""
+    instrumentation = Instrumentation()
+    routes = public_routes(['BTCUSD'], levels=5)
+    with StandInServer(routes) as server:
+        api = GatecoinAPI(base_url=server.base_url, instrumentation=instrumentation, pooled=False)
+        transactions = list(api.iter_recent_transactions('BTCUSD', chunk_size=256))
+        with pytest.raises(ResponseStatusError):
+            list(api.iter_recent_transactions('XXXYYY'))
+        api.get_order_book('BTCUSD')
+
+    snapshot = instrumentation.snapshot()
+    assert (len(transactions) == len(routes['v1/Public/Transactions/BTCUSD']['transactions'])), \
+        'Streamed transactions are missing'
+    assert (snapshot['iter_recent_transactions']['calls'] == 2 and
+            snapshot['iter_recent_transactions']['errors'] == 1), 'Streamed calls were not counted'
+    assert (set(snapshot['iter_recent_transactions']['phases']) == {'total'}), 'Streamed calls were not timed'
+    assert ('connect' not in snapshot['get_order_book']['phases']), 'Unpooled call reported a connect phase'
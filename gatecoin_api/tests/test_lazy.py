@@ -0,0 +1,85 @@
+"""Test suite for lazy responses decoding their lists on access"""
+import pytest
+
+from gatecoin_api import FixedPoint, GatecoinAPI, decoders, schemas
+from gatecoin_api.lazy import LazyList, load_lazy
+from gatecoin_api.testing import (StandInServer, balances_payload,
+                                  currency_pairs_payload, market_depth_payload,
+                                  open_orders_payload, order_book_payload,
+                                  public_routes, trade_history_payload)
+
+
+@pytest.mark.parametrize('schema,payload', [
+    (schemas.get_order_book_response_schema, order_book_payload(200)),
+    (schemas.get_market_depth_response_schema, market_depth_payload(200))
+])
+def test_slicing_decodes_only_needed_items(schema, payload):
+    """Test only the envelope is decoded up front and slices decode their items"""
+    book, err = load_lazy(schema, payload)
+
+    assert (not err and isinstance(book.asks, LazyList) and len(book.asks) == 200), 'Lists are not lazy'
+    assert (book.asks.decoded == 0), 'Items were decoded up front'
+    top = book.asks[:5]
+    assert (book.asks.decoded == 5 and book.bids.decoded == 0), 'Slice decoded more than it needed'
+    assert (top[0] is book.asks[0] and book.asks[-1] is book.asks[199]), 'Decoded items were not kept'
+    assert (repr(book) == repr(decoders.load(schema, payload)[0])), 'Lazy decode differs'
+
+
+def test_invalid_items_raise_on_access():
+    """Test an item that does not decode raises when read, not before"""
+    payload = market_depth_payload(10)
+    payload['asks'][3]['price'] = 'not a price'
+    depth, err = load_lazy(schemas.get_market_depth_response_schema, payload)
+
+    assert (not err and depth.asks[2].price), 'Valid items do not decode'
+    with pytest.raises(ValueError):
+        depth.asks[3]  # pylint: disable=pointless-statement
+
+
+def test_lazy_api_responses():
+    """Test the lazy mode of the API decodes the same responses"""
+    routes = public_routes(['BTCUSD'], levels=20)
+    routes['v1/Balance/Balances'] = balances_payload()
+    with StandInServer(routes) as server:
+        responses = {}
+        for lazy in (True, False):
+            api = GatecoinAPI('private', 'public', base_url=server.base_url, lazy=lazy)
+            responses[lazy] = [api.get_order_book('BTCUSD'), api.get_recent_transactions('BTCUSD'),
+                               api.get_balance('ETH')]
+            api.close()
+
+    assert (isinstance(responses[True][1].transactions, LazyList)), 'Transactions are not lazy'
+    assert (repr(responses[True]) == repr(responses[False])), 'Lazy responses differ'
+
+
+def test_lazy_open_orders():
+    """Test lazy open orders responses decode and reconcile the order store"""
+    payload = open_orders_payload(5)
+    with StandInServer({'v1/Trade/Orders': payload}) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url, lazy=True)
+        response = api.get_open_orders()
+        api.close()
+
+    assert (isinstance(response.orders, LazyList) and len(response.orders) == 5), 'Orders are not lazy'
+    assert (response.orders[0].cl_order_id == payload['orders'][0]['clOrderId']), 'Orders do not decode'
+    assert (len(api.open_orders) == 5), 'Order store was not reconciled'
+
+
+def test_lazy_fixed_point_converts_items_on_access():
+    """Test fixed-point conversion of lazy lists waits for their items to be read"""
+    routes = {
+        'v1/Reference/CurrencyPairs': currency_pairs_payload(),
+        'v1/Trade/TradeHistory': trade_history_payload(50, ['BTCUSD', 'ETHBTC'])
+    }
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url, lazy=True, fixed_point=FixedPoint())
+        trades = api.get_trade_history().trades
+        untouched = trades.decoded
+        first, second = trades[0], trades[1]
+        api.close()
+
+    raw = routes['v1/Trade/TradeHistory']['trades']
+    assert (untouched == 0 and trades.decoded == 2), 'Items were decoded up front'
+    assert (first.price == round(raw[0]['price'] * 10)), 'Item was not converted with its pair'
+    assert (second.price == round(raw[1]['price'] * 1e5)), 'Item was not converted with its pair'
+    assert (trades[0].price == first.price), 'Item was converted twice'
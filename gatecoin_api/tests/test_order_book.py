@@ -0,0 +1,112 @@
+"""Test suite for the local incremental order book engine"""
+import sys
+import threading
+
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.constants import ASK
+from gatecoin_api.order_book import OrderBookEngine
+from gatecoin_api.testing import StandInServer
+from gatecoin_api.types import GetOrderBookResponse, Limit
+
+
+def _book(asks, bids) -> GetOrderBookResponse:
+    return GetOrderBookResponse([Limit(*level) for level in asks], [Limit(*level) for level in bids])
+
+
+@pytest.fixture
+def engine() -> OrderBookEngine:
+    """Fixture to return an engine holding one BTCUSD snapshot"""
+    engine = OrderBookEngine()
+    engine.apply('BTCUSD', _book([(101.0, 1.0), (102.0, 2.0), (103.0, 3.0)],
+                                 [(100.0, 1.5), (99.0, 2.5), (98.0, 0.5)]))
+    return engine
+
+
+def test_best_levels_and_queries(engine: OrderBookEngine):
+    """Test best levels, level lookups and cumulative depth"""
+    book = engine.book('BTCUSD')
+
+    assert (book.best_ask.price == 101.0 and book.best_bid.price == 100.0), 'Best levels are wrong'
+    assert (book.spread == 1.0), 'Spread is wrong'
+    assert (book.asks.rank(103.0) == 2 and book.bids.rank(98.0) == 2), 'Level ranks are wrong'
+    assert (book.asks.rank(104.0) == -1), 'Unknown level was found'
+    assert (book.asks.depth(102.0) == 3.0), 'Ask depth is wrong'
+    assert (book.bids.depth(99.0) == 4.0), 'Bid depth is wrong'
+    assert (book.asks.price_for_depth(3.5) == 103.0), 'Price for depth is wrong'
+    assert (book.bids.price_for_depth(10.0) is None), 'Thin side reached a price'
+
+
+def test_snapshot_diff_events(engine: OrderBookEngine):
+    """Test a new snapshot is applied as changed, added and removed levels"""
+    events = []
+    engine.subscribe(lambda pair, changes: events.append((pair, changes)))
+
+    changes = engine.apply('BTCUSD', _book([(100.5, 0.2), (101.0, 1.0), (102.0, 1.0)],
+                                           [(100.0, 1.5), (99.0, 2.5), (98.0, 0.5)]))
+    kinds = {(change.side, change.price): change.kind for change in changes}
+
+    assert (kinds == {(ASK, 100.5): 'added', (ASK, 102.0): 'changed', (ASK, 103.0): 'removed'}), \
+        'Level changes are wrong'
+    assert (events == [('BTCUSD', changes)]), 'Subscribers were not notified'
+
+    book = engine.book('BTCUSD')
+    assert ([limit.price for limit in book.asks] == [100.5, 101.0, 102.0]), 'Asks are not sorted'
+    assert (book.asks.depth(101.0) == 1.2), 'Depth was not rebuilt'
+    assert (book.bids.best().price == 100.0), 'Unchanged side was altered'
+
+
+def test_unchanged_snapshot(engine: OrderBookEngine):
+    """Test identical snapshots produce no events"""
+    events = []
+    engine.subscribe(lambda pair, changes: events.append(changes))
+    engine.apply('BTCUSD', _book([(101.0, 1.0), (102.0, 2.0), (103.0, 3.0)],
+                                 [(100.0, 1.5), (99.0, 2.5), (98.0, 0.5)]))
+
+    assert (not events), 'Unchanged snapshot notified subscribers'
+
+
+def test_failed_refresh_keeps_book(engine: OrderBookEngine):
+    """Test a failed order book call leaves the local book untouched"""
+    with StandInServer() as server:
+        api = GatecoinAPI(base_url=server.base_url)
+        changes = engine.refresh(api, 'BTCUSD')
+        api.close()
+
+    assert (changes is None), 'Failed call was applied'
+    assert (len(engine.book('BTCUSD').asks) == 3), 'Local book was cleared'
+
+
+def test_reads_during_applies_see_whole_snapshots():
+    """Test readers never see a side half way through a snapshot"""
+    engine = OrderBookEngine()
+    snapshots = [_book([(100.0 + offset + level, 1.0) for level in range(50)], [])
+                 for offset in range(0, 200, 3)]
+    errors = []
+
+    def read():
+        side = engine.book('BTCUSD').asks
+        for _ in range(2000):
+            try:
+                levels = list(side)
+                if levels and len(levels) != 50:
+                    errors.append(len(levels))
+                side.depth(150.0)
+                side.price_for_depth(10.0)
+            except Exception as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        reader = threading.Thread(target=read)
+        reader.start()
+        for _ in range(5):
+            for snapshot in snapshots:
+                engine.apply('BTCUSD', snapshot)
+        reader.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert (errors == []), 'Reads saw a half applied snapshot'
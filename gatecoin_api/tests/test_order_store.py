@@ -0,0 +1,79 @@
+"""Test suite for the local open order store"""
+import copy
+
+from gatecoin_api import GatecoinAPI, OpenOrderStore
+from gatecoin_api.schemas import get_open_orders_response_schema
+from gatecoin_api.testing import StandInServer, open_orders_payload
+from gatecoin_api.types import OpenOrder
+
+
+def test_reconcile_reports_changes_and_keeps_indexes():
+    """Test snapshots are diffed by cl_order_id and indexes follow them"""
+    now = [0.0]
+    store = OpenOrderStore(max_age=5.0, clock=lambda: now[0])
+    received = []
+    store.subscribe(received.append)
+    payload = open_orders_payload(6)
+    first, _ = get_open_orders_response_schema.load(copy.deepcopy(payload))
+
+    assert ([change.kind for change in store.reconcile(first, 0.0)] == ['added'] * 6), 'Orders were not added'
+    assert (store.fresh()), 'Store is not fresh after a snapshot'
+    assert (sorted(order.cl_order_id for order in store.by_pair('BTCUSD')) ==
+            sorted(order.cl_order_id for order in first.orders)), 'Pair index is wrong'
+
+    now[0] = 1.0
+    store.track(OpenOrder('ETHBTC', 'BKlocal', 1, 0.035, 2.0, 2.0))
+    payload['orders'][0]['remainingQuantity'] /= 2
+    del payload['orders'][1]
+    second, _ = get_open_orders_response_schema.load(payload)
+    changes = {change.cl_order_id: change.kind for change in store.reconcile(second, 0.5)}
+
+    assert (changes == {first.orders[0].cl_order_id: 'changed', first.orders[1].cl_order_id: 'removed'}), \
+        'Changes are wrong'
+    assert (store.get('BKlocal') is not None), 'Order tracked after the request was dropped'
+    assert ([order.cl_order_id for order in store.select('ETHBTC', 1)] == ['BKlocal']), 'Select is wrong'
+    assert (len(store.by_status(1)) == 5 and len(store) == 6), 'Status index is wrong'
+    assert (len(received) == 2), 'Subscribers were not called'
+
+    now[0] = 6.0
+    assert (not store.fresh()), 'Store stayed fresh'
+
+
+def test_api_answers_open_orders_locally():
+    """Test get_open_order is answered from the store while it is fresh"""
+    payload = open_orders_payload(3)
+    cl_order_id = payload['orders'][0]['clOrderId']
+    routes = {
+        'GET v1/Trade/Orders': payload,
+        'POST v1/Trade/Orders': {'clOrderId': 'BKnew', 'orderStatus': 'New', 'responseStatus': {'message': 'OK'}},
+        'DELETE v1/Trade/Orders/' + cl_order_id: {'responseStatus': {'message': 'OK'}}
+    }
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url, open_order_max_age=60.0)
+        api.get_open_orders()
+        local = api.get_open_order(cl_order_id)
+        api.create_order('BTCUSD', 'ask', 7000.0, 0.5)
+        created = api.get_open_order('BKnew')
+        api.cancel_order(cl_order_id)
+        api.close()
+
+    assert (local.order.cl_order_id == cl_order_id), 'Order was not found'
+    assert (created.order.side == 1 and created.order.remaining_quantity == 0.5), 'Placed order was not tracked'
+    assert ([request[0] for request in server.requests] == ['GET', 'POST', 'DELETE']), \
+        'Lookups were not answered locally'
+    assert (api.open_orders.get(cl_order_id) is None), 'Cancelled order was kept'
+
+
+def test_tracked_orders_are_bounded():
+    """Test nothing is tracked without max_age and tracked orders expire"""
+    now = [0.0]
+    disabled = OpenOrderStore()
+    store = OpenOrderStore(max_age=5.0, clock=lambda: now[0])
+    for index in range(10):
+        now[0] = float(index)
+        order = OpenOrder('BTCUSD', 'BK{0}'.format(index), 0, 6500.0, 0.1, 0.1)
+        disabled.track(order)
+        store.track(order)
+
+    assert (len(disabled) == 0), 'Orders were tracked without max_age'
+    assert (sorted(store.orders()) == ['BK4', 'BK5', 'BK6', 'BK7', 'BK8', 'BK9']), 'Old orders were kept'
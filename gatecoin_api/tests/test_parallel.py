@@ -0,0 +1,56 @@
+"""Test suite for decoding large lists over a process pool"""
+import copy
+
+from gatecoin_api import GatecoinAPI, ParallelDecoder, decoders, schemas
+from gatecoin_api.testing import (StandInServer, open_orders_payload,
+                                  trade_history_payload)
+
+
+def test_parallel_decode_matches_sequential():
+    """Test chunks decoded in workers are stitched back in order"""
+    routes = {'v1/Trade/TradeHistory': trade_history_payload(45)}
+    with StandInServer(routes) as server:
+        decoder = ParallelDecoder(threshold=10, chunk_size=7, max_workers=2)
+        api = GatecoinAPI('private', 'public', base_url=server.base_url, parallel_decoder=decoder)
+        parallel = api.get_trade_history()
+        api.close()
+
+    expected, _ = decoders.load(schemas.get_trade_history_response_schema, trade_history_payload(45))
+    assert (repr(parallel) == repr(expected)), 'Parallel decode differs'
+    assert (decoder._executor is None), 'Workers were not shut down'  # pylint: disable=protected-access
+
+
+def test_parallel_decode_falls_back_on_errors():
+    """Test invalid items are reported like a sequential decode would"""
+    decoder = ParallelDecoder(threshold=10, chunk_size=7, max_workers=2)
+    payload = trade_history_payload(30)
+    payload['trades'][20]['price'] = 'not a price'
+    try:
+        assert (decoder.handles(schemas.get_trade_history_response_schema, payload)), 'Payload is not handled'
+        obj, err = decoder.load(schemas.get_trade_history_response_schema, copy.deepcopy(payload))
+        start_method = decoder._executor._mp_context.get_start_method()  # pylint: disable=protected-access
+    finally:
+        decoder.close()
+
+    assert (err == decoders.load(schemas.get_trade_history_response_schema, payload)[1] and err), \
+        'Errors were not reported'
+    assert (start_method in ('forkserver', 'spawn')), 'Workers were forked'
+    assert (not decoder.handles(schemas.get_trade_history_response_schema, trade_history_payload(5))), \
+        'Small payload was handled'
+    assert (not ParallelDecoder(threshold=10, max_workers=1).handles(
+        schemas.get_trade_history_response_schema, payload)), 'Single worker pool was used'
+
+
+def test_parallel_decode_open_orders():
+    """Test open orders responses are decoded over the pool like trades"""
+    routes = {'v1/Trade/Orders': open_orders_payload(25)}
+    with StandInServer(routes) as server:
+        decoder = ParallelDecoder(threshold=10, chunk_size=7, max_workers=2)
+        api = GatecoinAPI('private', 'public', base_url=server.base_url, parallel_decoder=decoder)
+        parallel = api.get_open_orders()
+        api.close()
+
+    expected, _ = decoders.load(schemas.get_open_orders_response_schema, open_orders_payload(25))
+    assert (decoder.handles(schemas.get_open_orders_response_schema, open_orders_payload(25))), \
+        'Open orders are not handled'
+    assert (repr(parallel) == repr(expected) and len(parallel.orders) == 25), 'Parallel decode differs'
@@ -0,0 +1,120 @@
+"""Test poller"""
+import itertools
+import threading
+
+from gatecoin_api import GatecoinAPI, Poller, RateLimiter, schemas
+from gatecoin_api.lazy import load_lazy
+from gatecoin_api.poller import TOP_LEVELS, top_of_response
+from gatecoin_api.testing import (StandInServer, market_depth_payload,
+                                  recent_transactions_payload)
+
+
+def test_poller_adapts_intervals_to_changes():
+    """Test changing pairs are polled faster than static ones and published"""
+    seeds = itertools.count()
+    routes = {
+        'GET v1/Public/MarketDepth/BTCUSD': lambda method, command, body: market_depth_payload(5, next(seeds)),
+        'GET v1/Public/MarketDepth/ETHBTC': market_depth_payload(5)
+    }
+    published = []
+    done = threading.Event()
+
+    def collect(snapshot):
+        published.append(snapshot)
+        if len([item for item in published if item.currency_pair == 'BTCUSD']) >= 6:
+            done.set()
+
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        poller = Poller(api, ['BTCUSD', 'ETHBTC'], min_interval=0.01, max_interval=1.0, max_workers=2)
+        poller.subscribe(collect)
+        with poller:
+            done.wait(5.0)
+        api.close()
+
+    static = [item for item in published if item.currency_pair == 'ETHBTC']
+    assert (done.is_set()), 'Changing pair was not published'
+    assert (len(static) == 1 and static[0].changed), 'Unchanged snapshots were published'
+    assert (poller.intervals['BTCUSD'] == 0.01), 'Changing pair was slowed down'
+    assert (poller.intervals['ETHBTC'] > 0.01), 'Static pair was not slowed down'
+    assert (poller.polls['BTCUSD'] > poller.polls['ETHBTC']), 'Static pair was polled as often'
+    assert (poller.stats()['errors'] == 0), 'Polls failed'
+
+
+def test_poller_queue_drops_oldest():
+    """Test a full queue drops its oldest snapshot"""
+    seeds = itertools.count()
+    routes = {'GET v1/Public/MarketDepth/BTCUSD': lambda method, command, body: market_depth_payload(5, next(seeds))}
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        poller = Poller(api, ['BTCUSD'], min_interval=0.01, queue_size=2)
+        with poller:
+            first = poller.get(timeout=5.0)
+            while poller.dropped < 3:
+                threading.Event().wait(0.01)
+        api.close()
+
+    assert (first.currency_pair == 'BTCUSD' and first.response.asks), 'Snapshot was not queued'
+    assert (len(poller.queue) == 2), 'Queue outgrew its size'
+    assert (poller.queue[0].received <= poller.queue[1].received), 'Queue is out of order'
+    assert (poller.get(timeout=0) is not None and len(poller.queue) == 1), 'Queue was not drained'
+
+
+def test_poller_intervals_fit_rate_budget():
+    """Test intervals are stretched to the share of the rate budget"""
+    api = GatecoinAPI('private', 'public', rate_limiter=RateLimiter(rate=4.0))
+    poller = Poller(api, ['BTCUSD', 'BTCEUR', 'ETHBTC', 'ETHUSD'], min_interval=0.5)
+    bounded = Poller(api, ['BTCUSD'], min_interval=1.0, max_rate=4.0)
+
+    assert (poller.budget() == 2.0), 'Budget is not the share of the rate'
+    assert (poller.interval('BTCUSD') == 2.0), 'Intervals were not stretched to the budget'
+    assert (bounded.interval('BTCUSD') == 1.0), 'Intervals within budget were stretched'
+
+
+def test_default_fingerprint_reads_only_top_items():
+    """Test the default fingerprint tells changes from the top of a response without decoding it all"""
+    depth, _ = load_lazy(schemas.get_market_depth_response_schema, market_depth_payload(200))
+    fingerprint = top_of_response(depth)
+    transactions, _ = load_lazy(schemas.get_recent_transactions_response_schema, recent_transactions_payload(100))
+    other, _ = load_lazy(schemas.get_market_depth_response_schema, market_depth_payload(200, seed=1))
+
+    assert (depth.asks.decoded == TOP_LEVELS and depth.bids.decoded == TOP_LEVELS), 'Whole book was decoded'
+    assert (fingerprint == top_of_response(depth)), 'Fingerprint is not stable'
+    assert (top_of_response(other) != fingerprint), 'Changed book has the same fingerprint'
+    top_of_response(transactions)
+    assert (transactions.transactions.decoded == 2), 'Whole transactions list was decoded'
+
+
+def test_failed_order_book_polls_are_errors():
+    """Test order book error bodies, which carry no status, count as failed polls"""
+    published = []
+    with StandInServer() as server:
+        api = GatecoinAPI(base_url=server.base_url)
+        poller = Poller(api, ['BTCUSD'], endpoint='get_order_book', min_interval=0.01)
+        poller.subscribe(published.append)
+        with poller:
+            while not poller.errors['BTCUSD']:
+                threading.Event().wait(0.01)
+        api.close()
+
+    assert (published == [] and poller.stats()['changes'] == 0), 'Error body was published'
+    assert (poller.intervals['BTCUSD'] > 0.01), 'Failed poll did not back off'
+
+
+def test_raising_fingerprints_are_failed_polls():
+    """Test a response failing to decode counts as a failed poll and the pair keeps being polled"""
+    payload = market_depth_payload(5)
+    payload['asks'][0]['price'] = 'not a price'
+    with StandInServer({'GET v1/Public/MarketDepth/BTCUSD': payload}) as server:
+        api = GatecoinAPI(base_url=server.base_url, lazy=True)
+        poller = Poller(api, ['BTCUSD'], min_interval=0.01, max_interval=0.02)
+        with poller:
+            for _ in range(500):
+                if poller.errors['BTCUSD'] >= 3:
+                    break
+                threading.Event().wait(0.01)
+        api.close()
+
+    assert (poller.errors['BTCUSD'] >= 3), 'Raising poll was not counted as an error'
+    assert (poller.stats()['changes'] == 0), 'Undecodable response was counted as a change'
+    assert (poller.polls['BTCUSD'] >= 3), 'Pair was not rescheduled after a raising poll'
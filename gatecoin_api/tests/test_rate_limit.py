@@ -0,0 +1,52 @@
+"""Test suite for the client-side priority rate limiter"""
+import threading
+import time
+
+from gatecoin_api import GatecoinAPI, RateLimiter
+from gatecoin_api.constants import Priority
+from gatecoin_api.testing import StandInServer, public_routes
+
+
+def test_waiting_requests_are_granted_by_priority():
+    """Test cancels overtake queued polls once the bucket is empty"""
+    limiter = RateLimiter(rate=10.0, burst=1)
+    limiter.acquire(Priority.PUBLIC)
+
+    granted = []
+    threads = []
+    for priority in (Priority.PUBLIC, Priority.PRIVATE, Priority.CREATE, Priority.CANCEL):
+        thread = threading.Thread(target=lambda p=priority: granted.append(limiter.acquire(p) and p))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert (granted == [Priority.CANCEL, Priority.CREATE, Priority.PRIVATE, Priority.PUBLIC]), \
+        'Requests were not granted by priority'
+    metrics = limiter.metrics()
+    assert (metrics['public']['granted'] == 2 and metrics['public']['max_queued'] == 1), 'Metrics are wrong'
+    assert (metrics['public']['max_wait'] >= 0.3), 'Public wait time was not recorded'
+
+
+def test_low_priority_requests_are_shed():
+    """Test polls are shed past the wait bound while cancels still queue"""
+    limiter = RateLimiter(rate=10.0, burst=1, max_wait=0.05)
+    assert (limiter.acquire(Priority.PUBLIC)), 'Available token was not granted'
+
+    assert (not limiter.acquire(Priority.PUBLIC)), 'Poll was not shed'
+    assert (limiter.acquire(Priority.CANCEL)), 'Cancel was shed'
+    assert (limiter.metrics()['public']['shed'] == 1), 'Shed request was not counted'
+
+
+def test_shed_calls_fail_without_a_request():
+    """Test the API returns a failed response for shed calls"""
+    with StandInServer(public_routes(levels=5)) as server:
+        api = GatecoinAPI(base_url=server.base_url,
+                          rate_limiter=RateLimiter(rate=1.0, burst=1, max_wait=0.1))
+        assert (api.get_market_depth('BTCUSD').response_status.message == 'OK'), 'First call failed'
+        response = api.get_market_depth('BTCUSD')
+        api.close()
+
+    assert (response.response_status.error_code == '429'), 'Shed call did not fail'
+    assert (len(server.requests) == 1), 'Shed call reached the server'
@@ -0,0 +1,96 @@
+"""Test suite for request templates and the order body builder"""
+import json
+
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.api import BaseGatecoinAPI
+from gatecoin_api.constants import HTTPMethod
+from gatecoin_api.json_codec import ORJSON, STDLIB, get_codec
+from gatecoin_api.request import Request, RequestTemplate, order_body
+from gatecoin_api.testing import StandInServer, balances_payload, public_routes
+
+
+@pytest.mark.parametrize('command,http_method', [
+    ('v1/Trade/Orders', HTTPMethod.POST),
+    ('v1/Trade/Orders/BK11000000000001', HTTPMethod.DELETE),
+    ('v1/Balance/Balances', HTTPMethod.GET)
+])
+def test_template_signs_like_request(command: str, http_method: HTTPMethod):
+    """Test templates produce the headers of a freshly built request"""
+    request = Request('private', 'public', command, http_method, base_url='https://api.example/')
+    template = RequestTemplate('private', 'public', command, http_method, 'https://api.example/')
+
+    for timestamp in ('1535000000.123', '1535000001.000'):
+        assert (template.signed_headers(timestamp) == request.signed_headers(timestamp)), \
+            'Template headers differ'
+    assert ('API_REQUEST_DATE' not in template.static_headers), 'Static headers were modified'
+    assert (RequestTemplate(None, None, command, http_method).message_signature('1.000') == ''), \
+        'Unsigned template signed'
+
+
+@pytest.mark.parametrize('args', [
+    ('BTCUSD', 'bid', 6500.5, 0.1),
+    ('ETHBTC', 'ask', 7, None, 2.5e-05, 'client-é"1', 'code'),
+    ('BTCUSD', 'bid', 0.1 + 0.2, 3, None, None, None),
+    ('BTCUSD', 'bid', float('nan'), 1.0)
+])
+def test_order_body_matches_json_dumps(args: tuple):
+    """Test the order body is the JSON encoding of the order parameters"""
+    assert (order_body(*args) == json.dumps(BaseGatecoinAPI._create_order_params(*args))), \
+        'Order body differs'
+
+
+def test_create_order_sends_signed_body():
+    """Test create_order sends the built body with a valid signature"""
+    with StandInServer({'POST v1/Trade/Orders': {'clOrderId': 'BK11', 'responseStatus': {'message': 'OK'}}}) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        response = api.create_order('BTCUSD', 'bid', 6500.0, 0.5, external_order_id='mine')
+        api.close()
+
+    _, command, headers, body = server.requests[0]
+    request = Request('private', 'public', command, HTTPMethod.POST, base_url=server.base_url)
+    assert (response.cl_order_id == 'BK11'), 'Order was not placed'
+    assert (json.loads(body) == {'Code': 'BTCUSD', 'Way': 'bid', 'Price': 6500.0, 'Amount': 0.5,
+                                 'ExternalOrderId': 'mine'}), 'Order body is wrong'
+    assert (headers['API_REQUEST_SIGNATURE'] ==
+            request.message_signature(headers['API_REQUEST_DATE'])), 'Signature is wrong'
+
+
+@pytest.mark.parametrize('json_codec', ['json', 'auto', pytest.param('orjson', marks=pytest.mark.skipif(
+    ORJSON is None, reason='orjson is not installed'))])
+def test_codecs_decode_the_same_responses(json_codec: str):
+    """Test every codec sends the same requests and decodes the same responses"""
+    routes = public_routes(['BTCUSD'], levels=20)
+    routes['v1/Balance/Balances'] = balances_payload()
+    routes['DELETE v1/Trade/Orders'] = {'responseStatus': {'message': 'OK'}}
+    with StandInServer(routes) as server:
+        decoded = {}
+        for codec in (None, json_codec):
+            api = GatecoinAPI('private', 'public', base_url=server.base_url, json_codec=codec)
+            decoded[codec] = repr([api.get_order_book('BTCUSD'), api.get_recent_transactions('BTCUSD'),
+                                   api.get_balances(), api.cancel_all_orders()])
+            api.close()
+
+    assert (api.json_codec is get_codec(json_codec)), 'Codec was not selected'
+    assert (decoded[json_codec] == decoded[None]), 'Codecs decoded differently'
+    assert (all(body == b'' for _, _, _, body in server.requests)), \
+        'Requests without parameters carried a body'
+
+
+def test_unknown_codec_is_refused():
+    """Test an unknown codec name raises instead of falling back"""
+    assert (get_codec() is STDLIB), 'The standard library is not the default'
+    with pytest.raises(ValueError):
+        GatecoinAPI(json_codec='simplejson')
+
+
+def test_request_body_is_skipped_without_parameters():
+    """Test GET and DELETE requests without parameters serialize no body"""
+    assert (Request('private', 'public', 'v1/Trade/TradeHistory').body() is None), 'GET request has a body'
+    assert (Request('private', 'public', 'v1/Trade/Orders', HTTPMethod.DELETE).body() is None), \
+        'DELETE request has a body'
+    assert (Request('private', 'public', 'v1/Trade/Orders', HTTPMethod.POST).body() == '{}'), \
+        'POST request lost its empty body'
+    assert (Request('private', 'public', 'v1/Trade/Orders', HTTPMethod.POST, {'Code': 'BTCUSD'}).body() ==
+            '{"Code": "BTCUSD"}'), 'Parameters were not serialized'
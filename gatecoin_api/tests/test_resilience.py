@@ -0,0 +1,139 @@
+"""Test suite for retries, hedged requests and circuit breakers"""
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from gatecoin_api import GatecoinAPI, Resilience
+from gatecoin_api.testing import StandInServer, market_depth_payload, public_routes
+
+
+def _flaky(failures: int):
+    """Route failing with a bare 503 the first `failures` times"""
+    calls = itertools.count()
+
+    def route(method, command, body):
+        if next(calls) < failures:
+            return 503, b'Service Unavailable'
+        return market_depth_payload(5)
+    return route
+
+
+def test_idempotent_calls_are_retried():
+    """Test GET calls are retried after error statuses"""
+    with StandInServer({'v1/Public/MarketDepth/BTCUSD': _flaky(2)}) as server:
+        resilience = Resilience(attempts=3, sleep=lambda delay: None)
+        api = GatecoinAPI(base_url=server.base_url, resilience=resilience)
+        response = api.get_market_depth('BTCUSD')
+        api.close()
+
+    assert (response.response_status.message == 'OK'), 'Retried call failed'
+    assert (len(server.requests) == 3 and resilience.retries == 2), 'Call was not retried twice'
+
+
+def test_server_errors_with_json_bodies_are_retried():
+    """Test 5xx and 429 statuses are failures whatever their body, unlike JSON 4xx bodies"""
+    calls = itertools.count()
+
+    def route(method, command, body):
+        call = next(calls)
+        if call == 0:
+            return 500, b'{"message": "Internal error"}'
+        if call == 1:
+            return 429, b'{"message": "Too many requests"}'
+        return market_depth_payload(5)
+
+    routes = {
+        'v1/Public/MarketDepth/BTCUSD': route,
+        'v1/Public/MarketDepth/ETHBTC': (400, b'{"responseStatus": {"errorCode": "1005", "message": "Bad pair"}}')
+    }
+    with StandInServer(routes) as server:
+        resilience = Resilience(attempts=3, sleep=lambda delay: None)
+        api = GatecoinAPI(base_url=server.base_url, resilience=resilience)
+        response = api.get_market_depth('BTCUSD')
+        rejected = api.get_market_depth('ETHBTC')
+        api.close()
+
+    assert (response.response_status.message == 'OK'), 'Retried call failed'
+    assert (resilience.retries == 2), 'Server errors with JSON bodies were not retried'
+    assert (rejected.response_status.error_code == '1005' and resilience.retries == 2), \
+        'Client error body was not returned as a response'
+
+
+def test_orders_are_never_retried():
+    """Test create_order is sent once even when it fails"""
+    routes = {'POST v1/Trade/Orders': (503, b'Service Unavailable')}
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url,
+                          resilience=Resilience(sleep=lambda delay: None))
+        with pytest.raises(requests.HTTPError):
+            api.create_order('BTCUSD', 'bid', 6500.0, 0.1)
+        api.close()
+
+    assert (len(server.requests) == 1), 'Order was sent more than once'
+
+
+def test_circuit_opens_and_recovers():
+    """Test the circuit opens after failures and closes after a successful trial"""
+    now = [0.0]
+    with StandInServer({'v1/Public/MarketDepth/BTCUSD': _flaky(2)}) as server:
+        resilience = Resilience(attempts=1, failure_threshold=2, reset_timeout=10.0,
+                                clock=lambda: now[0])
+        api = GatecoinAPI(base_url=server.base_url, resilience=resilience)
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                api.get_market_depth('BTCUSD')
+
+        assert (api.get_market_depth('BTCUSD').response_status.error_code == '503'), 'Open circuit sent the call'
+        assert (len(server.requests) == 2), 'Open circuit reached the server'
+
+        now[0] = 10.0
+        assert (api.get_market_depth('BTCUSD').response_status.message == 'OK'), 'Trial call failed'
+        assert (resilience.stats()['circuits'] == {'GET v1/Public/MarketDepth/BTCUSD': 'closed'}), \
+            'Circuit did not close'
+        api.close()
+
+
+def test_slow_calls_are_hedged():
+    """Test a call slower than the latency percentile is duplicated and the first answer wins"""
+    calls = itertools.count()
+
+    def route(method, command, body):
+        if next(calls) == 5:
+            time.sleep(1.0)
+        return market_depth_payload(5)
+
+    with StandInServer({'v1/Public/MarketDepth/BTCUSD': route}) as server:
+        resilience = Resilience(hedge_percentile=90, hedge_min_samples=5)
+        api = GatecoinAPI(base_url=server.base_url, resilience=resilience)
+        for _ in range(5):
+            api.get_market_depth('BTCUSD')
+
+        start = time.perf_counter()
+        response = api.get_market_depth('BTCUSD')
+        elapsed = time.perf_counter() - start
+        api.close()
+
+    assert (response.response_status.message == 'OK'), 'Hedged call failed'
+    assert (resilience.hedges == 1 and resilience.hedge_wins == 1), 'Slow call was not hedged'
+    assert (elapsed < 0.5), 'Hedged call waited for the slow answer'
+
+
+def test_hedged_calls_are_not_capped_by_hedge_workers():
+    """Test concurrent hedged calls run at once whatever the number of hedging threads"""
+    with StandInServer(public_routes(levels=5), latency=0.05) as server:
+        resilience = Resilience(hedge_percentile=100, hedge_min_samples=3, hedge_workers=1)
+        api = GatecoinAPI(base_url=server.base_url, resilience=resilience)
+        for _ in range(3):
+            api.get_market_depth('BTCUSD')
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(6) as executor:
+            responses = list(executor.map(api.get_market_depth, ['BTCUSD'] * 6))
+        elapsed = time.perf_counter() - start
+        api.close()
+
+    assert (all(response.response_status.message == 'OK' for response in responses)), 'Hedged calls failed'
+    assert (elapsed < 0.25), 'Primary requests queued for the hedging threads'
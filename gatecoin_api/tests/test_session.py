@@ -0,0 +1,73 @@
+"""Test suite for pooled keep-alive sessions against a local stand-in"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, public_routes
+
+
+@pytest.fixture
+def server() -> StandInServer:
+    """Fixture to serve public commands from a local stand-in"""
+    with StandInServer(public_routes(levels=5)) as standin:
+        yield standin
+
+
+def test_pooled_requests_reuse_connection(server: StandInServer):
+    """Test sequential requests share one kept-alive connection"""
+    api = GatecoinAPI(base_url=server.base_url)
+    for _ in range(5):
+        response = api.get_market_depth('BTCUSD')
+        assert (response.response_status.message == 'OK'), 'API response not successful'
+    api.close()
+
+    assert (server.connections == 1), 'Pooled requests did not reuse the connection'
+
+
+def test_unpooled_requests_open_connections(server: StandInServer):
+    """Test unpooled requests open a new connection per call"""
+    api = GatecoinAPI(base_url=server.base_url, pooled=False)
+    for _ in range(3):
+        api.get_order_book('BTCUSD')
+
+    assert (server.connections == 3), 'Unpooled requests reused a connection'
+
+
+def test_idle_connections_expire(server: StandInServer):
+    """Test connections idle past the keep-alive timeout are reopened"""
+    api = GatecoinAPI(base_url=server.base_url, keep_alive_timeout=0.05)
+    api.get_market_depth('BTCUSD')
+    time.sleep(0.1)
+    api.get_market_depth('BTCUSD')
+    api.close()
+
+    assert (server.connections == 2), 'Idle connection was not expired'
+
+
+def test_connections_per_host_are_capped():
+    """Test concurrent requests beyond the per host maximum wait for a connection"""
+    with StandInServer(public_routes(levels=5), latency=0.05) as server:
+        api = GatecoinAPI(base_url=server.base_url, max_connections_per_host=2)
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(api.get_market_depth, ['BTCUSD'] * 8))
+        api.close()
+
+    assert (all(response.response_status.message == 'OK' for response in responses)), 'Requests failed'
+    assert (server.connections == 2), 'More connections than the maximum were opened'
+
+
+def test_connections_are_kept_while_requests_are_in_flight():
+    """Test a pool busy with slow requests is not idle, however long they take"""
+    with StandInServer(public_routes(levels=5), latency=0.2) as server:
+        api = GatecoinAPI(base_url=server.base_url, keep_alive_timeout=0.1)
+        with ThreadPoolExecutor(2) as executor:
+            slow = executor.submit(api.get_market_depth, 'BTCUSD')
+            time.sleep(0.15)
+            api.get_market_depth('BTCUSD')
+            slow.result()
+        api.get_market_depth('BTCUSD')
+        api.close()
+
+    assert (server.connections == 2), 'Connections were dropped while in use'
@@ -0,0 +1,41 @@
+"""Test suite for coalescing identical in-flight calls"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.single_flight import SingleFlight
+from gatecoin_api.testing import StandInServer, public_routes
+
+
+def test_concurrent_identical_calls_share_one_request():
+    """Test identical concurrent GETs make one request and share its response"""
+    with StandInServer(public_routes(levels=5), latency=0.2) as server:
+        api = GatecoinAPI(base_url=server.base_url, coalesce=True)
+        with ThreadPoolExecutor(8) as executor:
+            depths = list(executor.map(lambda _: api.get_market_depth('BTCUSD'), range(8)))
+            books = list(executor.map(
+                lambda index: api.get_order_book('BTCUSD' if index % 2 else 'ETHBTC'), range(8)))
+        api.close()
+
+    assert (all(depth is depths[0] for depth in depths)), 'Callers did not share the response'
+    assert (len(server.requests) == 3), 'Identical calls were not coalesced'
+    assert (books[0] is not books[1]), 'Different pairs were coalesced'
+    assert (api.single_flight.coalesced['get_market_depth'] == 7), 'Coalesced calls were not counted'
+    assert (api.single_flight.stats() == {'calls': 3, 'coalesced': 13}), 'Counters are wrong'
+
+
+def test_errors_reach_every_waiting_caller():
+    """Test the error of a coalesced call is raised to every caller"""
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ValueError('failed')
+
+    def call(_):
+        with pytest.raises(ValueError):
+            single_flight.do(('endpoint',), fail)
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(call, range(4)))
+    assert (sum(single_flight.stats().values()) == 4), 'Calls were not counted'
@@ -0,0 +1,49 @@
+"""Test suite for streamed decoding of trade lists"""
+import json
+
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.streaming import iter_items
+from gatecoin_api.types import ResponseStatusError
+from gatecoin_api.testing import StandInServer, recent_transactions_payload, trade_history_payload
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_items_parse_across_chunk_boundaries(chunk_size: int):
+    """Test list items are parsed whatever the chunk boundaries"""
+    payload = {'count': 12345, 'trades': trade_history_payload(20)['trades'], 'responseStatus': {'message': 'OK'}}
+    body = json.dumps(payload).encode()
+    chunks = [body[start:start + chunk_size] for start in range(0, len(body), chunk_size)]
+
+    assert (list(iter_items(chunks, 'trades')) == payload['trades']), 'Streamed items differ'
+
+
+def test_iterators_match_full_decode():
+    """Test streamed trades decode to the same objects as the full responses"""
+    routes = {
+        'v1/Trade/TradeHistory': trade_history_payload(500),
+        'v1/Public/Transactions/BTCUSD': recent_transactions_payload(300)
+    }
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        trades = list(api.iter_trade_history(chunk_size=1024))
+        history = api.get_trade_history()
+        transactions = list(api.iter_recent_transactions('BTCUSD', chunk_size=1024))
+        recent = api.get_recent_transactions('BTCUSD')
+        api.close()
+
+    assert (repr(trades) == repr(history.trades)), 'Streamed trades differ'
+    assert (repr(transactions) == repr(recent.transactions)), 'Streamed transactions differ'
+    assert (all(request[3] == b'' for request in server.requests)), 'GET requests were sent a body'
+
+
+def test_error_response_raises():
+    """Test an error status is raised rather than read as an empty list"""
+    with StandInServer() as server:
+        api = GatecoinAPI(base_url=server.base_url)
+        with pytest.raises(ResponseStatusError) as raised:
+            list(api.iter_recent_transactions('XXXYYY'))
+        api.close()
+
+    assert (raised.value.response_status.error_code == '404'), 'Error status was not decoded'
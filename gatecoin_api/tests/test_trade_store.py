@@ -0,0 +1,71 @@
+"""Test suite for the local trade history store"""
+from datetime import datetime, timezone
+
+import pytest
+
+from gatecoin_api import GatecoinAPI
+from gatecoin_api.testing import StandInServer, trade_history_payload
+from gatecoin_api.trade_store import TradeStore
+from gatecoin_api.types import ResponseStatusError
+
+
+@pytest.fixture
+def store() -> TradeStore:
+    """Fixture to return a store synced with a 100 trade history"""
+    store = TradeStore()
+    with StandInServer({'v1/Trade/TradeHistory': trade_history_payload(100)}) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        assert (store.sync(api) == 100), 'Trades were not all inserted'
+        assert (store.sync(api) == 0), 'Known trades were inserted again'
+        api.close()
+    yield store
+    store.close()
+
+
+def test_sync_round_trips_trades(store: TradeStore):
+    """Test stored trades read back like the decoded ones"""
+    trade = store.get(10000042)
+    history = {item['transactionId']: item for item in trade_history_payload(100)['trades']}
+
+    assert (len(store) == 100 and store.last_transaction_id() == 10000099), 'Store size is wrong'
+    assert (trade.currency_pair == history[10000042]['currencyPair']), 'Trade was not stored'
+    assert (trade.transaction_time == datetime.fromtimestamp(1535000000 + 42 * 7, timezone.utc)), \
+        'Trade time did not round trip'
+
+
+def test_local_queries(store: TradeStore):
+    """Test queries by pair, time range and order id"""
+    start = datetime.fromtimestamp(1535000000 + 10 * 7, timezone.utc)
+    end = 1535000000 + 20 * 7
+
+    assert (len(store.by_pair('BTCUSD')) == 50), 'Pair query is wrong'
+    assert ([trade.transaction_id for trade in store.by_pair('ETHBTC', start, end)] ==
+            list(range(10000011, 10000020, 2))), 'Pair and time query is wrong'
+    assert (len(store.between(start, end)) == 10), 'Time range query is wrong'
+    assert (len(store.by_pair('BTCUSD', limit=3)) == 3), 'Limit was ignored'
+
+    trade = store.get(10000007)
+    assert ([t.transaction_id for t in store.by_order(trade.ask_order_id)] == [10000007]), \
+        'Order query is wrong'
+
+
+def test_sync_decodes_only_unseen_trades(store: TradeStore):
+    """Test stored trades are skipped before decoding and failed syncs raise"""
+    decoded = []
+    routes = {'v1/Trade/TradeHistory': trade_history_payload(120)}
+    with StandInServer(routes) as server:
+        api = GatecoinAPI('private', 'public', base_url=server.base_url)
+        load = api._load  # pylint: disable=protected-access
+
+        def counting_load(schema, item):
+            decoded.append(item)
+            return load(schema, item)
+        api._load = counting_load  # pylint: disable=protected-access
+        added = store.sync(api)
+        routes['v1/Trade/TradeHistory'] = {'responseStatus': {'errorCode': '1001', 'message': 'Invalid signature'}}
+        with pytest.raises(ResponseStatusError):
+            store.sync(api)
+        api.close()
+
+    assert (added == 20 and len(store) == 120), 'Unseen trades were not inserted'
+    assert (len(decoded) == 20), 'Stored trades were decoded again'
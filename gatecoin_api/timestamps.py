@@ -0,0 +1,41 @@
+"""Conversion of the unix timestamps found in API responses"""
+from datetime import datetime, timezone
+from itertools import repeat
+from typing import List
+
+UTC = timezone.utc
+
+
+def epoch_to_datetime(value) -> datetime:
+    """Convert one epoch value, number or numeric string, to an aware datetime"""
+    return datetime.fromtimestamp(float(value), UTC)
+
+
+def epochs_to_datetimes(values: List[float]) -> List[datetime]:
+    """Convert a whole list of epoch values to aware datetimes in one pass
+
+    Trades filled by the same order share their timestamp, so every distinct
+    value is converted only once and the datetimes are shared between the
+    items that carry it.
+    """
+    distinct = dict.fromkeys(values)
+    for value, moment in zip(distinct, map(datetime.fromtimestamp, map(float, distinct), repeat(UTC))):
+        distinct[value] = moment
+    return list(map(distinct.__getitem__, values))
+
+
+class EpochTime(float):
+    """Raw epoch seconds keeping the aware datetime one attribute away
+
+    Decoding with raw timestamps stores these instead of datetimes, so long
+    trade lists skip the datetime construction that dominates their decode
+    time. The datetime is only computed, once, when `datetime` is read.
+    """
+
+    @property
+    def datetime(self) -> datetime:
+        """Aware UTC datetime of the timestamp"""
+        moment = self.__dict__.get('datetime')
+        if moment is None:
+            moment = self.__dict__['datetime'] = datetime.fromtimestamp(self, UTC)
+        return moment
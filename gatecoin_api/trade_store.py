@@ -0,0 +1,158 @@
+"""Local SQLite store of the trade history kept in sync with the API
+
+Reconciliation jobs read the trade history far more often than new trades
+arrive. A `TradeStore` persists `TraderTransaction` rows in SQLite, indexed
+by transaction id, currency pair, time and order ids. `sync` streams the
+history, skips the trades already stored before decoding them and inserts
+the others, and the queries answer from the local database without
+touching the network.
+"""
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Set, Union
+
+from .timestamps import epoch_to_datetime
+from .types import TraderTransaction
+
+_COLUMNS = TraderTransaction.__slots__
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS trades (
+    transaction_id INTEGER PRIMARY KEY,
+    transaction_time REAL,
+    ask_order_id TEXT,
+    bid_order_id TEXT,
+    price REAL,
+    quantity REAL,
+    currency_pair TEXT,
+    way TEXT,
+    fee_roll TEXT,
+    fee_rate REAL,
+    fee_amount REAL
+);
+CREATE INDEX IF NOT EXISTS trades_pair_time ON trades (currency_pair, transaction_time);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (transaction_time);
+CREATE INDEX IF NOT EXISTS trades_ask_order ON trades (ask_order_id);
+CREATE INDEX IF NOT EXISTS trades_bid_order ON trades (bid_order_id);
+'''
+
+_SELECT = 'SELECT {0} FROM trades'.format(', '.join(_COLUMNS))
+
+Moment = Union[datetime, float]
+
+
+def _seconds(moment: Moment) -> float:
+    """Epoch seconds of a datetime or of a number of seconds"""
+    return moment.timestamp() if isinstance(moment, datetime) else float(moment)
+
+
+def _trade(row: tuple) -> TraderTransaction:
+    trade = TraderTransaction(*row)
+    if trade.transaction_time is not None:
+        trade.transaction_time = epoch_to_datetime(trade.transaction_time)
+    return trade
+
+
+class TradeStore:
+    """Trade history persisted in a SQLite database
+
+    `path` is the database file, the default keeping the store in memory.
+    The store may be shared between threads.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def add(self, trades: Iterable[TraderTransaction], batch_size: int = 1000) -> int:
+        """Insert the trades not stored yet, returning how many were new
+
+        Trades are inserted in batches as the iterable yields them, so a
+        streamed history is never held in memory as a whole.
+        """
+        rows = ((trade.transaction_id,
+                 None if trade.transaction_time is None else _seconds(trade.transaction_time),
+                 trade.ask_order_id, trade.bid_order_id, trade.price, trade.quantity,
+                 trade.currency_pair, trade.way, trade.fee_roll, trade.fee_rate, trade.fee_amount)
+                for trade in trades if trade is not None)
+        insert = 'INSERT OR IGNORE INTO trades VALUES ({0})'.format(', '.join('?' * len(_COLUMNS)))
+        added = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return added
+            with self._lock, self._connection:
+                before = self._connection.total_changes
+                self._connection.executemany(insert, batch)
+                added += self._connection.total_changes - before
+
+    def sync(self, api) -> int:
+        """Stream the trade history of an API and store the unseen trades, returning how many
+
+        Only the trades not stored yet are decoded. A failed request raises,
+        `ResponseStatusError` for an error status, after the unseen trades
+        received so far were stored.
+        """
+        return self.add(api.iter_trade_history(known_ids=self.transaction_ids()))
+
+    def _query(self, where: str = '', params: tuple = (), limit: int = None) -> List[TraderTransaction]:
+        sql = _SELECT + (' WHERE ' + where if where else '') + ' ORDER BY transaction_time, transaction_id'
+        if limit is not None:
+            sql += ' LIMIT {0:d}'.format(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return [_trade(row) for row in rows]
+
+    def get(self, transaction_id: int) -> TraderTransaction:
+        """Trade of a transaction id, None when it is not stored"""
+        trades = self._query('transaction_id = ?', (transaction_id,))
+        return trades[0] if trades else None
+
+    def by_pair(
+            self,
+            currency_pair: str,
+            start: Moment = None,
+            end: Moment = None,
+            limit: int = None) -> List[TraderTransaction]:
+        """Trades of a currency pair, within `[start, end)` if given, oldest first"""
+        where = ['currency_pair = ?']
+        params = [currency_pair]
+        if start is not None:
+            where.append('transaction_time >= ?')
+            params.append(_seconds(start))
+        if end is not None:
+            where.append('transaction_time < ?')
+            params.append(_seconds(end))
+        return self._query(' AND '.join(where), tuple(params), limit)
+
+    def between(self, start: Moment, end: Moment, limit: int = None) -> List[TraderTransaction]:
+        """Trades of every pair within `[start, end)`, oldest first"""
+        return self._query('transaction_time >= ? AND transaction_time < ?',
+                           (_seconds(start), _seconds(end)), limit)
+
+    def by_order(self, order_id: str) -> List[TraderTransaction]:
+        """Trades filling an order on either side, oldest first"""
+        return self._query('ask_order_id = ?1 OR bid_order_id = ?1', (order_id,))
+
+    def transaction_ids(self) -> Set[int]:
+        """Transaction ids of the stored trades"""
+        with self._lock:
+            return {row[0] for row in self._connection.execute('SELECT transaction_id FROM trades')}
+
+    def last_transaction_id(self) -> int:
+        """Highest stored transaction id, None when the store is empty"""
+        with self._lock:
+            return self._connection.execute('SELECT MAX(transaction_id) FROM trades').fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM trades').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
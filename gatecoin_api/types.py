@@ -1,16 +1,23 @@
 """Types for attributes and request/response for the API"""
-from typing import List
+from typing import Dict, List
 from datetime import datetime
 
 # pylint: disable=locally-disabled,E1101,R0903
 class DictRepresentation:
-    """Dictionary representation class"""
+    """Dictionary representation class
+
+    Subclasses declare their attributes in `__slots__`, in the order they
+    are assigned, so instances carry no per-instance `__dict__` while the
+    representation stays the dictionary of those attributes.
+    """
+    __slots__ = ()
 
     def __repr__(self):
-            return repr(self.__dict__)
+        return repr({name: getattr(self, name) for name in self.__slots__})
 
 class ResponseError(DictRepresentation):
     """ResponseError class"""
+    __slots__ = ('error_code', 'field_name', 'message')
 
     def __init__(
             self,
@@ -24,6 +31,7 @@ class ResponseError(DictRepresentation):
 
 class ResponseStatus(DictRepresentation):
     """ResponseStatus class"""
+    __slots__ = ('error_code', 'message', 'stack_trace', 'errors')
 
     def __init__(
             self,
@@ -39,6 +47,8 @@ class ResponseStatus(DictRepresentation):
 
 class CurrencyPair(DictRepresentation):
     """CurrencyPair class"""
+    __slots__ = ('trading_code', 'base_currency', 'quote_currency',
+                 'display_name', 'price_decimal_places', 'name')
 
     def __init__(
             self,
@@ -58,6 +68,7 @@ class CurrencyPair(DictRepresentation):
 
 class Limit(DictRepresentation):
     """Limit class"""
+    __slots__ = ('price', 'volume')
 
     def __init__(self, price: float = None, volume: float = None):
         self.price = price
@@ -66,6 +77,8 @@ class Limit(DictRepresentation):
 
 class Transaction(DictRepresentation):
     """Transaction class"""
+    __slots__ = ('transaction_id', 'transaction_time', 'price', 'quantity',
+                 'currency_pair', 'way', 'ask_order_id', 'bid_order_id')
 
     def __init__(
             self,
@@ -88,6 +101,9 @@ class Transaction(DictRepresentation):
 
 class AccountBalance(DictRepresentation):
     """AccountBalance class"""
+    __slots__ = ('currency', 'balance', 'available_balance',
+                 'pending_incoming', 'pending_outgoing', 'open_order',
+                 'pledging', 'is_digital')
 
     def __init__(self, currency: str = None, balance: float = None, available_balance: float = None, pending_incoming: float = None, pending_outgoing: float = None, open_order: float = None, pledging: float = None, is_digital: bool = None):
         self.currency = currency
@@ -101,6 +117,9 @@ class AccountBalance(DictRepresentation):
 
 class TraderTransaction(DictRepresentation):
     """TraderTransaction class"""
+    __slots__ = ('transaction_id', 'transaction_time', 'ask_order_id',
+                 'bid_order_id', 'price', 'quantity', 'currency_pair', 'way',
+                 'fee_roll', 'fee_rate', 'fee_amount')
     def __init__(self, transaction_id: int = None, transaction_time: datetime = None, ask_order_id: str = None, bid_order_id: str = None, price: float = None, quantity: float = None, currency_pair: str = None, way: str = None, fee_roll: str = None, fee_rate: float = None, fee_amount: float = None):
         self.transaction_id = transaction_id
         self.transaction_time = transaction_time
@@ -116,6 +135,9 @@ class TraderTransaction(DictRepresentation):
 
 class OpenOrder(DictRepresentation):
     """OpenOrder class"""
+    __slots__ = ('code', 'cl_order_id', 'side', 'price', 'initial_quantity',
+                 'remaining_quantity', 'status', 'status_desc',
+                 'transaction_sequence_number', 'type', 'date', 'trades')
 
     def __init__(self, code: str = None, cl_order_id: str = None, side: int = None, price: float = None, initial_quantity: float = None, remaining_quantity: float = None, status: int = None, status_desc: str = None, transaction_sequence_number: int = None, type: int = None, date: datetime = None, trades: List[TraderTransaction] = None):
         self.code = code
@@ -132,11 +154,61 @@ class OpenOrder(DictRepresentation):
         self.trades = trades
 
 
+class LevelChange(DictRepresentation):
+    """LevelChange class"""
+    __slots__ = ('currency_pair', 'side', 'price', 'old_volume', 'new_volume')
+
+    def __init__(
+            self,
+            currency_pair: str = None,
+            side: str = None,
+            price: float = None,
+            old_volume: float = None,
+            new_volume: float = None):
+        self.currency_pair = currency_pair
+        self.side = side
+        self.price = price
+        self.old_volume = old_volume
+        self.new_volume = new_volume
+
+    @property
+    def kind(self) -> str:
+        """'added', 'removed' or 'changed'"""
+        if not self.old_volume:
+            return 'added'
+        if not self.new_volume:
+            return 'removed'
+        return 'changed'
+
+
 # API response classes
 
 
+def succeeded(response) -> bool:
+    """Whether a decoded response exists and carries no error status
+
+    Order book responses carry no status, an error body decodes to a book
+    missing both sides.
+    """
+    if response is None:
+        return False
+    if isinstance(response, GetOrderBookResponse) and response.asks is None and response.bids is None:
+        return False
+    status = getattr(response, 'response_status', None)
+    return getattr(status, 'error_code', None) is None
+
+
+class ResponseStatusError(Exception):
+    """Error status of a response whose items are streamed"""
+
+    def __init__(self, response_status: ResponseStatus):
+        super().__init__('{0}: {1}'.format(response_status.error_code, response_status.message))
+        self.response_status = response_status
+
+
 class GetCurrencyPairsResponse(DictRepresentation):
     """GetCurrencyPairsResponse class"""
+    __slots__ = ('currency_pairs', 'response_status')
 
     def __init__(
             self,
@@ -148,6 +220,7 @@ class GetCurrencyPairsResponse(DictRepresentation):
 
 class GetMarketDepthResponse(DictRepresentation):
     """GetMarketDepthResponse class"""
+    __slots__ = ('asks', 'bids', 'response_status')
 
     def __init__(
             self,
@@ -163,6 +236,7 @@ class GetMarketDepthResponse(DictRepresentation):
 
 class GetOrderBookResponse(DictRepresentation):
     """GetOrderBookResponse class"""
+    __slots__ = ('asks', 'bids')
 
     def __init__(self, asks: List[Limit] = None, bids: List[Limit] = None):
         # self.currency = currency :: Removing for now, not receieved in
@@ -175,6 +249,7 @@ class GetOrderBookResponse(DictRepresentation):
 
 class GetRecentTransactionsResponse(DictRepresentation):
     """GetRecentTransactionsResponse class"""
+    __slots__ = ('transactions', 'response_status')
 
     def __init__(
             self,
@@ -186,6 +261,7 @@ class GetRecentTransactionsResponse(DictRepresentation):
 
 class GetBalancesResponse(DictRepresentation):
     """GetBalancesResponse class"""
+    __slots__ = ('balances', 'response_status')
 
     def __init__(
             self,
@@ -196,6 +272,7 @@ class GetBalancesResponse(DictRepresentation):
 
 class GetBalanceResponse(DictRepresentation):
     """GetBalanceResponse class"""
+    __slots__ = ('balance', 'response_status')
 
     def __init__(
             self,
@@ -207,20 +284,23 @@ class GetBalanceResponse(DictRepresentation):
 
 class GetOpenOrdersResponse(DictRepresentation):
     """GetOpenOrdersResponse class"""
+    __slots__ = ('orders', 'response_status')
 
-    def __init__(self, orders: List[OpenOrder], response_status: ResponseStatus):
+    def __init__(self, orders: List[OpenOrder] = None, response_status: ResponseStatus = None):
         self.orders = orders
         self.response_status = response_status
 
 class GetOpenOrderResponse(DictRepresentation):
     """GetOpenOrderResponse class"""
+    __slots__ = ('order', 'response_status')
 
-    def __init__(self, order: OpenOrder, response_status: ResponseStatus):
+    def __init__(self, order: OpenOrder = None, response_status: ResponseStatus = None):
         self.order = order
         self.response_status = response_status
 
 class CreateOrderResponse(DictRepresentation):
     """CreateOrderResponse class"""
+    __slots__ = ('cl_order_id', 'order_status', 'response_status')
 
     def __init__(self, cl_order_id: str = None, order_status: str = None, response_status: ResponseStatus = None):
         self.cl_order_id = cl_order_id
@@ -229,19 +309,94 @@ class CreateOrderResponse(DictRepresentation):
 
 class CancelOpenOrderResponse(DictRepresentation):
     """CancelOpenOrderResponse class"""
+    __slots__ = ('response_status',)
     
     def __init__(self, response_status: ResponseStatus = None):
         self.response_status = response_status
 
 class CancelAllOpenOrdersResponse(DictRepresentation):
     """CancelAllOpenOrdersResponse class"""
+    __slots__ = ('response_status',)
     
     def __init__(self, response_status: ResponseStatus = None):
         self.response_status = response_status
 
 class GetTradeHistoryResponse(DictRepresentation):
     """GetTradeHistoryResponse class"""
+    __slots__ = ('trades', 'response_status')
     
     def __init__(self, trades: List[TraderTransaction] = None, response_status: ResponseStatus = None):
         self.trades = trades
-        self.response_status = response_status
\ No newline at end of file
+        self.response_status = response_status
+
+class BatchResponse(DictRepresentation):
+    """BatchResponse class
+
+    Responses of a batch call keyed by currency pair. Pairs whose call
+    failed are in `errors` instead, with the exception raised, the response
+    carrying an error status, or None when the response did not decode.
+    """
+    __slots__ = ('responses', 'errors')
+
+    def __init__(self, responses: Dict[str, object] = None, errors: Dict[str, object] = None):
+        self.responses = responses
+        self.errors = errors
+
+class OrderBatchResponse(DictRepresentation):
+    """OrderBatchResponse class
+
+    Outcomes of a batch of order calls in the order they were given: the
+    decoded response, None when it did not decode, or the exception raised.
+    `errors` maps the position of each failed call to its outcome, and
+    `cl_order_ids` the external order id of each placed order to the
+    identifier the exchange gave it.
+    """
+    __slots__ = ('responses', 'errors', 'cl_order_ids')
+
+    def __init__(
+            self,
+            responses: List[object] = None,
+            errors: Dict[int, object] = None,
+            cl_order_ids: Dict[str, str] = None):
+        self.responses = responses
+        self.errors = errors
+        self.cl_order_ids = cl_order_ids
+
+class OrderChange(DictRepresentation):
+    """OrderChange class"""
+    __slots__ = ('cl_order_id', 'old_order', 'new_order')
+
+    def __init__(self, cl_order_id: str = None, old_order: OpenOrder = None, new_order: OpenOrder = None):
+        self.cl_order_id = cl_order_id
+        self.old_order = old_order
+        self.new_order = new_order
+
+    @property
+    def kind(self) -> str:
+        """'added', 'removed' or 'changed'"""
+        if self.old_order is None:
+            return 'added'
+        if self.new_order is None:
+            return 'removed'
+        return 'changed'
+
+class PollSnapshot(DictRepresentation):
+    """PollSnapshot class
+
+    Decoded response of one poll of `endpoint` for a currency pair,
+    `changed` telling whether it differs from the previous poll.
+    """
+    __slots__ = ('currency_pair', 'endpoint', 'response', 'changed', 'received')
+
+    def __init__(
+            self,
+            currency_pair: str = None,
+            endpoint: str = None,
+            response: object = None,
+            changed: bool = None,
+            received: float = None):
+        self.currency_pair = currency_pair
+        self.endpoint = endpoint
+        self.response = response
+        self.changed = changed
+        self.received = received
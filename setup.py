@@ -26,9 +26,13 @@ setuptools.setup(
     ),
     install_requires=[
         'requests',
-        'marshmallow',
-        'pytz'
+        'marshmallow'
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'columnar': ['numpy'],
+        'fast': ['orjson']
+    },
     setup_requires=["pytest-runner"],
     tests_require=["pytest"]
 )